@@ -0,0 +1,44 @@
+"""Unique notification per log
+
+Revision ID: 6f2d1c9a4b7e
+Revises: 3142eb9f93b3
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "6f2d1c9a4b7e"
+down_revision = "3142eb9f93b3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Drop duplicates (if any) so unique index can be created
+    op.execute(
+        """
+        DELETE FROM service_notifications a
+        USING service_notifications b
+        WHERE a.user_id = b.user_id
+          AND a.log_id = b.log_id
+          AND a.notification_type = b.notification_type
+          AND a.id > b.id
+        """
+    )
+
+    op.create_index(
+        "ix_notification_user_log_type",
+        "service_notifications",
+        ["user_id", "log_id", "notification_type"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_notification_user_log_type",
+        table_name="service_notifications",
+    )
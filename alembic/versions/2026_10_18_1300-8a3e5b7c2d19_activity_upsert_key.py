@@ -0,0 +1,75 @@
+"""Activity upsert key
+
+Revision ID: 8a3e5b7c2d19
+Revises: 6f2d1c9a4b7e
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+
+from sqlalchemy.dialects import postgresql
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "8a3e5b7c2d19"
+down_revision = "6f2d1c9a4b7e"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Activity of system logs (without user) is not used anywhere
+    op.execute("DELETE FROM service_user_activity WHERE user_id IS NULL")
+
+    # Merge duplicated records (if any) before creating unique index
+    op.execute(
+        """
+        UPDATE service_user_activity a
+        SET actions = d.actions
+        FROM (
+            SELECT min(id::text)::uuid AS id, sum(actions) AS actions
+            FROM service_user_activity
+            GROUP BY user_id, interval, timestamp
+            HAVING count(*) > 1
+        ) d
+        WHERE a.id = d.id
+        """
+    )
+
+    op.execute(
+        """
+        DELETE FROM service_user_activity a
+        USING service_user_activity b
+        WHERE a.user_id = b.user_id
+          AND a.interval = b.interval
+          AND a.timestamp = b.timestamp
+          AND a.id::text > b.id::text
+        """
+    )
+
+    op.create_index(
+        "ix_activity_user_interval_timestamp",
+        "service_user_activity",
+        ["user_id", "interval", "timestamp"],
+        unique=True,
+    )
+
+    op.drop_column("service_user_activity", "used_logs")
+
+
+def downgrade() -> None:
+    op.add_column(
+        "service_user_activity",
+        sa.Column(
+            "used_logs",
+            postgresql.ARRAY(sa.String()),
+            server_default="{}",
+            nullable=False,
+        ),
+    )
+
+    op.drop_index(
+        "ix_activity_user_interval_timestamp",
+        table_name="service_user_activity",
+    )
@@ -0,0 +1,36 @@
+"""Log consumer cursor
+
+Revision ID: b41c7e9d0a52
+Revises: 8a3e5b7c2d19
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "b41c7e9d0a52"
+down_revision = "8a3e5b7c2d19"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "service_system_timestamps",
+        sa.Column("log_id", sa.Uuid(), nullable=True),
+    )
+
+    op.create_index(
+        "ix_logs_created_id",
+        "service_logs",
+        ["created", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_logs_created_id", table_name="service_logs")
+    op.drop_column("service_system_timestamps", "log_id")
@@ -0,0 +1,52 @@
+"""Unique read entry per user and content
+
+Revision ID: c5d8e2f1a7b3
+Revises: b41c7e9d0a52
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "c5d8e2f1a7b3"
+down_revision = "b41c7e9d0a52"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Keep most recently updated entry and soft delete the rest
+    op.execute(
+        """
+        UPDATE service_read SET deleted = true
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, row_number() OVER (
+                    PARTITION BY user_id, content_id
+                    ORDER BY updated DESC, id
+                ) AS position
+                FROM service_read
+                WHERE deleted = false
+            ) ranked
+            WHERE position > 1
+        )
+        """
+    )
+
+    op.create_index(
+        "ix_service_read_user_content",
+        "service_read",
+        ["user_id", "content_id"],
+        unique=True,
+        postgresql_where=sa.text("deleted = false"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_service_read_user_content",
+        table_name="service_read",
+    )
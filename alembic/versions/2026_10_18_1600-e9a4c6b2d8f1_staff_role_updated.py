@@ -0,0 +1,28 @@
+"""Anime staff role updated
+
+Revision ID: e9a4c6b2d8f1
+Revises: c5d8e2f1a7b3
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "e9a4c6b2d8f1"
+down_revision = "c5d8e2f1a7b3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "service_content_anime_staff_roles",
+        sa.Column("updated", sa.DateTime(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("service_content_anime_staff_roles", "updated")
@@ -3,28 +3,47 @@ from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import RedirectResponse
 from contextlib import asynccontextmanager
+from app.meilisearch import searchmanager, init_search
 from app.database import sessionmanager
+from app.service import auth_activity
 from app.utils import TimeoutMiddleware
 from fastapi.routing import APIRoute
 from app.utils import get_settings
 import fastapi.openapi.utils as fu
 from fastapi import FastAPI
 from app import errors
+import asyncio
 
 
 def create_app(init_db: bool = True) -> FastAPI:
     settings = get_settings()
-    lifespan = None
 
     # SQLAlchemy initialization process
     if init_db:
         sessionmanager.init(settings.database.endpoint)
 
-        @asynccontextmanager
-        async def lifespan(app: FastAPI):
-            yield
-            if sessionmanager._engine is not None:
-                await sessionmanager.close()
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        # Shared Meilisearch client for search requests
+        init_search()
+
+        # Token and user activity is written in background,
+        # so requests never wait for (or fail on) batched writes
+        flusher = asyncio.create_task(auth_activity.run()) if init_db else None
+
+        yield
+
+        await searchmanager.close()
+
+        if flusher is not None:
+            flusher.cancel()
+
+        if init_db and sessionmanager._engine is not None:
+            # Write buffered token and user activity before shutdown
+            async with sessionmanager.session() as session:
+                await auth_activity.flush(session)
+
+            await sessionmanager.close()
 
     fu.validation_error_response_definition = (
         errors.ErrorResponse.model_json_schema()
@@ -49,22 +49,24 @@ async def process_companies_anime(session, anime, data):
 
     companies_cache = {entry.content_id: entry for entry in cache}
 
+    cache = await session.scalars(
+        select(CompanyAnime).filter(CompanyAnime.anime == anime)
+    )
+
+    company_anime_keys = {(entry.company_id, entry.type) for entry in cache}
+
     companies_anime = []
 
     for entry in data["companies"]:
         if not (company := companies_cache.get(entry["company"]["content_id"])):
             continue
 
-        # TODO: cache here
-        if await session.scalar(
-            select(CompanyAnime).filter(
-                CompanyAnime.type == entry["type"],
-                CompanyAnime.company == company,
-                CompanyAnime.anime == anime,
-            )
-        ):
+        if (company.id, entry["type"]) in company_anime_keys:
             continue
 
+        # Same company may be listed twice in payload
+        company_anime_keys.add((company.id, entry["type"]))
+
         company_anime = CompanyAnime(
             **{
                 "type": entry["type"],
@@ -108,6 +110,12 @@ async def process_characters_and_voices(session, anime, data):
         for entry in cache
     }
 
+    cache = await session.scalars(
+        select(AnimeCharacter).filter(AnimeCharacter.anime == anime)
+    )
+
+    anime_character_cache = {entry.character_id: entry for entry in cache}
+
     # Assign people to characters to make import logic easier
     voices = {}
 
@@ -132,12 +140,7 @@ async def process_characters_and_voices(session, anime, data):
         ):
             continue
 
-        if character_role := await session.scalar(
-            select(AnimeCharacter).filter(
-                AnimeCharacter.anime == anime,
-                AnimeCharacter.character == character,
-            )
-        ):
+        if character_role := anime_character_cache.get(character.id):
             character_role.main = entry["main"]
 
             if session.is_modified(character_role):
@@ -153,6 +156,7 @@ async def process_characters_and_voices(session, anime, data):
             )
 
             characters_and_voices.append(character_role)
+            anime_character_cache[character.id] = character_role
 
             character.needs_count_update = True
 
@@ -166,7 +170,9 @@ async def process_characters_and_voices(session, anime, data):
             if not (person := people_cache.get(person_content_id)):
                 continue
 
-            if anime_voice_cache.get(f"{character.id}-{person.id}-{language}"):
+            voice_key = f"{character.id}-{person.id}-{language}"
+
+            if anime_voice_cache.get(voice_key):
                 continue
 
             voice = AnimeVoice(
@@ -179,6 +185,7 @@ async def process_characters_and_voices(session, anime, data):
             )
 
             characters_and_voices.append(voice)
+            anime_voice_cache[voice_key] = voice
 
             character.needs_count_update = True
             person.needs_count_update = True
@@ -202,18 +202,19 @@ async def process_characters(session, manga, data):
         session, character_content_ids
     )
 
+    cache = await session.scalars(
+        select(MangaCharacter).filter(MangaCharacter.manga == manga)
+    )
+
+    manga_character_cache = {entry.character_id: entry for entry in cache}
+
     for entry in data["characters"]:
         if not (
             character := characters_cache.get(entry["character"]["content_id"])
         ):
             continue
 
-        if character_role := await session.scalar(
-            select(MangaCharacter).filter(
-                MangaCharacter.manga == manga,
-                MangaCharacter.character == character,
-            )
-        ):
+        if character_role := manga_character_cache.get(character.id):
             character_role.main = entry["main"]
 
             if session.is_modified(character_role):
@@ -229,6 +230,7 @@ async def process_characters(session, manga, data):
             )
 
             characters.append(character_role)
+            manga_character_cache[character.id] = character_role
 
             character.needs_count_update = True
 
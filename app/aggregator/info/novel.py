@@ -197,18 +197,19 @@ async def process_characters(session, novel, data):
         session, character_content_ids
     )
 
+    cache = await session.scalars(
+        select(NovelCharacter).filter(NovelCharacter.novel == novel)
+    )
+
+    novel_character_cache = {entry.character_id: entry for entry in cache}
+
     for entry in data["characters"]:
         if not (
             character := characters_cache.get(entry["character"]["content_id"])
         ):
             continue
 
-        if character_role := await session.scalar(
-            select(NovelCharacter).filter(
-                NovelCharacter.novel == novel,
-                NovelCharacter.character == character,
-            )
-        ):
+        if character_role := novel_character_cache.get(character.id):
             character_role.main = entry["main"]
 
             if session.is_modified(character_role):
@@ -224,6 +225,7 @@ async def process_characters(session, novel, data):
             )
 
             characters.append(character_role)
+            novel_character_cache[character.id] = character_role
 
             character.needs_count_update = True
 
@@ -79,6 +79,7 @@ async def update_anime_role_weights(session):
 
             role.name_ua = entry["name_ua"]
             role.weight = entry["weight"]
+            role.updated = utils.utcnow()
 
             session.add(role)
 
@@ -1,27 +1,64 @@
-from sqlalchemy import select, desc, func
-from sqlalchemy.orm import selectinload
-from app.models import AnimeStaff
-import math
-
-
-async def update_anime_staff_weights(session):
-    limit = 10000
-    total = await session.scalar(select(func.count(AnimeStaff.id)))
-    pages = math.ceil(total / limit) + 1
-
-    for page in range(1, pages):
-        offset = (limit * (page)) - limit
-
-        staff_roles = await session.scalars(
-            select(AnimeStaff)
-            .options(selectinload(AnimeStaff.roles))
-            .order_by(desc(AnimeStaff.id))
-            .limit(limit)
-            .offset(offset)
+from app.models.association import anime_staff_roles_association_table
+from app.models import AnimeStaffRole, AnimeStaff, Anime
+from sqlalchemy import select, update, func, or_
+from datetime import datetime
+
+
+async def update_anime_staff_weights(session, since: datetime | None = None):
+    """Recalculate staff weights as sum of their role weights
+
+    When since is passed only staff of anime updated after it,
+    staff with roles updated after it (and staff without weight yet)
+    is recalculated.
+    """
+
+    weights = (
+        select(
+            AnimeStaff.id.label("staff_id"),
+            func.coalesce(func.sum(AnimeStaffRole.weight), 0).label("weight"),
+        )
+        .outerjoin(
+            anime_staff_roles_association_table,
+            anime_staff_roles_association_table.c.staff_id == AnimeStaff.id,
+        )
+        .outerjoin(
+            AnimeStaffRole,
+            AnimeStaffRole.id == anime_staff_roles_association_table.c.role_id,
         )
+        .group_by(AnimeStaff.id)
+    )
 
-        for staff in staff_roles:
-            staff.weight = sum([role.weight for role in staff.roles])
-            session.add(staff)
+    if since is not None:
+        # Role weight affects every staff entry which has that role
+        role_staff_ids = (
+            select(anime_staff_roles_association_table.c.staff_id)
+            .join(
+                AnimeStaffRole,
+                AnimeStaffRole.id
+                == anime_staff_roles_association_table.c.role_id,
+            )
+            .filter(AnimeStaffRole.updated > since)
+        )
+
+        weights = weights.join(Anime, Anime.id == AnimeStaff.anime_id).filter(
+            or_(
+                Anime.updated > since,
+                AnimeStaff.weight == None,  # noqa: E711
+                AnimeStaff.id.in_(role_staff_ids),
+            )
+        )
+
+    weights = weights.subquery()
+
+    await session.execute(
+        update(AnimeStaff)
+        .filter(
+            AnimeStaff.id == weights.c.staff_id,
+            # Don't touch rows which weight hasn't changed
+            AnimeStaff.weight.is_distinct_from(weights.c.weight),
+        )
+        .values(weight=weights.c.weight)
+        .execution_options(synchronize_session=False)
+    )
 
-        await session.commit()
+    await session.commit()
@@ -42,44 +42,43 @@ def format_timedelta_uk(tdelta):
 
 
 class SyncTracker:
+    """Keep track of sync stages which may run concurrently"""
+
     def __init__(self):
         self.completed_tasks = []
-        self.current_task_start = None
-        self.current_task = None
+        self.running_tasks = {}
         self.start_time = time.time()
 
-    def add_task(self, task_name: str):
-        if self.current_task is not None:
-            duration = round(time.time() - self.current_task_start)
-            self.completed_tasks.append((self.current_task, duration))
+    def start_task(self, name: str, messages: list[str]):
+        self.running_tasks[name] = (messages, time.time())
 
-        self.current_task = task_name
-        self.current_task_start = time.time()
+    def complete_task(self, name: str):
+        messages, start = self.running_tasks.pop(name)
+        duration = round(time.time() - start)
+        self.completed_tasks.append((messages, duration))
 
     def get_status_message(self) -> str:
         lines = ["Починаю синхронізацію з агрегатором..."]
 
-        if bool(self.completed_tasks or self.current_task):
+        if bool(self.completed_tasks or self.running_tasks):
             lines.append("")
 
         for completed_task, duration in self.completed_tasks:
             time_spent = format_timedelta_uk(timedelta(seconds=duration))
             lines.append(f"{completed_task[1]} за {time_spent}")
 
-        if self.current_task:
+        if self.running_tasks:
             if len(self.completed_tasks) > 0:
                 lines.append("")
 
-            lines.append(f"{self.current_task[0]}...")
+            for running_task, _ in self.running_tasks.values():
+                lines.append(f"{running_task[0]}...")
 
         return "\n".join(lines)
 
     def get_final_message(self) -> str:
-        if self.current_task is not None:
-            duration = round(time.time() - self.current_task_start)
-            self.completed_tasks.append((self.current_task, duration))
-            self.current_task = None
-            self.current_task_start = None
+        for name in list(self.running_tasks):
+            self.complete_task(name)
 
         message = self.get_status_message()
 
@@ -54,12 +54,11 @@ async def search_anime(
 ):
     if not search.query:
         limit, offset = pagination(page, size)
-        total = await service.anime_search_total(session, search)
-        anime = await service.anime_search(
+        total, anime = await service.anime_search(
             session, search, request_user, limit, offset
         )
 
-        return paginated_response(anime.unique().all(), total, page, limit)
+        return paginated_response(anime, total, page, limit)
 
     meilisearch_result = await meilisearch.search(
         constants.SEARCH_INDEX_ANIME,
@@ -7,8 +7,10 @@ from .schemas import AnimeSearchArgs
 from sqlalchemy import func
 
 from app.service import (
+    catalog_content_by_ids,
     build_anime_order_by,
     anime_search_filter,
+    catalog_search_ids,
 )
 
 from app.models import (
@@ -193,7 +195,17 @@ async def anime_search(
     request_user: User | None,
     limit: int,
     offset: int,
-):
+) -> tuple[int, list[Anime]]:
+    total, ids = await catalog_search_ids(
+        session,
+        Anime,
+        search,
+        anime_search_filter,
+        build_anime_order_by(search.sort),
+        limit,
+        offset,
+    )
+
     # Load request user watch statuses here
     load_options = [
         joinedload(Anime.watch),
@@ -203,25 +215,9 @@ async def anime_search(
         ),
     ]
 
-    query = select(Anime).filter(Anime.deleted == False)  # noqa: E712
-    query = anime_search_filter(search, query)
-
-    query = query.order_by(*build_anime_order_by(search.sort))
-
-    query = query.options(*load_options)
-    query = query.limit(limit).offset(offset)
-
-    return await session.scalars(query)
-
-
-async def anime_search_total(session: AsyncSession, search: AnimeSearchArgs):
-    query = select(func.count(Anime.id)).filter(
-        Anime.deleted == False,  # noqa: E712
-    )
-
-    query = anime_search_filter(search, query)
+    anime = await catalog_content_by_ids(session, Anime, ids, load_options)
 
-    return await session.scalar(query)
+    return total, anime
 
 
 # I hate this function so much
@@ -4,6 +4,7 @@ from app.utils import hashpwd, new_token, utcnow
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.service import get_user_by_username
 from app.service import get_user_by_email
+from app.service import invalidate_auth_token
 from datetime import timedelta, datetime
 from starlette.datastructures import URL
 from sqlalchemy.orm import selectinload
@@ -326,4 +327,6 @@ async def revoke_auth_token(session: AsyncSession, token: AuthToken):
     await session.delete(token)
     await session.commit()
 
+    invalidate_auth_token(token)
+
     return token
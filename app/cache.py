@@ -0,0 +1,42 @@
+from collections import OrderedDict
+import time
+
+
+class TTLCache:
+    """Simple in-process LRU cache with per entry time to live"""
+
+    def __init__(self, maxsize: int = 1024, ttl: int = 60):
+        self._data: OrderedDict = OrderedDict()
+        self.maxsize = maxsize
+        self.ttl = ttl
+
+    def get(self, key, default=None):
+        if key not in self._data:
+            return default
+
+        expires, value = self._data[key]
+
+        if time.monotonic() > expires:
+            del self._data[key]
+            return default
+
+        self._data.move_to_end(key)
+
+        return value
+
+    def set(self, key, value):
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+
+        # Evict least recently used entries
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
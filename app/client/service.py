@@ -7,6 +7,7 @@ from sqlalchemy.orm import joinedload
 
 from app.client.schemas import ClientCreate, ClientUpdate, ListAllClientsArgs
 from app.models import User, Client
+from app.service import auth_token_cache
 from app.utils import utcnow
 
 
@@ -115,6 +116,10 @@ async def update_client(
 async def delete_client(session: AsyncSession, client: Client) -> Client:
     await session.delete(client)
     await session.commit()
+
+    # Client tokens are removed by cascade and we can't tell
+    # their secrets apart in cache, so it is dropped entirely
+    auth_token_cache.clear()
     return client
 
 
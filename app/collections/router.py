@@ -50,12 +50,11 @@ async def get_collections(
     ),
 ):
     limit, offset = pagination(page, size)
-    total = await service.get_collections_count(session, request_user, args)
-    collections = await service.get_collections(
+    total, collections = await service.get_collections(
         session, request_user, args, limit, offset
     )
 
-    return paginated_response(collections.unique().all(), total, page, limit)
+    return paginated_response(collections, total, page, limit)
 
 
 @router.post("/create", response_model=CollectionResponse)
@@ -2,11 +2,14 @@ from app.service import content_type_to_content_class
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql.selectable import Select
 from sqlalchemy.orm import joinedload
+from app.utils import paginated_items
 from app.utils import utcnow
 from app import constants
 from uuid import UUID
 
 from app.service import (
+    collection_content_entity,
+    collection_content_query,
     collections_load_options,
     get_followed_user_ids,
     get_user_by_username,
@@ -14,7 +17,6 @@ from app.service import (
 )
 
 from sqlalchemy import (
-    ScalarResult,
     select,
     delete,
     update,
@@ -131,12 +133,7 @@ async def collections_list_filter(
 
     if len(args.tags) > 0:
         query = query.filter(
-            and_(
-                *[
-                    Collection.tags.any(name)
-                    for name in args.tags
-                ]
-            )
+            and_(*[Collection.tags.any(name) for name in args.tags])
         )
 
     if args.only_public:
@@ -170,23 +167,13 @@ async def collections_list_filter(
     return query
 
 
-async def get_collections_count(
-    session: AsyncSession, request_user: User | None, args: CollectionsListArgs
-) -> int:
-    query = await collections_list_filter(
-        select(func.count(Collection.id)), request_user, args, session
-    )
-
-    return await session.scalar(query)
-
-
 async def get_collections(
     session: AsyncSession,
     request_user: User | None,
     args: CollectionsListArgs,
     limit: int,
     offset: int,
-) -> ScalarResult[Collection]:
+) -> tuple[int, list[Collection]]:
     followed_user_ids = await get_followed_user_ids(session, request_user)
 
     query = await collections_list_filter(
@@ -205,10 +192,12 @@ async def get_collections(
         session,
     )
 
-    return await session.scalars(
-        query.order_by(*build_collection_order_by(args.sort))
-        .limit(limit)
-        .offset(offset)
+    return await paginated_items(
+        session,
+        query.order_by(*build_collection_order_by(args.sort)),
+        limit,
+        offset,
+        unique=True,
     )
 
 
@@ -476,8 +465,8 @@ async def content_compare(
     session: AsyncSession, collection: Collection, args: CollectionArgs
 ):
     collection_content = await session.scalars(
-        select(CollectionContent).filter(
-            CollectionContent.collection == collection
+        collection_content_query().filter(
+            collection_content_entity.collection_id == collection.id
         )
     )
 
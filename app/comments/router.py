@@ -1,9 +1,12 @@
 from app.utils import path_to_uuid, paginated_response, pagination
+from app.utils import cursor_response
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.schemas import SuccessResponse
 from fastapi import APIRouter, Depends
 from app.database import get_session
+from app.errors import Abort
 from app.models import Comment, User
+from .utils import build_comment_threads
 from .utils import build_comments
 from app import constants
 from . import service
@@ -20,6 +23,7 @@ from .dependencies import (
 
 from app.dependencies import (
     auth_required,
+    get_cursor,
     get_page,
     get_size,
 )
@@ -55,7 +59,26 @@ async def comments_list(
     request_user: User = Depends(
         auth_required(optional=True, scope=[constants.SCOPE_READ_COMMENT_SCORE])
     ),
+    cursor: list | None = Depends(get_cursor),
 ):
+    if cursor is not None:
+        result = await service.get_comments_cursor(
+            session, request_user, cursor, size
+        )
+
+        if result is None:
+            raise Abort("system", "bad-cursor")
+
+        next_cursor, comments = result
+
+        return cursor_response(
+            [
+                CommentNode.create(path_to_uuid(comment.reference), comment)
+                for comment in comments
+            ],
+            next_cursor,
+        )
+
     limit, offset = pagination(page, size)
     total = await service.count_comments(session)
     comments = await service.get_comments(session, request_user, limit, offset)
@@ -98,21 +121,34 @@ async def get_contents_list(
     ),
     page: int = Depends(get_page),
     size: int = Depends(get_size),
+    cursor: list | None = Depends(get_cursor),
 ):
-    total = content.comments_count_pagination
-    limit, offset = pagination(page, size)
-    base_comments = await service.get_comments_by_content_id(
-        session, content.id, request_user, limit, offset
-    )
+    if cursor is not None:
+        result = await service.get_comments_by_content_id_cursor(
+            session, content.id, request_user, cursor, size
+        )
+
+        if result is None:
+            raise Abort("system", "bad-cursor")
 
-    result = []
+        next_cursor, base_comments = result
 
-    for base_comment in base_comments:
-        sub_comments = await service.get_sub_comments(
-            session, base_comment, request_user
+    else:
+        total = content.comments_count_pagination
+        limit, offset = pagination(page, size)
+        base_comments = await service.get_comments_by_content_id(
+            session, content.id, request_user, limit, offset
         )
 
-        result.append(build_comments(base_comment, sub_comments))
+        base_comments = base_comments.all()
+
+    sub_comments = await service.get_sub_comments_batch(session, base_comments)
+    my_scores = await service.get_my_scores(session, sub_comments, request_user)
+
+    result = build_comment_threads(base_comments, sub_comments, my_scores)
+
+    if cursor is not None:
+        return cursor_response(result, next_cursor)
 
     return paginated_response(result, total, page, limit)
 
@@ -12,6 +12,7 @@ from app.utils import (
 )
 
 from app.schemas import (
+    CursorPaginationResponse,
     PaginationResponse,
     UserResponse,
     CustomModel,
@@ -85,7 +86,7 @@ class CommentResponse(CustomModel):
 
 
 class CommentListResponse(CustomModel):
-    pagination: PaginationResponse
+    pagination: PaginationResponse | CursorPaginationResponse
     list: list[CommentResponse]
 
 
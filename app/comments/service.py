@@ -7,6 +7,7 @@ from sqlalchemy.orm import joinedload
 from app.utils import round_datetime
 from sqlalchemy_utils import Ltree
 from .utils import uuid_to_path
+from app.utils import cursor_paginated_items
 from app.utils import utcnow
 from uuid import UUID, uuid4
 from app import constants
@@ -14,13 +15,14 @@ from app import utils
 import copy
 
 from app.service import (
+    collection_content_entity,
+    collection_content_query,
     get_my_score_subquery,
     get_content_by_id,
     create_log,
 )
 
 from app.models import (
-    CollectionContent,
     CollectionComment,
     CharacterComment,
     ArticleComment,
@@ -42,6 +44,7 @@ from app.models import (
     Manga,
     Novel,
     User,
+    Vote,
     Edit,
 )
 
@@ -182,16 +185,8 @@ async def get_comment_by_content(
     )
 
 
-async def get_comments_by_content_id(
-    session: AsyncSession,
-    content_id: str,
-    request_user: User | None,
-    limit: int,
-    offset: int,
-) -> ScalarResult[Comment]:
-    """Return comments for given content"""
-
-    return await session.scalars(
+def base_comments_query(content_id: str, request_user: User | None):
+    return (
         select(Comment)
         .filter(
             func.nlevel(Comment.path) == 1,
@@ -206,12 +201,44 @@ async def get_comments_by_content_id(
                 ),
             )
         )
+    )
+
+
+async def get_comments_by_content_id(
+    session: AsyncSession,
+    content_id: str,
+    request_user: User | None,
+    limit: int,
+    offset: int,
+) -> ScalarResult[Comment]:
+    """Return comments for given content"""
+
+    return await session.scalars(
+        base_comments_query(content_id, request_user)
         .order_by(desc(Comment.created))
         .limit(limit)
         .offset(offset)
     )
 
 
+async def get_comments_by_content_id_cursor(
+    session: AsyncSession,
+    content_id: str,
+    request_user: User | None,
+    cursor: list,
+    limit: int,
+) -> tuple[str | None, list[Comment]] | None:
+    """Return comments for given content after cursor"""
+
+    return await cursor_paginated_items(
+        session,
+        base_comments_query(content_id, request_user),
+        [Comment.created, Comment.id],
+        cursor,
+        limit,
+    )
+
+
 async def get_sub_comments(
     session: AsyncSession,
     base_comment: Comment,
@@ -236,6 +263,53 @@ async def get_sub_comments(
     )
 
 
+async def get_sub_comments_batch(
+    session: AsyncSession,
+    base_comments: list[Comment],
+) -> list[Comment]:
+    """Return replies for all given base comments in one query"""
+
+    if len(base_comments) == 0:
+        return []
+
+    comments = await session.scalars(
+        select(Comment)
+        .filter(
+            Comment.deleted == False,  # noqa: E712
+            Comment.path.descendant_of(
+                [comment.path for comment in base_comments]
+            ),
+            func.nlevel(Comment.path) > 1,
+        )
+        .order_by(asc(Comment.created))
+    )
+
+    return comments.all()
+
+
+async def get_my_scores(
+    session: AsyncSession,
+    comments: list[Comment],
+    request_user: User | None,
+) -> dict[UUID, int]:
+    """Return request user's vote scores for given comments"""
+
+    if not request_user or len(comments) == 0:
+        return {}
+
+    votes = await session.execute(
+        select(Vote.content_id, func.sum(Vote.score))
+        .filter(
+            Vote.content_type == constants.CONTENT_COMMENT,
+            Vote.content_id.in_([comment.id for comment in comments]),
+            Vote.user == request_user,
+        )
+        .group_by(Vote.content_id)
+    )
+
+    return {content_id: score for content_id, score in votes}
+
+
 async def count_comments_limit(session: AsyncSession, author: User) -> int:
     return await session.scalar(
         select(func.count(Comment.id)).filter(
@@ -349,13 +423,8 @@ async def count_comments(session: AsyncSession) -> int:
     )
 
 
-async def get_comments(
-    session: AsyncSession,
-    request_user: User | None,
-    limit: int,
-    offset: int,
-):
-    return await session.scalars(
+def comments_query(request_user: User | None):
+    return (
         select(Comment)
         .filter(
             func.nlevel(Comment.path) == 1,
@@ -371,12 +440,38 @@ async def get_comments(
                 ),
             )
         )
+    )
+
+
+async def get_comments(
+    session: AsyncSession,
+    request_user: User | None,
+    limit: int,
+    offset: int,
+):
+    return await session.scalars(
+        comments_query(request_user)
         .order_by(desc(Comment.created))
         .limit(limit)
         .offset(offset)
     )
 
 
+async def get_comments_cursor(
+    session: AsyncSession,
+    request_user: User | None,
+    cursor: list,
+    limit: int,
+) -> tuple[str | None, list[Comment]] | None:
+    return await cursor_paginated_items(
+        session,
+        comments_query(request_user),
+        [Comment.created, Comment.id],
+        cursor,
+        limit,
+    )
+
+
 # NOTE: I still hate this function but less than before.
 # NOTE: This code is a liability. It must be updated when
 # new identities added for Comment or Edit
@@ -467,9 +562,11 @@ async def generate_preview(
 
     if isinstance(comment, CollectionComment):
         collection_content = await session.scalar(
-            select(CollectionContent)
-            .filter(CollectionContent.collection == comment.content)
-            .order_by(asc(CollectionContent.order))
+            collection_content_query()
+            .filter(
+                collection_content_entity.collection_id == comment.content.id
+            )
+            .order_by(asc(collection_content_entity.order))
             .limit(1)
         )
 
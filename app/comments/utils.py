@@ -7,7 +7,7 @@ def uuid_to_path(obj_uuid):
     return str(obj_uuid).replace("-", "_")
 
 
-def build_comments(base_comment, sub_comments):
+def build_comments(base_comment, sub_comments, my_scores=None):
     def calculate_total_replies(node):
         node.total_replies = len(node.replies)
         for reply in node.replies:
@@ -40,6 +40,10 @@ def build_comments(base_comment, sub_comments):
 
         tree_node.from_comment(sub_comment)
 
+        # Scores fetched separately in one query by thread loader
+        if my_scores is not None:
+            tree_node.my_score = my_scores.get(sub_comment.id, 0)
+
     tree.replies = [
         reply
         for reply in tree.replies
@@ -49,3 +53,21 @@ def build_comments(base_comment, sub_comments):
     calculate_total_replies(tree)
 
     return tree
+
+
+def build_comment_threads(base_comments, sub_comments, my_scores=None):
+    """Assemble comment trees for page of base comments in memory"""
+
+    threads = {str(comment.path): [] for comment in base_comments}
+
+    # Base comments are always first level so root label is thread key
+    for sub_comment in sub_comments:
+        root = str(sub_comment.path[0])
+
+        if root in threads:
+            threads[root].append(sub_comment)
+
+    return [
+        build_comments(base_comment, threads[str(base_comment.path)], my_scores)
+        for base_comment in base_comments
+    ]
@@ -2,6 +2,11 @@
 ALCHEMY_CHUNK_LIMIT = 5000
 ALCHEMY_CHUNK_LIMIT_ALT = 1000
 
+# Postgres channel used to wake up sync jobs
+SYNC_CHANNEL = "hikka_sync"
+SYNC_LOGS = "logs"
+SYNC_SEARCH = "search"
+
 # Email types
 EMAIL_ACTIVATION = "activation"
 EMAIL_PASSWORD_RESET = "password_reset"
@@ -21,6 +26,14 @@ READ_ON_HOLD = "on_hold"
 READ_DROPPED = "dropped"
 READ_PLANNED = "planned"
 
+READ = [
+    READ_PLANNED,
+    READ_READING,
+    READ_COMPLETED,
+    READ_ON_HOLD,
+    READ_DROPPED,
+]
+
 # Watch list statuses
 WATCH_PLANNED = "planned"
 WATCH_WATCHING = "watching"
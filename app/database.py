@@ -45,6 +45,26 @@ class DatabaseSessionManager:
                 await connection.rollback()
                 raise
 
+    @contextlib.asynccontextmanager
+    async def listen(
+        self, channel: str, callback
+    ) -> AsyncIterator[AsyncConnection]:
+        if self._engine is None:
+            raise Exception("DatabaseSessionManager is not initialized")
+
+        # Listener is bound to driver connection, so it is held
+        # outside of transaction for as long as context is open
+        async with self._engine.connect() as connection:
+            raw_connection = await connection.get_raw_connection()
+            driver_connection = raw_connection.driver_connection
+
+            await driver_connection.add_listener(channel, callback)
+
+            try:
+                yield connection
+            finally:
+                await driver_connection.remove_listener(channel, callback)
+
     @contextlib.asynccontextmanager
     async def session(self) -> AsyncIterator[AsyncSession]:
         if self._sessionmaker is None:
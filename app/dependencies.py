@@ -11,9 +11,12 @@ from app import constants
 from app import utils
 
 from .service import (
+    get_cached_auth_token,
     get_user_by_username,
     get_anime_by_slug,
+    CachedAuthToken,
     get_auth_token,
+    auth_activity,
 )
 
 
@@ -35,6 +38,22 @@ async def get_page(page: int = Query(gt=0, le=10000, default=1)):
     return page
 
 
+# Get pagination cursor, empty cursor requests first page
+async def get_cursor(
+    cursor: str | None = Query(default=None, max_length=512),
+) -> list | None:
+    if cursor is None:
+        return None
+
+    if cursor == "":
+        return []
+
+    if (values := utils.decode_cursor(cursor)) is None:
+        raise Abort("system", "bad-cursor")
+
+    return values
+
+
 # Get current pagination size
 async def get_size(
     size: int = Query(
@@ -64,12 +83,35 @@ async def get_request_auth_token(
     return header_auth if header_auth else cookie_auth
 
 
+def _check_token_or_abort(
+    token: AuthToken | CachedAuthToken, user: User | None
+) -> Abort | None:
+    if not user:
+        return Abort("auth", "user-not-found")
+
+    if user.banned:
+        return Abort("auth", "banned")
+
+    if utcnow() > token.expiration:
+        return Abort("auth", "token-expired")
+
+    return None
+
+
+def _touch_token(token: AuthToken | CachedAuthToken):
+    now = utcnow()
+
+    # Bumps are buffered and written by batched flush
+    # instead of commit on every request
+    if not token.used or now - token.used >= timedelta(minutes=5):
+        token.used = now
+        auth_activity.touch_token(token)
+
+
 async def _auth_token_or_abort(
     session: AsyncSession = Depends(get_session),
     token: str | None = Depends(get_request_auth_token),
 ) -> Abort | AuthToken:
-    now = utcnow()
-
     if not token:
         return Abort("auth", "missing-token")
 
@@ -78,21 +120,35 @@ async def _auth_token_or_abort(
     if not token:
         return Abort("auth", "invalid-token")
 
-    if not token.user:
-        return Abort("auth", "user-not-found")
+    if abort := _check_token_or_abort(token, token.user):
+        return abort
 
-    if token.user.banned:
-        return Abort("auth", "banned")
+    _touch_token(token)
 
-    if now > token.expiration:
-        return Abort("auth", "token-expired")
+    return token
 
-    if not token.used or now - token.used >= timedelta(minutes=5):
-        token.used = now
 
-    await session.commit()
+async def _cached_auth_token_or_abort(
+    session: AsyncSession = Depends(get_session),
+    token: str | None = Depends(get_request_auth_token),
+) -> Abort | tuple[CachedAuthToken, User]:
+    if not token:
+        return Abort("auth", "missing-token")
+
+    token = await get_cached_auth_token(session, token)
 
-    return token
+    if not token:
+        return Abort("auth", "invalid-token")
+
+    # On cache miss user is already in identity map
+    user = await session.get(User, token.user_id)
+
+    if abort := _check_token_or_abort(token, user):
+        return abort
+
+    _touch_token(token)
+
+    return token, user
 
 
 async def auth_token_required(
@@ -137,48 +193,48 @@ def auth_required(
     scope = utils.resolve_scope_groups(scope)
 
     async def auth(
-        token: AuthToken | Abort = Depends(_auth_token_or_abort),
-        session: AsyncSession = Depends(get_session),
+        result: tuple[CachedAuthToken, User] | Abort = Depends(
+            _cached_auth_token_or_abort
+        ),
     ) -> User | None:
-        if isinstance(token, Abort):
+        if isinstance(result, Abort):
             # If authorization is optional - ignore abort and return None
             if optional:
                 return None
 
             # If authorization is required - raise abort
-            raise token
+            raise result
 
+        token, user = result
         now = utcnow()
 
         # Check requested permissions here
-        if not utils.check_user_permissions(token.user, permissions):
+        if not utils.check_user_permissions(user, permissions):
             raise Abort("permission", "denied")
 
-        if forbid_thirdparty and token.client:
+        if forbid_thirdparty and token.client_id:
             raise Abort("permission", "denied")
 
         if not utils.check_token_scope(token, scope):
             raise Abort("permission", "denied")
 
-        if token.user.role == constants.ROLE_DELETED:
+        if user.role == constants.ROLE_DELETED:
             raise Abort("user", "deleted")
 
         # After each authenticated request token expiration will be reset
-        if (
-            not token.user.last_active
-            or now - token.user.last_active >= timedelta(minutes=5)
+        if not user.last_active or now - user.last_active >= timedelta(
+            minutes=5
         ):
-            token.user.last_active = now
+            auth_activity.touch_user(user.id, now)
 
         # We need to update token expiraion once in a while
         # 3 days before expiration is arbitrary
         # we may need to update it later on
         if now - token.expiration <= timedelta(days=3):
             token.expiration = now + timedelta(days=30)
+            auth_activity.touch_token(token)
 
-        await session.commit()
-
-        return token.user
+        return user
 
     return auth
 
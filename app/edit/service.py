@@ -14,6 +14,7 @@ import copy
 from app.service import (
     get_user_by_username,
     get_content_by_slug,
+    notify_sync,
     create_log,
 )
 
@@ -310,10 +311,17 @@ async def accept_pending_edit(
     # Make sure content is marked to be updated in Meilisearch
     if hasattr(content, "needs_search_update"):
         content.needs_search_update = True
+        await notify_sync(session, constants.SYNC_SEARCH)
+
+    now = utcnow()
+
+    # Catalog cache relies on content updated column to detect changes
+    if hasattr(content, "updated"):
+        content.updated = now
 
     edit.status = constants.EDIT_ACCEPTED
     edit.moderator = moderator
-    edit.updated = utcnow()
+    edit.updated = now
     edit.before = before
 
     edit.content_preview = generate_content_preview(
@@ -129,6 +129,8 @@ errors = {
         "email-cooldown": ["Email can be changed once per day", "", 400],
         "username-taken": ["Username already taken", "", 400],
         "invalid-username": ["Invalid username", "", 400],
+        "import-running": ["List import is already running", "", 400],
+        "import-not-found": ["No list import found", "", 404],
     },
     "permission": {
         "denied": [
@@ -440,6 +442,11 @@ errors = {
             "Не дійсний токен для бекапу",
             401,
         ],
+        "bad-cursor": [
+            "Bad pagination cursor",
+            "Поганий курсор пагінації",
+            400,
+        ],
     },
     "client": {
         "already-verified": [
@@ -1,6 +1,7 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import APIRouter, Depends
 from app.database import get_session
+from app.errors import Abort
 from app.models import User
 from app import constants
 from . import service
@@ -12,11 +13,13 @@ from .schemas import (
 
 from app.utils import (
     paginated_response,
+    cursor_response,
     pagination,
 )
 
 from app.dependencies import (
     auth_required,
+    get_cursor,
     get_user,
     get_page,
     get_size,
@@ -40,16 +43,27 @@ async def following_history(
     ),
     page: int = Depends(get_page),
     size: int = Depends(get_size),
+    cursor: list | None = Depends(get_cursor),
 ):
     user_ids = await service.following_ids(session, user)
 
+    if cursor is not None:
+        result = await service.get_following_history_cursor(
+            session, user_ids, cursor, size
+        )
+
+        if result is None:
+            raise Abort("system", "bad-cursor")
+
+        next_cursor, history = result
+        return cursor_response(history, next_cursor)
+
     limit, offset = pagination(page, size)
-    total = await service.get_following_history_count(session, user_ids)
-    history = await service.get_following_history(
+    total, history = await service.get_following_history(
         session, user_ids, limit, offset
     )
 
-    return paginated_response(history.all(), total, page, limit)
+    return paginated_response(history, total, page, limit)
 
 
 @router.get(
@@ -62,9 +76,22 @@ async def user_history(
     user: User = Depends(get_user),
     page: int = Depends(get_page),
     size: int = Depends(get_size),
+    cursor: list | None = Depends(get_cursor),
 ):
+    if cursor is not None:
+        result = await service.get_user_history_cursor(
+            session, user, cursor, size
+        )
+
+        if result is None:
+            raise Abort("system", "bad-cursor")
+
+        next_cursor, history = result
+        return cursor_response(history, next_cursor)
+
     limit, offset = pagination(page, size)
-    total = await service.get_user_history_count(session, user)
-    history = await service.get_user_history(session, user, limit, offset)
+    total, history = await service.get_user_history(
+        session, user, limit, offset
+    )
 
-    return paginated_response(history.all(), total, page, limit)
+    return paginated_response(history, total, page, limit)
@@ -1,6 +1,7 @@
 from app.schemas import datetime_pd
 
 from app.schemas import (
+    CursorPaginationResponse,
     PaginationResponse,
     AnimeResponse,
     MangaResponse,
@@ -22,5 +23,5 @@ class HistoryResponse(CustomModel):
 
 
 class HistoryPaginationResponse(CustomModel):
-    pagination: PaginationResponse
+    pagination: PaginationResponse | CursorPaginationResponse
     list: list[HistoryResponse]
@@ -1,32 +1,92 @@
-from sqlalchemy import select, desc, func, ScalarResult
+from app.utils import paginated_items, cursor_paginated_items
+from sqlalchemy.orm import selectinload, with_polymorphic
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
+from sqlalchemy import select, desc
 
 from app.models import (
+    FavouriteAnimeRemoveHistory,
+    FavouriteMangaRemoveHistory,
+    FavouriteNovelRemoveHistory,
+    FavouriteAnimeHistory,
+    FavouriteMangaHistory,
+    FavouriteNovelHistory,
+    ReadMangaDeleteHistory,
+    ReadNovelDeleteHistory,
+    WatchDeleteHistory,
+    ReadMangaHistory,
+    ReadNovelHistory,
+    WatchHistory,
     History,
     Follow,
     User,
 )
 
 
-async def get_user_history_count(session: AsyncSession, user: User) -> int:
-    return await session.scalar(
-        select(func.count(History.id)).filter(History.user == user)
+# History types which have content attached to them
+history_content_models = [
+    FavouriteAnimeRemoveHistory,
+    FavouriteMangaRemoveHistory,
+    FavouriteNovelRemoveHistory,
+    FavouriteAnimeHistory,
+    FavouriteMangaHistory,
+    FavouriteNovelHistory,
+    ReadMangaDeleteHistory,
+    ReadNovelDeleteHistory,
+    WatchDeleteHistory,
+    ReadMangaHistory,
+    ReadNovelHistory,
+    WatchHistory,
+]
+
+history_entity = with_polymorphic(History, history_content_models)
+
+# Sort keys used to build history cursor
+history_cursor_columns = [
+    history_entity.updated,
+    history_entity.created,
+    history_entity.id,
+]
+
+
+def history_query():
+    # Content is loaded with one query per history type instead of
+    # one query per record, everything else is left to raise
+    return select(history_entity).options(
+        joinedload(history_entity.user),
+        *[
+            selectinload(getattr(history_entity, model.__name__).content)
+            for model in history_content_models
+        ],
     )
 
 
 async def get_user_history(
     session: AsyncSession, user: User, limit: int, offset: int
-) -> ScalarResult[History]:
+) -> tuple[int, list[History]]:
     """Get user history"""
 
-    return await session.scalars(
-        select(History)
-        .filter(History.user == user)
-        .options(joinedload(History.user))
-        .order_by(desc(History.updated), desc(History.created))
-        .limit(limit)
-        .offset(offset)
+    return await paginated_items(
+        session,
+        history_query()
+        .filter(history_entity.user_id == user.id)
+        .order_by(desc(history_entity.updated), desc(history_entity.created)),
+        limit,
+        offset,
+    )
+
+
+async def get_user_history_cursor(
+    session: AsyncSession, user: User, cursor: list, limit: int
+) -> tuple[str | None, list[History]] | None:
+    """Get user history after cursor"""
+
+    return await cursor_paginated_items(
+        session,
+        history_query().filter(history_entity.user_id == user.id),
+        history_cursor_columns,
+        cursor,
+        limit,
     )
 
 
@@ -41,24 +101,32 @@ async def following_ids(session: AsyncSession, user: User):
     return user_ids
 
 
-async def get_following_history_count(
-    session: AsyncSession, user_ids: list
-) -> int:
-    return await session.scalar(
-        select(func.count(History.id)).filter(History.user_id.in_(user_ids))
-    )
-
-
 async def get_following_history(
     session: AsyncSession, user_ids: list, limit: int, offset: int
-) -> ScalarResult[History]:
+) -> tuple[int, list[History]]:
     """Get following history"""
 
-    return await session.scalars(
-        select(History)
-        .filter(History.user_id.in_(user_ids))
-        .options(joinedload(History.user))
-        .order_by(desc(History.updated), desc(History.created))
-        .limit(limit)
-        .offset(offset)
+    # Counting whole feed of every followed user is too expensive
+    return await paginated_items(
+        session,
+        history_query()
+        .filter(history_entity.user_id.in_(user_ids))
+        .order_by(desc(history_entity.updated), desc(history_entity.created)),
+        limit,
+        offset,
+        estimate=True,
+    )
+
+
+async def get_following_history_cursor(
+    session: AsyncSession, user_ids: list, cursor: list, limit: int
+) -> tuple[str | None, list[History]] | None:
+    """Get following history after cursor"""
+
+    return await cursor_paginated_items(
+        session,
+        history_query().filter(history_entity.user_id.in_(user_ids)),
+        history_cursor_columns,
+        cursor,
+        limit,
     )
@@ -53,12 +53,11 @@ async def search_manga(
         )
 
     limit, offset = pagination(page, size)
-    total = await service.manga_search_total(session, search)
-    manga = await service.manga_search(
+    total, manga = await service.manga_search(
         session, search, request_user, limit, offset
     )
 
-    return paginated_response(manga.unique().all(), total, page, limit)
+    return paginated_response(manga, total, page, limit)
 
 
 @router.get(
@@ -8,8 +8,10 @@ from app import meilisearch
 from app import constants
 
 from app.service import (
+    catalog_content_by_ids,
     build_manga_order_by,
     manga_search_filter,
+    catalog_search_ids,
 )
 
 from app.models import (
@@ -53,7 +55,17 @@ async def manga_search(
     request_user: User | None,
     limit: int,
     offset: int,
-):
+) -> tuple[int, list[Manga]]:
+    total, ids = await catalog_search_ids(
+        session,
+        Manga,
+        search,
+        manga_search_filter,
+        build_manga_order_by(search.sort),
+        limit,
+        offset,
+    )
+
     # Load request user read statuses here
     load_options = [
         joinedload(Manga.read),
@@ -63,25 +75,9 @@ async def manga_search(
         ),
     ]
 
-    query = select(Manga).filter(Manga.deleted == False)  # noqa: E712
-    query = manga_search_filter(search, query)
-
-    query = query.order_by(*build_manga_order_by(search.sort))
-
-    query = query.options(*load_options)
-    query = query.limit(limit).offset(offset)
-
-    return await session.scalars(query)
-
-
-async def manga_search_total(session: AsyncSession, search: MangaSearchArgs):
-    query = select(func.count(Manga.id)).filter(
-        Manga.deleted == False,  # noqa: E712
-    )
-
-    query = manga_search_filter(search, query)
+    manga = await catalog_content_by_ids(session, Manga, ids, load_options)
 
-    return await session.scalar(query)
+    return total, manga
 
 
 async def manga_characters_count(session: AsyncSession, manga: Manga) -> int:
@@ -1,9 +1,71 @@
+from meilisearch_python_sdk.errors import MeilisearchApiError
 from meilisearch_python_sdk.errors import MeilisearchError
 from meilisearch_python_sdk import AsyncClient
 from app.utils import paginated_response
 from app.utils import get_settings
 from app.errors import Abort
 from app import constants
+import time
+
+
+class SearchClientManager:
+    def __init__(self):
+        self._client: AsyncClient | None = None
+
+        # Circuit breaker state
+        self.failures_threshold = 5
+        self.cooldown = 30
+        self.failures = 0
+        self.open_until = 0
+
+    def init(self, url: str, api_key: str | None = None, timeout: int = 5):
+        # Client is kept for the whole app lifetime so its connection pool
+        # (and keep-alive connections to Meilisearch) is reused by requests
+        self._client = AsyncClient(url, api_key, timeout=timeout)
+        self.record_success()
+
+    async def close(self):
+        if self._client is None:
+            raise Exception("SearchClientManager is not initialized")
+
+        await self._client.aclose()
+        self._client = None
+
+    @property
+    def client(self) -> AsyncClient:
+        if self._client is None:
+            raise Exception("SearchClientManager is not initialized")
+
+        return self._client
+
+    @property
+    def is_open(self) -> bool:
+        return time.monotonic() < self.open_until
+
+    def record_success(self):
+        self.failures = 0
+        self.open_until = 0
+
+    def record_failure(self):
+        self.failures += 1
+
+        # When Meilisearch is down we fail fast for some time instead
+        # of waiting for connection timeout on every request
+        if self.failures >= self.failures_threshold:
+            self.open_until = time.monotonic() + self.cooldown
+
+
+searchmanager = SearchClientManager()
+
+
+def init_search():
+    settings = get_settings()
+
+    searchmanager.init(
+        settings.meilisearch.url,
+        settings.meilisearch.get("api_key"),
+        settings.meilisearch.get("timeout", 5),
+    )
 
 
 async def search(
@@ -14,26 +76,33 @@ async def search(
     filter=None,
     size=constants.SEARCH_RESULT_SIZE,
 ):
-    settings = get_settings()
+    if searchmanager.is_open:
+        raise Abort("search", "query-down")
 
     try:
-        async with AsyncClient(**settings.meilisearch) as client:
-            index = client.index(content_index)
-
-            result = await index.search(
-                hits_per_page=size,
-                filter=filter,
-                query=query,
-                sort=sort,
-                page=page,
-            )
-
-            return paginated_response(
-                result.hits,
-                result.total_hits,
-                result.page,
-                result.hits_per_page,
-            )
+        index = searchmanager.client.index(content_index)
+
+        result = await index.search(
+            hits_per_page=size,
+            filter=filter,
+            query=query,
+            sort=sort,
+            page=page,
+        )
+
+    # Bad query is not a sign of Meilisearch being down
+    except MeilisearchApiError:
+        raise Abort("search", "query-down")
 
     except MeilisearchError:
+        searchmanager.record_failure()
         raise Abort("search", "query-down")
+
+    searchmanager.record_success()
+
+    return paginated_response(
+        result.hits,
+        result.total_hits,
+        result.page,
+        result.hits_per_page,
+    )
@@ -9,9 +9,13 @@ from .user.history import FavouriteNovelRemoveHistory
 from .user.history import FavouriteAnimeHistory
 from .user.history import FavouriteMangaHistory
 from .user.history import FavouriteNovelHistory
+from .user.history import ReadMangaDeleteHistory
+from .user.history import ReadNovelDeleteHistory
 from .user.history import WatchImportHistory
 from .user.history import WatchDeleteHistory
 from .user.history import ReadImportHistory
+from .user.history import ReadMangaHistory
+from .user.history import ReadNovelHistory
 from .user.history import WatchHistory
 from .user.export import UserExport
 from .user.history import History
@@ -117,9 +121,13 @@ __all__ = [
     "FavouriteAnimeHistory",
     "FavouriteMangaHistory",
     "FavouriteNovelHistory",
+    "ReadMangaDeleteHistory",
+    "ReadNovelDeleteHistory",
     "WatchImportHistory",
     "WatchDeleteHistory",
     "ReadImportHistory",
+    "ReadMangaHistory",
+    "ReadNovelHistory",
     "WatchHistory",
     "UserExport",
     "History",
@@ -42,7 +42,7 @@ class AnimeCollectionContent(CollectionContent):
     content: Mapped["Anime"] = relationship(
         primaryjoin="Anime.id == AnimeCollectionContent.content_id",
         foreign_keys=[content_id],
-        lazy="immediate",  # TODO: check if it is good idea
+        lazy="raise",
     )
 
 
@@ -61,7 +61,7 @@ class CharacterCollectionContent(CollectionContent):
     content: Mapped["Character"] = relationship(
         primaryjoin="Character.id == CharacterCollectionContent.content_id",
         foreign_keys=[content_id],
-        lazy="immediate",  # TODO: check if it is good idea
+        lazy="raise",
     )
 
 
@@ -80,7 +80,7 @@ class PersonCollectionContent(CollectionContent):
     content: Mapped["Person"] = relationship(
         primaryjoin="Person.id == PersonCollectionContent.content_id",
         foreign_keys=[content_id],
-        lazy="immediate",  # TODO: check if it is good idea
+        lazy="raise",
     )
 
 
@@ -99,7 +99,7 @@ class MangaCollectionContent(CollectionContent):
     content: Mapped["Manga"] = relationship(
         primaryjoin="Manga.id == MangaCollectionContent.content_id",
         foreign_keys=[content_id],
-        lazy="immediate",  # TODO: check if it is good idea
+        lazy="raise",
     )
 
 
@@ -118,5 +118,5 @@ class NovelCollectionContent(CollectionContent):
     content: Mapped["Novel"] = relationship(
         primaryjoin="Novel.id == NovelCollectionContent.content_id",
         foreign_keys=[content_id],
-        lazy="immediate",  # TODO: check if it is good idea
+        lazy="raise",
     )
@@ -4,6 +4,7 @@ from sqlalchemy.orm import mapped_column
 from sqlalchemy.orm import relationship
 from sqlalchemy.orm import Mapped
 from ..mixins import SlugMixin
+from datetime import datetime
 from ..base import Base
 
 
@@ -14,6 +15,9 @@ class AnimeStaffRole(Base, SlugMixin):
     name_ua: Mapped[str] = mapped_column(nullable=True)
     weight: Mapped[int] = mapped_column(nullable=True)
 
+    # Lets incremental staff weights pick up role weight changes
+    updated: Mapped[datetime] = mapped_column(nullable=True)
+
     staff: Mapped[list["AnimeStaff"]] = relationship(
         secondary=anime_staff_roles_association_table,
         back_populates="roles",
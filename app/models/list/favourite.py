@@ -34,7 +34,7 @@ class AnimeFavourite(Favourite):
     content: Mapped["Anime"] = relationship(
         primaryjoin="Anime.id == AnimeFavourite.content_id",
         foreign_keys=[content_id],
-        lazy="immediate",  # TODO: check if it is good idea
+        lazy="raise",
     )
 
 
@@ -53,7 +53,7 @@ class MangaFavourite(Favourite):
     content: Mapped["Manga"] = relationship(
         primaryjoin="Manga.id == MangaFavourite.content_id",
         foreign_keys=[content_id],
-        lazy="immediate",  # TODO: check if it is good idea
+        lazy="raise",
     )
 
 
@@ -72,7 +72,7 @@ class NovelFavourite(Favourite):
     content: Mapped["Novel"] = relationship(
         primaryjoin="Novel.id == NovelFavourite.content_id",
         foreign_keys=[content_id],
-        lazy="immediate",  # TODO: check if it is good idea
+        lazy="raise",
     )
 
 
@@ -91,7 +91,7 @@ class CollectionFavourite(Favourite):
     content: Mapped["Collection"] = relationship(
         primaryjoin="Collection.id == CollectionFavourite.content_id",
         foreign_keys=[content_id],
-        lazy="immediate",  # TODO: check if it is good idea
+        lazy="raise",
     )
 
 
@@ -110,5 +110,5 @@ class CharacterFavourite(Favourite):
     content: Mapped["Character"] = relationship(
         primaryjoin="Character.id == CharacterFavourite.content_id",
         foreign_keys=[content_id],
-        lazy="immediate",  # TODO: check if it is good idea
+        lazy="raise",
     )
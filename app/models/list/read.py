@@ -1,6 +1,6 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from ..mixins import CreatedMixin, UpdatedMixin, DeletedMixin
-from sqlalchemy import String, ForeignKey
+from sqlalchemy import String, ForeignKey, Index, text
 from datetime import datetime
 from ..base import Base
 from uuid import UUID
@@ -30,6 +30,16 @@ class Read(Base, CreatedMixin, UpdatedMixin, DeletedMixin):
 
     user: Mapped["User"] = relationship(foreign_keys=[user_id])
 
+    __table_args__ = (
+        Index(
+            "ix_service_read_user_content",
+            user_id,
+            "content_id",
+            unique=True,
+            postgresql_where=text("deleted = false"),
+        ),
+    )
+
 
 class MangaRead(Read):
     __mapper_args__ = {"polymorphic_identity": "manga"}
@@ -1,9 +1,9 @@
-from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import mapped_column
 from sqlalchemy.orm import relationship
 from sqlalchemy.orm import Mapped
 from sqlalchemy import ForeignKey
 from sqlalchemy import String
+from sqlalchemy import Index
 from datetime import datetime
 from ..base import Base
 
@@ -12,9 +12,18 @@ class Activity(Base):
     __tablename__ = "service_user_activity"
 
     interval: Mapped[str] = mapped_column(String(64), index=True)
-    used_logs: Mapped[list[str]] = mapped_column(ARRAY(String))
     timestamp: Mapped[datetime] = mapped_column(index=True)
     actions: Mapped[int]
 
     user_id = mapped_column(ForeignKey("service_users.id"))
     user: Mapped["User"] = relationship(foreign_keys=[user_id])
+
+    __table_args__ = (
+        Index(
+            "ix_activity_user_interval_timestamp",
+            user_id,
+            interval,
+            timestamp,
+            unique=True,
+        ),
+    )
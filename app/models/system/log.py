@@ -4,6 +4,7 @@ from sqlalchemy.orm import relationship
 from sqlalchemy.orm import Mapped
 from sqlalchemy import ForeignKey
 from sqlalchemy import String
+from sqlalchemy import Index
 from datetime import datetime
 from ..base import Base
 from uuid import UUID
@@ -20,3 +21,5 @@ class Log(Base):
 
     user_id = mapped_column(ForeignKey("service_users.id"))
     user: Mapped["User"] = relationship(foreign_keys=[user_id])
+
+    __table_args__ = (Index("ix_logs_created_id", "created", "id"),)
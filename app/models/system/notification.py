@@ -4,6 +4,7 @@ from sqlalchemy.orm import mapped_column
 from sqlalchemy.orm import relationship
 from sqlalchemy.orm import Mapped
 from sqlalchemy import ForeignKey
+from sqlalchemy import Index
 from sqlalchemy import String
 from ..base import Base
 from uuid import UUID
@@ -27,3 +28,13 @@ class Notification(Base, CreatedMixin, UpdatedMixin):
     initiator_user: Mapped["User"] = relationship(
         foreign_keys=[initiator_user_id]
     )
+
+    __table_args__ = (
+        Index(
+            "ix_notification_user_log_type",
+            user_id,
+            log_id,
+            notification_type,
+            unique=True,
+        ),
+    )
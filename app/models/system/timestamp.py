@@ -2,6 +2,7 @@ from sqlalchemy.orm import mapped_column
 from sqlalchemy.orm import Mapped
 from sqlalchemy import String
 from datetime import datetime
+from uuid import UUID
 from ..base import Base
 
 
@@ -10,3 +11,6 @@ class SystemTimestamp(Base):
 
     name: Mapped[str] = mapped_column(String(64), index=True, unique=True)
     timestamp: Mapped[datetime]
+
+    # Together with timestamp forms (created, id) cursor for log consumers
+    log_id: Mapped[UUID] = mapped_column(nullable=True)
@@ -43,7 +43,7 @@ class FavouriteAnimeHistory(History):
     content: Mapped["Anime"] = relationship(
         primaryjoin="Anime.id == FavouriteAnimeHistory.target_id",
         foreign_keys=[target_id],
-        lazy="immediate",  # TODO: check if it is good idea
+        lazy="raise",
     )
 
 
@@ -62,7 +62,7 @@ class FavouriteAnimeRemoveHistory(History):
     content: Mapped["Anime"] = relationship(
         primaryjoin="Anime.id == FavouriteAnimeRemoveHistory.target_id",
         foreign_keys=[target_id],
-        lazy="immediate",  # TODO: check if it is good idea
+        lazy="raise",
     )
 
 
@@ -81,7 +81,7 @@ class FavouriteMangaHistory(History):
     content: Mapped["Manga"] = relationship(
         primaryjoin="Manga.id == FavouriteMangaHistory.target_id",
         foreign_keys=[target_id],
-        lazy="immediate",  # TODO: check if it is good idea
+        lazy="raise",
     )
 
 
@@ -100,7 +100,7 @@ class FavouriteMangaRemoveHistory(History):
     content: Mapped["Manga"] = relationship(
         primaryjoin="Manga.id == FavouriteMangaRemoveHistory.target_id",
         foreign_keys=[target_id],
-        lazy="immediate",  # TODO: check if it is good idea
+        lazy="raise",
     )
 
 
@@ -119,7 +119,7 @@ class FavouriteNovelHistory(History):
     content: Mapped["Novel"] = relationship(
         primaryjoin="Novel.id == FavouriteNovelHistory.target_id",
         foreign_keys=[target_id],
-        lazy="immediate",  # TODO: check if it is good idea
+        lazy="raise",
     )
 
 
@@ -138,7 +138,7 @@ class FavouriteNovelRemoveHistory(History):
     content: Mapped["Novel"] = relationship(
         primaryjoin="Novel.id == FavouriteNovelRemoveHistory.target_id",
         foreign_keys=[target_id],
-        lazy="immediate",  # TODO: check if it is good idea
+        lazy="raise",
     )
 
 
@@ -157,7 +157,7 @@ class WatchHistory(History):
     content: Mapped["Anime"] = relationship(
         primaryjoin="Anime.id == WatchHistory.target_id",
         foreign_keys=[target_id],
-        lazy="immediate",  # TODO: check if it is good idea
+        lazy="raise",
     )
 
 
@@ -176,7 +176,7 @@ class WatchDeleteHistory(History):
     content: Mapped["Anime"] = relationship(
         primaryjoin="Anime.id == WatchDeleteHistory.target_id",
         foreign_keys=[target_id],
-        lazy="immediate",  # TODO: check if it is good idea
+        lazy="raise",
     )
 
 
@@ -209,7 +209,7 @@ class ReadMangaHistory(History):
     content: Mapped["Manga"] = relationship(
         primaryjoin="Manga.id == ReadMangaHistory.target_id",
         foreign_keys=[target_id],
-        lazy="immediate",  # TODO: check if it is good idea
+        lazy="raise",
     )
 
 
@@ -228,7 +228,7 @@ class ReadMangaDeleteHistory(History):
     content: Mapped["Manga"] = relationship(
         primaryjoin="Manga.id == ReadMangaDeleteHistory.target_id",
         foreign_keys=[target_id],
-        lazy="immediate",  # TODO: check if it is good idea
+        lazy="raise",
     )
 
 
@@ -247,7 +247,7 @@ class ReadNovelHistory(History):
     content: Mapped["Novel"] = relationship(
         primaryjoin="Novel.id == ReadNovelHistory.target_id",
         foreign_keys=[target_id],
-        lazy="immediate",  # TODO: check if it is good idea
+        lazy="raise",
     )
 
 
@@ -266,5 +266,5 @@ class ReadNovelDeleteHistory(History):
     content: Mapped["Novel"] = relationship(
         primaryjoin="Novel.id == ReadNovelDeleteHistory.target_id",
         foreign_keys=[target_id],
-        lazy="immediate",  # TODO: check if it is good idea
+        lazy="raise",
     )
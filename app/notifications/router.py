@@ -3,6 +3,7 @@ from .dependencies import validate_notification
 from app.models import Notification, User
 from fastapi import APIRouter, Depends
 from app.database import get_session
+from app.errors import Abort
 from app import constants
 from . import service
 
@@ -14,11 +15,13 @@ from .schemas import (
 
 from app.utils import (
     paginated_response,
+    cursor_response,
     pagination,
 )
 
 from app.dependencies import (
     auth_required,
+    get_cursor,
     get_page,
     get_size,
 )
@@ -39,7 +42,19 @@ async def notifications(
     ),
     page: int = Depends(get_page),
     size: int = Depends(get_size),
+    cursor: list | None = Depends(get_cursor),
 ):
+    if cursor is not None:
+        result = await service.get_user_notifications_cursor(
+            session, user, cursor, size
+        )
+
+        if result is None:
+            raise Abort("system", "bad-cursor")
+
+        next_cursor, notifications = result
+        return cursor_response(notifications, next_cursor)
+
     limit, offset = pagination(page, size)
     total = await service.get_user_notifications_count(session, user)
     notifications = await service.get_user_notifications(
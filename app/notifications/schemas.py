@@ -1,4 +1,5 @@
 from app.schemas import PaginationResponse, CustomModel, UserResponse
+from app.schemas import CursorPaginationResponse
 from app.schemas import datetime_pd
 
 
@@ -13,7 +14,7 @@ class NotificationResponse(CustomModel):
 
 
 class NotificationPaginationResponse(CustomModel):
-    pagination: PaginationResponse
+    pagination: PaginationResponse | CursorPaginationResponse
     list: list[NotificationResponse]
 
 
@@ -1,6 +1,7 @@
 from sqlalchemy import select, desc, update, func, ScalarResult
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
+from app.utils import cursor_paginated_items
 from app.utils import utcnow
 from uuid import UUID
 
@@ -48,6 +49,22 @@ async def get_user_notifications(
     )
 
 
+async def get_user_notifications_cursor(
+    session: AsyncSession, user: User, cursor: list, limit: int
+) -> tuple[str | None, list[Notification]] | None:
+    """Get user notifications after cursor"""
+
+    return await cursor_paginated_items(
+        session,
+        select(Notification)
+        .filter(Notification.user_id == user.id)
+        .options(selectinload(Notification.initiator_user)),
+        [Notification.created, Notification.id],
+        cursor,
+        limit,
+    )
+
+
 async def notification_seen(session: AsyncSession, notification: Notification):
     await session.execute(
         update(Notification)
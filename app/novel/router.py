@@ -60,12 +60,11 @@ async def search_novel(
         )
 
     limit, offset = pagination(page, size)
-    total = await service.novel_search_total(session, search)
-    novel = await service.novel_search(
+    total, novel = await service.novel_search(
         session, search, request_user, limit, offset
     )
 
-    return paginated_response(novel.unique().all(), total, page, limit)
+    return paginated_response(novel, total, page, limit)
 
 
 @router.get(
@@ -8,8 +8,10 @@ from app import meilisearch
 from app import constants
 
 from app.service import (
+    catalog_content_by_ids,
     build_novel_order_by,
     novel_search_filter,
+    catalog_search_ids,
 )
 
 from app.models import (
@@ -53,7 +55,17 @@ async def novel_search(
     request_user: User | None,
     limit: int,
     offset: int,
-):
+) -> tuple[int, list[Novel]]:
+    total, ids = await catalog_search_ids(
+        session,
+        Novel,
+        search,
+        novel_search_filter,
+        build_novel_order_by(search.sort),
+        limit,
+        offset,
+    )
+
     # Load request user read statuses here
     load_options = [
         joinedload(Novel.read),
@@ -63,25 +75,9 @@ async def novel_search(
         ),
     ]
 
-    query = select(Novel).filter(Novel.deleted == False)  # noqa: E712
-    query = novel_search_filter(search, query)
-
-    query = query.order_by(*build_novel_order_by(search.sort))
-
-    query = query.options(*load_options)
-    query = query.limit(limit).offset(offset)
-
-    return await session.scalars(query)
-
-
-async def novel_search_total(session: AsyncSession, search: NovelSearchArgs):
-    query = select(func.count(Novel.id)).filter(
-        Novel.deleted == False,  # noqa: E712
-    )
-
-    query = novel_search_filter(search, query)
+    novel = await catalog_content_by_ids(session, Novel, ids, load_options)
 
-    return await session.scalar(query)
+    return total, novel
 
 
 async def novel_characters_count(session: AsyncSession, novel: Novel) -> int:
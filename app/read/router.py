@@ -150,13 +150,8 @@ async def user_read_list(
     size: int = Depends(get_size),
 ):
     limit, offset = pagination(page, size)
-
-    total = await service.get_user_read_list_count(
-        session, search, content_type, user
-    )
-
-    read = await service.get_user_read_list(
+    total, read = await service.get_user_read_list(
         session, search, content_type, user, limit, offset
     )
 
-    return paginated_response(read.all(), total, page, limit)
+    return paginated_response(read, total, page, limit)
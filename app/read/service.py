@@ -1,9 +1,11 @@
-from sqlalchemy import select, desc, func, ScalarResult
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import select, desc, func
 from app.service import content_type_to_content_class
 from sqlalchemy.ext.asyncio import AsyncSession
 from .schemas import ReadArgs, ReadSearchArgs
 from sqlalchemy.orm import contains_eager
 from sqlalchemy.orm import joinedload
+from app.utils import paginated_items
 from app.utils import utcnow
 from app import constants
 import random
@@ -13,6 +15,9 @@ from app.service import (
     build_novel_order_by,
     manga_search_filter,
     novel_search_filter,
+    apply_stats_delta,
+    status_counts,
+    status_delta,
     create_log,
 )
 
@@ -43,42 +48,32 @@ async def get_user_read_stats(
     )
 
 
-async def generate_read_stats(
-    session: AsyncSession, user: User, content_type: str
-) -> User:
-    completed = await get_user_read_stats(
-        session, user, content_type, constants.READ_COMPLETED
+def read_stats_object():
+    return func.jsonb_build_object(
+        *status_counts(Read, constants.READ),
+        type_=JSONB,
     )
 
-    reading = await get_user_read_stats(
-        session, user, content_type, constants.READ_READING
-    )
 
-    planned = await get_user_read_stats(
-        session, user, content_type, constants.READ_PLANNED
-    )
+def read_stats_field(content_type: str) -> str:
+    return {
+        constants.CONTENT_MANGA: "manga_stats",
+        constants.CONTENT_NOVEL: "novel_stats",
+    }[content_type]
 
-    on_hold = await get_user_read_stats(
-        session, user, content_type, constants.READ_ON_HOLD
-    )
 
-    dropped = await get_user_read_stats(
-        session, user, content_type, constants.READ_DROPPED
+async def generate_read_stats(
+    session: AsyncSession, user: User, content_type: str
+) -> User:
+    read_stats = await session.scalar(
+        select(read_stats_object()).filter(
+            Read.content_type == content_type,
+            Read.deleted == False,  # noqa: E712
+            Read.user_id == user.id,
+        )
     )
 
-    read_stats = {
-        "completed": completed,
-        "reading": reading,
-        "planned": planned,
-        "on_hold": on_hold,
-        "dropped": dropped,
-    }
-
-    if content_type == constants.CONTENT_MANGA:
-        user.manga_stats = read_stats
-
-    if content_type == constants.CONTENT_NOVEL:
-        user.novel_stats = read_stats
+    setattr(user, read_stats_field(content_type), read_stats)
 
     session.add(user)
     await session.commit()
@@ -91,8 +86,9 @@ async def get_read(
     content_type: str,
     content: Manga | Novel,
     user: User,
+    lock: bool = False,
 ):
-    return await session.scalar(
+    query = (
         select(Read)
         .filter(
             Read.deleted == False,  # noqa: E712
@@ -106,6 +102,14 @@ async def get_read(
         )
     )
 
+    # Only read row is locked, content is joined on nullable side
+    if lock:
+        query = query.with_for_update(of=Read).execution_options(
+            populate_existing=True
+        )
+
+    return await session.scalar(query)
+
 
 async def save_read(
     session: AsyncSession,
@@ -125,7 +129,11 @@ async def save_read(
     }.get(content_type)
 
     # Create read record if missing
-    if not (read := await get_read(session, content_type, content, user)):
+    if read := await get_read(session, content_type, content, user, lock=True):
+        old_status = read.status
+
+    else:
+        old_status = None
         log_type = constants.LOG_READ_CREATE
 
         read = read_model()
@@ -163,9 +171,20 @@ async def save_read(
     # Update user last list update
     user.updated = now
 
+    changed = log_before != {} and log_after != {} and log_before != log_after
+
+    # Applied before commit while read row is still locked
+    if changed:
+        await apply_stats_delta(
+            session,
+            user,
+            read_stats_field(content_type),
+            status_delta(old_status, read.status),
+        )
+
     await session.commit()
 
-    if log_before != {} and log_after != {} and log_before != log_after:
+    if changed:
         await create_log(
             session,
             log_type,
@@ -178,8 +197,6 @@ async def save_read(
             },
         )
 
-        await generate_read_stats(session, user, content_type)
-
     return read
 
 
@@ -188,6 +205,8 @@ async def delete_read(
     read: Read,
     user: User,
 ):
+    # Status may have been changed since read was loaded
+    await session.refresh(read, ["status"], with_for_update=True)
     await session.delete(read)
 
     # Update user last list update
@@ -204,7 +223,12 @@ async def delete_read(
         },
     )
 
-    await generate_read_stats(session, user, read.content.data_type)
+    await apply_stats_delta(
+        session,
+        user,
+        read_stats_field(read.content.data_type),
+        status_delta(read.status, None),
+    )
 
     await session.commit()
 
@@ -270,34 +294,6 @@ async def random_read(
     )
 
 
-async def get_user_read_list_count(
-    session: AsyncSession,
-    search: ReadSearchArgs,
-    content_type: str,
-    user: User,
-) -> int:
-    query = select(func.count(Read.id)).filter(
-        Read.content_type == content_type,
-        Read.deleted == False,  # noqa: E712
-        Read.user == user,
-    )
-
-    if search.read_status:
-        query = query.filter(Read.status == search.read_status)
-
-    if content_type == constants.CONTENT_MANGA:
-        query = manga_search_filter(
-            search, query.join(MangaRead.content), False
-        )
-
-    if content_type == constants.CONTENT_NOVEL:
-        query = novel_search_filter(
-            search, query.join(NovelRead.content), False
-        )
-
-    return await session.scalar(query)
-
-
 async def get_user_read_list(
     session: AsyncSession,
     search: ReadSearchArgs,
@@ -305,7 +301,7 @@ async def get_user_read_list(
     user: User,
     limit: int,
     offset: int,
-) -> ScalarResult[Read]:
+) -> tuple[int, list[Read]]:
     query = select(Read).filter(
         Read.content_type == content_type,
         Read.deleted == False,  # noqa: E712
@@ -337,4 +333,4 @@ async def get_user_read_list(
             .options(joinedload(NovelRead.content))
         )
 
-    return await session.scalars(query.limit(limit).offset(offset))
+    return await paginated_items(session, query, limit, offset)
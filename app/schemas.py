@@ -416,6 +416,10 @@ class PaginationResponse(CustomModel):
     page: int = Field(examples=[1])
 
 
+class CursorPaginationResponse(CustomModel):
+    next: str | None = Field(examples=["WyIyMDI0LTAxLTAxVDAwOjAwOjAwIl0"])
+
+
 class WatchResponseBase(CustomModel):
     reference: str = Field(examples=["c773d0bf-1c42-4c18-aec8-1bdd8cb0a434"])
     note: str | None = Field(max_length=2048, examples=["🤯"])
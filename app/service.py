@@ -1,17 +1,26 @@
-from sqlalchemy import select, asc, desc, and_, or_, func
-from sqlalchemy.orm import with_loader_criteria
+from sqlalchemy import select, update, asc, desc, and_, or_, func
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import cast, Integer, bindparam
+from sqlalchemy.orm import with_loader_criteria, with_polymorphic
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql.selectable import Select
 from sqlalchemy.orm import with_expression
 from datetime import datetime, timedelta
+from app.database import sessionmanager
 from sqlalchemy.orm import selectinload
 from sqlalchemy.orm import joinedload
+from app.cache import TTLCache
+from dataclasses import dataclass
 from app import constants
 from uuid import UUID
+import asyncio
+import json
 
 from app.utils import (
     dict_datetime_to_timestamp,
     enumerate_seasons,
+    paginated_items,
     new_token,
     is_uuid,
     utcnow,
@@ -26,6 +35,7 @@ from .schemas import (
 
 from app.models import (
     CharacterCollectionContent,
+    PersonCollectionContent,
     AnimeCollectionContent,
     MangaCollectionContent,
     NovelCollectionContent,
@@ -168,17 +178,26 @@ async def get_content_by_id(
     return await session.scalar(query)
 
 
-async def get_anime_watch(session: AsyncSession, anime: Anime, user: User):
-    return await session.scalar(
-        select(AnimeWatch).filter(
-            # TODO: We would need to get rid of delete eventually
-            # Or handle it in some other manner when anime gets deleted
-            # AnimeWatch.deleted == False,  # noqa: E712
-            AnimeWatch.anime == anime,
-            AnimeWatch.user == user,
-        )
+async def get_anime_watch(
+    session: AsyncSession, anime: Anime, user: User, lock: bool = False
+):
+    query = select(AnimeWatch).filter(
+        # TODO: We would need to get rid of delete eventually
+        # Or handle it in some other manner when anime gets deleted
+        # AnimeWatch.deleted == False,  # noqa: E712
+        AnimeWatch.anime == anime,
+        AnimeWatch.user == user,
     )
 
+    # Locked row is read fresh and held until commit, so concurrent
+    # updates of the same entry are applied one after another
+    if lock:
+        query = query.with_for_update().execution_options(
+            populate_existing=True
+        )
+
+    return await session.scalar(query)
+
 
 async def get_user_by_username(
     session: AsyncSession, username: str
@@ -245,6 +264,14 @@ async def create_email(
     return message
 
 
+async def notify_sync(session: AsyncSession, job: str):
+    """Wake up sync job once current transaction is committed"""
+
+    # Postgres delivers notification only after commit and folds
+    # identical ones sent within same transaction
+    await session.execute(select(func.pg_notify(constants.SYNC_CHANNEL, job)))
+
+
 async def create_log(
     session: AsyncSession,
     log_type: str,
@@ -270,6 +297,7 @@ async def create_log(
     )
 
     session.add(log)
+    await notify_sync(session, constants.SYNC_LOGS)
     await session.commit()
 
     return log
@@ -330,26 +358,89 @@ def anime_loadonly(statement):
     )
 
 
-def calculate_watch_duration(watch: AnimeWatch) -> int:
+def watch_duration(anime: Anime, episodes: int, rewatches: int) -> int:
     # If anime don't have duration set we just return zero
-    if not watch.anime.duration:
+    if not anime.duration:
         return 0
 
     # Rewatches duration is calculated from anime episodes_total field
     rewatches_duration = (
-        watch.anime.episodes_total * watch.anime.duration * watch.rewatches
-        if watch.anime.episodes_total and watch.rewatches
+        anime.episodes_total * anime.duration * rewatches
+        if anime.episodes_total and rewatches
         else 0
     )
 
     # Current watch duration is just episodes * duration
-    episodes_duration = (
-        watch.episodes * watch.anime.duration if watch.episodes else 0
-    )
+    episodes_duration = episodes * anime.duration if episodes else 0
 
     return rewatches_duration + episodes_duration
 
 
+def calculate_watch_duration(watch: AnimeWatch) -> int:
+    return watch_duration(watch.anime, watch.episodes, watch.rewatches)
+
+
+# List stats stuff
+def status_counts(list_model, statuses: list[str]) -> list:
+    # Key/value pairs for jsonb_build_object with entries count per status
+    return [
+        value
+        for status in statuses
+        for value in (
+            status,
+            func.count(list_model.id).filter(list_model.status == status),
+        )
+    ]
+
+
+def status_delta(old_status: str | None, new_status: str | None) -> dict:
+    delta = {}
+
+    if old_status != new_status:
+        if old_status is not None:
+            delta[old_status] = -1
+
+        if new_status is not None:
+            delta[new_status] = 1
+
+    return delta
+
+
+async def apply_stats_delta(
+    session: AsyncSession, user: User, field: str, delta: dict[str, int]
+):
+    """Add delta to user list stats counters"""
+
+    delta = {key: value for key, value in delta.items() if value != 0}
+
+    if len(delta) == 0:
+        return
+
+    column = getattr(User, field)
+    stats = func.coalesce(column, cast({}, JSONB))
+
+    # Counters are incremented in database instead of being written
+    # from memory, so updates of different entries don't overwrite each
+    # other (entry itself must be locked by caller for delta to be exact)
+    values = []
+
+    for key, value in delta.items():
+        values += [
+            key,
+            func.coalesce(cast(stats[key].astext, Integer), 0) + value,
+        ]
+
+    result = await session.scalar(
+        update(User)
+        .filter(User.id == user.id)
+        .values({field: stats.op("||")(func.jsonb_build_object(*values))})
+        .returning(column)
+        .execution_options(synchronize_session=False)
+    )
+
+    set_committed_value(user, field, result)
+
+
 # Search stuff
 def anime_search_filter(
     search: AnimeSearchArgsBase, query: Select, hide_nsfw=True
@@ -526,6 +617,31 @@ def build_anime_order_by(sort: list[str]):
 
 
 # Collections stuff
+collection_content_models = [
+    CharacterCollectionContent,
+    PersonCollectionContent,
+    AnimeCollectionContent,
+    MangaCollectionContent,
+    NovelCollectionContent,
+]
+
+collection_content_entity = with_polymorphic(
+    CollectionContent, collection_content_models
+)
+
+
+def collection_content_query():
+    # Content is loaded with one query per content type
+    return select(collection_content_entity).options(
+        *[
+            selectinload(
+                getattr(collection_content_entity, model.__name__).content
+            )
+            for model in collection_content_models
+        ]
+    )
+
+
 def collections_load_options(
     query: Select, request_user: User | None, preview: bool = False
 ):
@@ -555,6 +671,9 @@ def collections_load_options(
         joinedload(
             Collection.collection.of_type(CharacterCollectionContent)
         ).joinedload(CharacterCollectionContent.content),
+        joinedload(
+            Collection.collection.of_type(PersonCollectionContent)
+        ).joinedload(PersonCollectionContent.content),
     )
 
     # Here we load user vote score for collection
@@ -815,3 +934,233 @@ def novel_search_filter(
             )
 
     return query
+
+
+# Catalog cache stuff
+# Versions are cached separately for few seconds so we don't have to
+# check content tables on every catalog request
+catalog_versions = TTLCache(maxsize=16, ttl=5)
+catalog_cache = TTLCache(maxsize=4096, ttl=300)
+
+# Order of values in these fields does not change search results
+catalog_ordered_fields = ["sort", "score", "native_score", "years"]
+
+
+def normalize_search_args(search) -> str:
+    data = search.model_dump(mode="json")
+
+    for field, value in data.items():
+        if field not in catalog_ordered_fields and isinstance(value, list):
+            data[field] = sorted(value, key=str)
+
+    return json.dumps(data, sort_keys=True)
+
+
+def uses_native_score(search) -> bool:
+    """Check whether search results depend on native score"""
+
+    # Native score is recalculated without touching updated column,
+    # so catalog version can't tell when such results become stale
+    return any(search.native_score) or any(
+        sort.startswith("native_score") for sort in search.sort
+    )
+
+
+async def get_catalog_version(session: AsyncSession, content_model):
+    """Return stamp which changes when any catalog row is changed"""
+
+    key = content_model.__tablename__
+
+    # Every write path bumps updated column, so latest value only grows
+    if (version := catalog_versions.get(key)) is None:
+        version = await session.scalar(select(func.max(content_model.updated)))
+        catalog_versions.set(key, version)
+
+    return version
+
+
+async def catalog_search_ids(
+    session: AsyncSession,
+    content_model,
+    search,
+    search_filter,
+    order_by: list,
+    limit: int,
+    offset: int,
+) -> tuple[int, list[UUID]]:
+    """Return total and page content ids for catalog search (cached)"""
+
+    query = select(content_model.id).filter(
+        content_model.deleted == False  # noqa: E712
+    )
+
+    query = search_filter(search, query).order_by(*order_by)
+
+    if uses_native_score(search):
+        total, ids = await paginated_items(session, query, limit, offset)
+        return total, list(dict.fromkeys(ids))
+
+    version = await get_catalog_version(session, content_model)
+
+    key = (
+        content_model.__tablename__,
+        normalize_search_args(search),
+        version,
+        limit,
+        offset,
+    )
+
+    if (result := catalog_cache.get(key)) is not None:
+        return result
+
+    total, ids = await paginated_items(session, query, limit, offset)
+
+    # Joins on companies or magazines may return same row twice
+    result = (total, list(dict.fromkeys(ids)))
+    catalog_cache.set(key, result)
+
+    return result
+
+
+async def catalog_content_by_ids(
+    session: AsyncSession,
+    content_model,
+    ids: list[UUID],
+    load_options: list,
+):
+    """Load content for cached ids with request user statuses overlay"""
+
+    if len(ids) == 0:
+        return []
+
+    content_list = await session.scalars(
+        select(content_model)
+        .filter(content_model.id.in_(ids))
+        .options(*load_options)
+    )
+
+    order = {content_id: index for index, content_id in enumerate(ids)}
+
+    return sorted(
+        content_list.unique().all(), key=lambda content: order[content.id]
+    )
+
+
+# Auth token cache stuff
+# Only token data is cached, user is loaded on every request so ban
+# or role change takes effect immediately
+@dataclass
+class CachedAuthToken:
+    id: UUID
+    secret: str
+    user_id: UUID
+    client_id: UUID | None
+    scope: list[str]
+    expiration: datetime
+    used: datetime | None
+
+
+class AuthActivityBuffer:
+    """Collect token/user activity bumps and write them in batches"""
+
+    def __init__(self, interval: int = 60):
+        self.interval = interval
+        self.tokens: dict[UUID, dict] = {}
+        self.users: dict[UUID, dict] = {}
+
+    def touch_token(self, token: CachedAuthToken):
+        self.tokens[token.id] = {
+            "token_id": token.id,
+            "used": token.used,
+            "expiration": token.expiration,
+        }
+
+    def touch_user(self, user_id: UUID, last_active: datetime):
+        self.users[user_id] = {"user_id": user_id, "last_active": last_active}
+
+    def forget_token(self, token_id: UUID):
+        self.tokens.pop(token_id, None)
+
+    def clear(self):
+        self.tokens = {}
+        self.users = {}
+
+    async def flush(self, session: AsyncSession):
+        tokens = list(self.tokens.values())
+        users = list(self.users.values())
+
+        self.clear()
+
+        if len(tokens) == 0 and len(users) == 0:
+            return
+
+        # Core executemany does not check matched rows (unlike ORM bulk
+        # update), so token deleted in the meantime is simply skipped
+        if len(tokens) > 0:
+            table = AuthToken.__table__
+            await session.execute(
+                update(table).where(table.c.id == bindparam("token_id")),
+                tokens,
+            )
+
+        if len(users) > 0:
+            table = User.__table__
+            await session.execute(
+                update(table).where(table.c.id == bindparam("user_id")),
+                users,
+            )
+
+        await session.commit()
+
+    async def run(self):
+        """Periodically write buffered activity with its own session"""
+
+        while True:
+            await asyncio.sleep(self.interval)
+
+            try:
+                async with sessionmanager.session() as session:
+                    await self.flush(session)
+
+            except Exception as e:
+                print(f"Auth activity flush failed: {e}")
+
+
+auth_token_cache = TTLCache(maxsize=16384, ttl=30)
+auth_activity = AuthActivityBuffer(interval=60)
+
+
+async def get_cached_auth_token(
+    session: AsyncSession, secret: str
+) -> CachedAuthToken | None:
+    if (token := auth_token_cache.get(secret)) is not None:
+        return token
+
+    # Token owner is loaded in the same query and stays in identity map
+    if not (
+        auth_token := await session.scalar(
+            select(AuthToken)
+            .filter(AuthToken.secret == secret)
+            .options(joinedload(AuthToken.user))
+        )
+    ):
+        return None
+
+    token = CachedAuthToken(
+        id=auth_token.id,
+        secret=auth_token.secret,
+        user_id=auth_token.user_id,
+        client_id=auth_token.client_id,
+        scope=auth_token.scope,
+        expiration=auth_token.expiration,
+        used=auth_token.used,
+    )
+
+    auth_token_cache.set(secret, token)
+
+    return token
+
+
+def invalidate_auth_token(token: AuthToken):
+    auth_token_cache.delete(token.secret)
+    auth_activity.forget_token(token.id)
@@ -3,6 +3,7 @@ from app.common.schemas import UserCustomizationArgs
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.dependencies import auth_required
 from app.database import get_session
+from app.errors import Abort
 from app.models import User
 from app import constants
 from . import service
@@ -23,6 +24,7 @@ from app.service import (
 from .schemas import (
     IgnoredNotificationsResponse,
     IgnoredNotificationsArgs,
+    ImportStatusResponse,
     ReadDeleteContenType,
     ImportWatchListArgs,
     ImportReadListArgs,
@@ -134,19 +136,21 @@ async def change_email(
 async def import_watch(
     args: ImportWatchListArgs,
     background_tasks: BackgroundTasks,
-    session: AsyncSession = Depends(get_session),
     user: User = Depends(
         auth_required(scope=[constants.SCOPE_UPDATE_WATCHLIST])
     ),
 ):
-    # Run watch list import in background
-    # This task may block event loop so we should keep that in mind
-    # https://stackoverflow.com/a/67601373
+    # Only one list import per user may run at the same time
+    if not service.start_import(user, "watch", len(args.anime)):
+        raise Abort("settings", "import-running")
+
+    # Import runs in background with own session, progress can be
+    # checked with import status endpoint
     background_tasks.add_task(
+        service.run_import,
         service.import_watch_list,
-        session,
         args,
-        user,
+        user.id,
     )
 
     return {"success": True}
@@ -160,24 +164,42 @@ async def import_watch(
 async def import_read(
     args: ImportReadListArgs,
     background_tasks: BackgroundTasks,
-    session: AsyncSession = Depends(get_session),
     user: User = Depends(
         auth_required(scope=[constants.SCOPE_UPDATE_READLIST])
     ),
 ):
-    # Run watch list import in background
-    # This task may block event loop so we should keep that in mind
-    # https://stackoverflow.com/a/67601373
+    # Only one list import per user may run at the same time
+    if not service.start_import(user, "read", len(args.content)):
+        raise Abort("settings", "import-running")
+
+    # Import runs in background with own session, progress can be
+    # checked with import status endpoint
     background_tasks.add_task(
+        service.run_import,
         service.import_read_list,
-        session,
         args,
-        user,
+        user.id,
     )
 
     return {"success": True}
 
 
+@router.get(
+    "/import/status",
+    response_model=ImportStatusResponse,
+    summary="Import status",
+)
+async def import_status(
+    user: User = Depends(
+        auth_required(scope=[constants.SCOPE_READ_USER_DETAILS])
+    ),
+):
+    if not (job := service.get_import_job(user)):
+        raise Abort("settings", "import-not-found")
+
+    return job
+
+
 @router.post(
     "/export",
     response_model=UserExportResponse,
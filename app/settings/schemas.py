@@ -99,6 +99,14 @@ class IgnoredNotificationsResponse(CustomModel):
     ignored_notifications: list[str]
 
 
+class ImportStatusResponse(CustomModel):
+    list_type: str = Field(examples=["watch"])
+    processed: int = Field(examples=[1000])
+    imported: int = Field(examples=[950])
+    total: int = Field(examples=[5000])
+    finished: bool
+
+
 class UserExportWatchResponse(CustomModel):
     note: str | None
     hikka_slug: str
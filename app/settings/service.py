@@ -1,8 +1,13 @@
 from app.common.schemas import UserCustomizationArgs
 from app.watch.service import generate_watch_stats
 from app.read.service import generate_read_stats
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, delete, func
+from app.database import sessionmanager
+from dataclasses import dataclass
+from app.cache import TTLCache
+from uuid import UUID, uuid4
 from app import constants
 from . import utils
 
@@ -18,8 +23,8 @@ from app.utils import (
 )
 
 from app.service import (
-    calculate_watch_duration,
-    get_anime_watch,
+    watch_duration,
+    notify_sync,
     create_log,
 )
 
@@ -34,6 +39,28 @@ from app.models import (
 )
 
 
+# Fields replaced by import when user chooses to overwrite list
+WATCH_IMPORT_FIELDS = [
+    "duration",
+    "rewatches",
+    "episodes",
+    "updated",
+    "status",
+    "score",
+    "note",
+]
+
+READ_IMPORT_FIELDS = [
+    "chapters",
+    "volumes",
+    "rereads",
+    "updated",
+    "status",
+    "score",
+    "note",
+]
+
+
 async def change_description(
     session: AsyncSession, user: User, description: str
 ) -> User:
@@ -90,6 +117,8 @@ async def set_username(session: AsyncSession, user: User, username: str):
     user.username = username
     log_after = user.username
 
+    await notify_sync(session, constants.SYNC_SEARCH)
+
     await session.commit()
 
     if log_before != log_after:
@@ -194,6 +223,16 @@ async def delete_user_watch(session: AsyncSession, user: User):
         )
     )
 
+    # Native score of these titles has to be recalculated after delete
+    scored_ids = await session.scalars(
+        select(AnimeWatch.anime_id).filter(
+            AnimeWatch.user == user,
+            AnimeWatch.score > 0,
+        )
+    )
+
+    scored_ids = [str(anime_id) for anime_id in scored_ids]
+
     await session.execute(delete(AnimeWatch).filter(AnimeWatch.user == user))
     await session.commit()
 
@@ -201,7 +240,10 @@ async def delete_user_watch(session: AsyncSession, user: User):
         session,
         constants.LOG_SETTINGS_WATCH_DELETE,
         user,
-        data={"watch_count": watch_count},
+        data={
+            "watch_count": watch_count,
+            "scored_ids": scored_ids,
+        },
     )
 
     await generate_watch_stats(session, user)
@@ -218,6 +260,18 @@ async def delete_user_read(
         )
     )
 
+    # Native score of these titles has to be recalculated after delete
+    scored_ids = await session.scalars(
+        select(Read.content_id).filter(
+            Read.content_type == content_type,
+            Read.deleted == False,  # noqa: E712
+            Read.user == user,
+            Read.score > 0,
+        )
+    )
+
+    scored_ids = [str(content_id) for content_id in scored_ids]
+
     await session.execute(
         delete(Read).filter(
             Read.content_type == content_type,
@@ -234,24 +288,74 @@ async def delete_user_read(
         data={
             "content_type": content_type,
             "read_count": read_count,
+            "scored_ids": scored_ids,
         },
     )
 
     await generate_read_stats(session, user, content_type)
 
 
+@dataclass
+class ImportJob:
+    """Progress of list import running in background"""
+
+    list_type: str
+    total: int
+    processed: int = 0
+    imported: int = 0
+    finished: bool = False
+
+
+# Import progress per user, kept for a while after import has finished
+import_jobs = TTLCache(4096, 3600)
+
+
+def start_import(user: User, list_type: str, total: int) -> ImportJob | None:
+    """Register import job unless user already has one running"""
+
+    # There are no awaits between check and registration,
+    # so concurrent requests can't both start an import
+    if (job := import_jobs.get(user.id)) and not job.finished:
+        return None
+
+    job = ImportJob(list_type=list_type, total=total)
+    import_jobs.set(user.id, job)
+    return job
+
+
+def get_import_job(user: User) -> ImportJob | None:
+    return import_jobs.get(user.id)
+
+
+async def run_import(import_list, args, user_id: UUID):
+    """Run list import in own session and mark job as finished"""
+
+    job = import_jobs.get(user_id)
+
+    try:
+        async with sessionmanager.session() as session:
+            user = await session.get(User, user_id)
+            await import_list(session, args, user, job)
+
+    finally:
+        if job is not None:
+            job.finished = True
+
+
 async def import_watch_list(
     session: AsyncSession,
     args: ImportWatchListArgs,
     user: User,
+    job: ImportJob | None = None,
 ):
     """Import watch list"""
 
     now = utcnow()
     imported = 0
 
-    # We split list into 20k chunks here due to SQLAlchemy internal limits
-    for anime_chunk in chunkify(args.anime, constants.ALCHEMY_CHUNK_LIMIT):
+    # Every chunk is resolved and written with constant number of queries,
+    # chunk size keeps single upsert within bind parameters limit
+    for anime_chunk in chunkify(args.anime, constants.ALCHEMY_CHUNK_LIMIT_ALT):
         # Get list of mal_ids for optimized db query
         mal_ids = [entry.series_animedb_id for entry in anime_chunk]
 
@@ -266,6 +370,19 @@ async def import_watch_list(
         # And build key/value dict
         anime_cache = {entry.mal_id: entry for entry in cache}
 
+        # Existing watch entries for whole chunk
+        existing = await session.scalars(
+            select(AnimeWatch).filter(
+                AnimeWatch.anime_id.in_(
+                    [anime.id for anime in anime_cache.values()]
+                ),
+                AnimeWatch.user_id == user.id,
+            )
+        )
+
+        existing = {watch.anime_id: watch for watch in existing}
+        values = {}
+
         for data in anime_chunk:
             # If user passed mal_id we don't know about just skip it
             if data.series_animedb_id not in anime_cache:
@@ -273,6 +390,13 @@ async def import_watch_list(
 
             anime = anime_cache[data.series_animedb_id]
 
+            # If anime already in list and user don't want to overwrite it
+            # Just skipt it (same goes for duplicates within import)
+            if not args.overwrite and (
+                anime.id in existing or anime.id in values
+            ):
+                continue
+
             import_status = utils.get_anime_import_status(data.my_status)
             import_note = (
                 data.my_comments[:2048]  # NOTE max lenght is 2048 characters
@@ -294,33 +418,53 @@ async def import_watch_list(
             if anime.episodes_total and import_episodes > anime.episodes_total:
                 import_episodes = anime.episodes_total
 
-            if watch := await get_anime_watch(session, anime, user):
-                # If anime already in list and user don't want to overwrite it
-                # Just skipt it
-                if not args.overwrite:
-                    continue
-
-            else:
-                watch = AnimeWatch()
-                watch.created = now
-                watch.anime = anime
-                watch.user = user
-
-            watch.rewatches = import_rewatches
-            watch.episodes = import_episodes
-            watch.status = import_status
-            watch.score = data.my_score
-            watch.note = import_note
-
-            watch.duration = calculate_watch_duration(watch)
-            watch.updated = now
+            values[anime.id] = {
+                "duration": watch_duration(
+                    anime, import_episodes, import_rewatches
+                ),
+                "rewatches": import_rewatches,
+                "episodes": import_episodes,
+                "status": import_status,
+                "score": data.my_score,
+                "note": import_note,
+            }
 
-            imported += 1
+        imported += len(values)
 
-            session.add(watch)
+        rows = [
+            {
+                "id": uuid4(),
+                "anime_id": anime_id,
+                "user_id": user.id,
+                "created": now,
+                "updated": now,
+                **entry,
+            }
+            for anime_id, entry in values.items()
+            if not utils.is_unchanged(existing.get(anime_id), entry)
+        ]
+
+        if len(rows) > 0:
+            statement = insert(AnimeWatch).values(rows)
+
+            await session.execute(
+                statement.on_conflict_do_update(
+                    index_elements=[AnimeWatch.anime_id, AnimeWatch.user_id],
+                    set_={
+                        key: statement.excluded[key]
+                        for key in WATCH_IMPORT_FIELDS
+                    },
+                )
+                if args.overwrite
+                else statement.on_conflict_do_nothing()
+            )
 
         await session.commit()
 
+        if job is not None:
+            job.processed += len(anime_chunk)
+            job.imported = imported
+
     if imported > 0:
         await create_log(
             session,
@@ -332,21 +476,11 @@ async def import_watch_list(
         await generate_watch_stats(session, user)
 
 
-async def get_read(session: AsyncSession, content: Manga | Novel, user: User):
-    return await session.scalar(
-        select(Read).filter(
-            Read.content_type == content.data_type,
-            Read.content_id == content.id,
-            Read.deleted == False,  # noqa: E712
-            Read.user == user,
-        )
-    )
-
-
 async def import_read_list(
     session: AsyncSession,
     args: ImportReadListArgs,
     user: User,
+    job: ImportJob | None = None,
 ):
     """Import read list"""
 
@@ -354,8 +488,9 @@ async def import_read_list(
     imported_manga = 0
     imported_novel = 0
 
-    # We split list into 20k chunks here due to SQLAlchemy internal limits
-    for read_chunk in chunkify(args.content, constants.ALCHEMY_CHUNK_LIMIT):
+    # Every chunk is resolved and written with constant number of queries,
+    # chunk size keeps single upsert within bind parameters limit
+    for read_chunk in chunkify(args.content, constants.ALCHEMY_CHUNK_LIMIT_ALT):
         # Get list of mal_ids for optimized db query
         mal_ids = [entry.manga_mangadb_id for entry in read_chunk]
 
@@ -383,6 +518,20 @@ async def import_read_list(
 
         content_cache = manga_cache | novel_cache
 
+        # Existing read entries for whole chunk
+        existing = await session.scalars(
+            select(Read).filter(
+                Read.content_id.in_(
+                    [content.id for content in content_cache.values()]
+                ),
+                Read.deleted == False,  # noqa: E712
+                Read.user_id == user.id,
+            )
+        )
+
+        existing = {read.content_id: read for read in existing}
+        values = {}
+
         for data in read_chunk:
             # If user passed mal_id we don't know about just skip it
             if data.manga_mangadb_id not in content_cache:
@@ -390,6 +539,13 @@ async def import_read_list(
 
             content = content_cache[data.manga_mangadb_id]
 
+            # If content already in list and user don't want to overwrite it
+            # Just skipt it (same goes for duplicates within import)
+            if not args.overwrite and (
+                content.id in existing or content.id in values
+            ):
+                continue
+
             import_status = utils.get_read_import_status(data.my_status)
             import_note = (
                 data.my_comments[:2048]  # NOTE max lenght is 2048 characters
@@ -412,38 +568,58 @@ async def import_read_list(
             if import_rereads > 100:
                 import_rereads = 100
 
-            if read := await get_read(session, content, user):
-                # If content already in list and user don't want to overwrite it
-                # Just skipt it
-                if not args.overwrite:
-                    continue
-
-            else:
-                read = Read()
-                read.created = now
-                read.content_type = content.data_type
-                read.content_id = content.id
-                read.user = user
-
-            read.chapters = import_chapters
-            read.volumes = import_volumes
-            read.rereads = import_rereads
-            read.status = import_status
-            read.score = data.my_score
-            read.note = import_note
-
-            read.updated = now
-
-            if read.content_type == constants.CONTENT_MANGA:
+            values[content.id] = {
+                "content_type": content.data_type,
+                "chapters": import_chapters,
+                "volumes": import_volumes,
+                "rereads": import_rereads,
+                "status": import_status,
+                "score": data.my_score,
+                "note": import_note,
+            }
+
+        for entry in values.values():
+            if entry["content_type"] == constants.CONTENT_MANGA:
                 imported_manga += 1
 
-            if read.content_type == constants.CONTENT_NOVEL:
+            if entry["content_type"] == constants.CONTENT_NOVEL:
                 imported_novel += 1
 
-            session.add(read)
+        rows = [
+            {
+                "id": uuid4(),
+                "content_id": content_id,
+                "user_id": user.id,
+                "created": now,
+                "updated": now,
+                **entry,
+            }
+            for content_id, entry in values.items()
+            if not utils.is_unchanged(existing.get(content_id), entry)
+        ]
+
+        if len(rows) > 0:
+            statement = insert(Read).values(rows)
+
+            await session.execute(
+                statement.on_conflict_do_update(
+                    index_elements=[Read.user_id, Read.content_id],
+                    index_where=Read.deleted == False,  # noqa: E712
+                    set_={
+                        key: statement.excluded[key]
+                        for key in READ_IMPORT_FIELDS
+                    },
+                )
+                if args.overwrite
+                else statement.on_conflict_do_nothing()
+            )
 
         await session.commit()
 
+        if job is not None:
+            job.processed += len(read_chunk)
+            job.imported = imported_manga + imported_novel
+
     if imported_manga > 0 or imported_novel > 0:
         await create_log(
             session,
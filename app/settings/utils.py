@@ -23,3 +23,12 @@ def get_read_import_status(raw_status: str) -> str:
         "On-Hold": constants.READ_ON_HOLD,
         "Dropped": constants.READ_DROPPED,
     }.get(raw_status)
+
+
+def is_unchanged(record, values: dict) -> bool:
+    """Check whether list record already has all imported values"""
+
+    if record is None:
+        return False
+
+    return all(getattr(record, key) == value for key, value in values.items())
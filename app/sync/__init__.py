@@ -48,6 +48,12 @@ from .views import update_article_views
 
 from .score import update_scores
 
+from .stats import update_list_stats
+
+from .dispatch import update_logs
+
+from .listen import SyncTrigger
+
 __all__ = [
     "delete_expired_token_requests",
     "digest_year_summary",
@@ -80,6 +86,9 @@ __all__ = [
     "update_export",
     "update_counts",
     "update_search",
+    "update_list_stats",
     "update_scores",
+    "update_logs",
+    "SyncTrigger",
     "send_emails",
 ]
@@ -1,18 +1,22 @@
+from app.sync.logs import LogConsumer, dispatch_logs
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from datetime import datetime, timedelta
-from sqlalchemy.orm import selectinload
 from app.database import sessionmanager
-from sqlalchemy import select, asc
+from collections import Counter
+from datetime import timedelta
 from app import constants
-import copy
+from uuid import uuid4
 
 from app.models import (
-    SystemTimestamp,
     Activity,
     Log,
 )
 
 
+# Rows per upsert statement, keeps us well below bind parameters limit
+ACTIVITY_UPSERT_SIZE = 5000
+
+
 def round_day(date):
     return date - timedelta(
         days=date.day % 1,
@@ -23,67 +27,52 @@ def round_day(date):
     )
 
 
-async def generate_activity(session: AsyncSession):
-    # Get system timestamp for latest activity update
-    if not (
-        system_timestamp := await session.scalar(
-            select(SystemTimestamp).filter(SystemTimestamp.name == "activity")
-        )
-    ):
-        system_timestamp = SystemTimestamp(
-            **{
-                "timestamp": datetime(2024, 1, 13),
-                "name": "activity",
-            }
+async def upsert_activity(session: AsyncSession, counter: Counter):
+    values = [
+        {
+            "id": uuid4(),
+            "interval": constants.INTERVAL_DAY,
+            "timestamp": timestamp,
+            "user_id": user_id,
+            "actions": actions,
+        }
+        for (user_id, timestamp), actions in counter.items()
+    ]
+
+    for start in range(0, len(values), ACTIVITY_UPSERT_SIZE):
+        statement = insert(Activity).values(
+            values[start : start + ACTIVITY_UPSERT_SIZE]
         )
 
-    # Get new logs that were created since last update
-    logs = await session.scalars(
-        select(Log)
-        .filter(Log.created > system_timestamp.timestamp)
-        .options(selectinload(Log.user))
-        .order_by(asc(Log.created))
-    )
-
-    for log in logs:
-        # We set timestamp here because after thay it won't be set due to continue
-        system_timestamp.timestamp = log.created
+        await session.execute(
+            statement.on_conflict_do_update(
+                index_elements=["user_id", "interval", "timestamp"],
+                set_={"actions": Activity.actions + statement.excluded.actions},
+            )
+        )
 
-        timestamp = round_day(log.created)
 
-        if not (
-            activity := await session.scalar(
-                select(Activity).filter(
-                    Activity.interval == constants.INTERVAL_DAY,
-                    Activity.timestamp == timestamp,
-                    Activity.user == log.user,
-                )
-            )
-        ):
-            activity = Activity(
-                **{
-                    "interval": constants.INTERVAL_DAY,
-                    "timestamp": timestamp,
-                    "user": log.user,
-                    "used_logs": [],
-                    "actions": 0,
-                }
-            )
+async def process_activity(session: AsyncSession, logs: list[Log]):
+    # Count actions per user and day in memory instead of
+    # looking up activity record for every single log
+    counter = Counter(
+        (log.user_id, round_day(log.created))
+        for log in logs
+        if log.user_id is not None
+    )
 
-        if str(log.id) in activity.used_logs:
-            continue
+    await upsert_activity(session, counter)
 
-        # Just leave it here, trust me (SQLAlchemy shenanigans)
-        activity.used_logs = copy.deepcopy(activity.used_logs)
 
-        activity.used_logs.append(str(log.id))
-        activity.actions = len(activity.used_logs)
+activity_consumer = LogConsumer(
+    name="activity",
+    log_types=None,
+    process=process_activity,
+)
 
-        session.add(activity)
-        await session.commit()
 
-    session.add(system_timestamp)
-    await session.commit()
+async def generate_activity(session: AsyncSession):
+    await dispatch_logs(session, [activity_consumer])
 
 
 async def update_activity():
@@ -1,3 +1,6 @@
+from .pipeline import PIPELINE_WORKERS, PIPELINE_WRITERS
+from app.sync.search import update_search, SEARCH_WORKERS
+from .graph import ConnectionBudget, run_stages, Stage
 from .franchises import aggregator_franchises
 from .characters import aggregator_characters
 from .info.anime import aggregator_anime_info
@@ -8,13 +11,14 @@ from .companies import aggregator_companies
 from .magazines import aggregator_magazines
 from app.sync.weights import update_weights
 from app.sync.counts import update_counts
-from app.sync.search import update_search
+from .requests import aggregator_client
 from .people import aggregator_people
 from .genres import aggregator_genres
 from .anime import aggregator_anime
 from .manga import aggregator_manga
 from .novel import aggregator_novel
 from .roles import aggregator_roles
+import asyncio
 
 from app.aggregator.utils import (
     send_telegram_notification,
@@ -23,115 +27,165 @@ from app.aggregator.utils import (
 )
 
 
-async def update_aggregator():
-    tracker = SyncTracker()
-
-    print("Genres")
-    tracker.add_task(["Синхронізую жанри", "Синхронізувала жанри"])
-    message_id = await send_telegram_notification(tracker.get_status_message())
-    await aggregator_genres()
-
-    print("Roles")
-    tracker.add_task(["Синхронізую ролі", "Синхронізувала ролі"])
-    await update_telegram_message(message_id, tracker.get_status_message())
-    await aggregator_roles()
-
-    print("Characters")
-    tracker.add_task(["Синхронізую персонажів", "Синхронізувала персонажів"])
-    await update_telegram_message(message_id, tracker.get_status_message())
-    await aggregator_characters()
-
-    print("Companies")
-    tracker.add_task(["Синхронізую компанії", "Синхронізувала компанії"])
-    await update_telegram_message(message_id, tracker.get_status_message())
-    await aggregator_companies()
-
-    print("Magazines")
-    tracker.add_task(["Синхронізую журнали", "Синхронізувала журнали"])
-    await update_telegram_message(message_id, tracker.get_status_message())
-    await aggregator_magazines()
-
-    print("People")
-    tracker.add_task(["Синхронізую людей", "Синхронізувала людей"])
-    await update_telegram_message(message_id, tracker.get_status_message())
-    await aggregator_people()
-
-    print("Anime")
-    tracker.add_task(["Синхронізую аніме", "Синхронізувала аніме"])
-    await update_telegram_message(message_id, tracker.get_status_message())
-    await aggregator_anime()
-
-    print("Manga")
-    tracker.add_task(["Синхронізую манґу", "Синхронізувала манґу"])
-    await update_telegram_message(message_id, tracker.get_status_message())
-    await aggregator_manga()
-
-    print("Novel")
-    tracker.add_task(["Синхронізую ранобе", "Синхронізувала ранобе"])
-    await update_telegram_message(message_id, tracker.get_status_message())
-    await aggregator_novel()
-
-    print("Anime info")
-    tracker.add_task(
+# Listings only depend on aggregator, info stages link content
+# to everything imported before them
+INFO_DEPENDS = ["genres", "roles", "characters", "people"]
+
+AGGREGATOR_STAGES = [
+    Stage(
+        "genres",
+        ["Синхронізую жанри", "Синхронізувала жанри"],
+        aggregator_genres,
+    ),
+    Stage(
+        "roles",
+        ["Синхронізую ролі", "Синхронізувала ролі"],
+        aggregator_roles,
+    ),
+    Stage(
+        "characters",
+        ["Синхронізую персонажів", "Синхронізувала персонажів"],
+        aggregator_characters,
+        connections=PIPELINE_WRITERS,
+    ),
+    Stage(
+        "companies",
+        ["Синхронізую компанії", "Синхронізувала компанії"],
+        aggregator_companies,
+        connections=PIPELINE_WRITERS,
+    ),
+    Stage(
+        "magazines",
+        ["Синхронізую журнали", "Синхронізувала журнали"],
+        aggregator_magazines,
+        connections=PIPELINE_WRITERS,
+    ),
+    Stage(
+        "people",
+        ["Синхронізую людей", "Синхронізувала людей"],
+        aggregator_people,
+        connections=PIPELINE_WRITERS,
+    ),
+    Stage(
+        "anime",
+        ["Синхронізую аніме", "Синхронізувала аніме"],
+        aggregator_anime,
+        connections=PIPELINE_WRITERS,
+    ),
+    Stage(
+        "manga",
+        ["Синхронізую манґу", "Синхронізувала манґу"],
+        aggregator_manga,
+        connections=PIPELINE_WRITERS,
+    ),
+    Stage(
+        "novel",
+        ["Синхронізую ранобе", "Синхронізувала ранобе"],
+        aggregator_novel,
+        connections=PIPELINE_WRITERS,
+    ),
+    Stage(
+        "anime_info",
         [
             "Синхронізую інформацію про аніме",
             "Синхронізувала інформацію про аніме",
-        ]
-    )
-    await update_telegram_message(message_id, tracker.get_status_message())
-    await aggregator_anime_info()
-
-    print("Manga info")
-    tracker.add_task(
+        ],
+        aggregator_anime_info,
+        depends=INFO_DEPENDS + ["companies", "anime"],
+        connections=PIPELINE_WORKERS,
+    ),
+    Stage(
+        "manga_info",
         [
             "Синхронізую інформацію про манґу",
             "Синхронізувала інформацію про манґу",
-        ]
-    )
-    await update_telegram_message(message_id, tracker.get_status_message())
-    await aggregator_manga_info()
-
-    print("Novel info")
-    tracker.add_task(
+        ],
+        aggregator_manga_info,
+        depends=INFO_DEPENDS + ["magazines", "manga"],
+        connections=PIPELINE_WORKERS,
+    ),
+    Stage(
+        "novel_info",
         [
             "Синхронізую інформацію про ранобе",
             "Синхронізувала інформацію про ранобе",
-        ]
-    )
-    await update_telegram_message(message_id, tracker.get_status_message())
-    await aggregator_novel_info()
+        ],
+        aggregator_novel_info,
+        depends=INFO_DEPENDS + ["magazines", "novel"],
+        connections=PIPELINE_WORKERS,
+    ),
+    # Franchises update same content rows as info stages,
+    # so we wait for them to avoid lock contention
+    Stage(
+        "franchises",
+        ["Синхронізую франшизи", "Синхронізувала франшизи"],
+        aggregator_franchises,
+        depends=["anime_info", "manga_info", "novel_info"],
+        connections=PIPELINE_WRITERS,
+    ),
+    Stage(
+        "schedule",
+        ["Синхронізую календар", "Синхронізувала календар"],
+        update_schedule_build,
+        depends=["anime_info"],
+    ),
+    Stage(
+        "search",
+        ["Оновлюю пошук", "Оновила пошук"],
+        update_search,
+        depends=["franchises", "schedule"],
+        connections=SEARCH_WORKERS,
+    ),
+    # TODO: improve performance
+    Stage(
+        "weights",
+        ["Перераховую ваги", "Перерахувала ваги"],
+        update_weights,
+        depends=["anime_info", "manga_info", "novel_info"],
+    ),
+    Stage(
+        "counts",
+        [
+            "Перераховую кількості записів",
+            "Перерахувала кількості записів",
+        ],
+        update_counts,
+        depends=["anime_info", "manga_info", "novel_info"],
+    ),
+]
+
 
-    print("Franchises")
-    tracker.add_task(["Синхронізую франшизи", "Синхронізувала франшизи"])
-    await update_telegram_message(message_id, tracker.get_status_message())
-    await aggregator_franchises()
+async def update_aggregator():
+    tracker = SyncTracker()
+    message_lock = asyncio.Lock()
 
-    print("Schedule")
-    tracker.add_task(["Синхронізую календар", "Синхронізувала календар"])
-    await update_telegram_message(message_id, tracker.get_status_message())
-    await update_schedule_build()
+    message_id = await send_telegram_notification(tracker.get_status_message())
 
-    print("Search")
-    tracker.add_task(["Оновлюю пошук", "Оновила пошук"])
-    await update_telegram_message(message_id, tracker.get_status_message())
-    await update_search()
+    async def update_message():
+        # Keep concurrent stages from editing message out of order
+        async with message_lock:
+            await update_telegram_message(
+                message_id, tracker.get_status_message()
+            )
+
+    async def on_start(stage: Stage):
+        print(f"Started {stage.name}")
+        tracker.start_task(stage.name, stage.messages)
+        await update_message()
+
+    async def on_complete(stage: Stage):
+        print(f"Completed {stage.name}")
+        tracker.complete_task(stage.name)
+        await update_message()
+
+    # Whole sync run shares one pool of keep-alive connections
+    async with aggregator_client.session():
+        await run_stages(
+            AGGREGATOR_STAGES, ConnectionBudget(), on_start, on_complete
+        )
 
     # TODO: figure out what to do with deleted content
     # print("Content")
     # await update_content()
 
-    # TODO: improve performance
-    print("Weights")
-    tracker.add_task(["Перераховую ваги", "Перерахувала ваги"])
-    await update_telegram_message(message_id, tracker.get_status_message())
-    await update_weights()
-
-    print("Counts")
-    tracker.add_task(
-        ["Перераховую кількості записів", "Перерахувала кількості записів"]
-    )
-
-    await update_telegram_message(message_id, tracker.get_status_message())
-    await update_counts()
-
     await update_telegram_message(message_id, tracker.get_final_message())
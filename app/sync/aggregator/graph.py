@@ -0,0 +1,101 @@
+from collections.abc import Awaitable, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+import asyncio
+
+
+# Default SQLAlchemy pool has 15 connections (5 + 10 overflow) which
+# are shared with every other sync job and the notification listener,
+# so aggregator stages only get part of it
+SYNC_CONNECTION_BUDGET = 10
+
+
+@dataclass
+class Stage:
+    name: str
+    messages: list[str]
+    run: Callable[[], Awaitable[None]]
+    depends: list[str] = field(default_factory=list)
+
+    # How many database connections stage may hold at once
+    connections: int = 1
+
+
+class ConnectionBudget:
+    """Share fixed number of database connections between stages"""
+
+    def __init__(self, total: int = SYNC_CONNECTION_BUDGET):
+        self.condition = asyncio.Condition()
+        self.available = total
+        self.total = total
+
+    @asynccontextmanager
+    async def reserve(self, count: int):
+        # Stage which wants more than whole budget just runs alone
+        count = min(count, self.total)
+
+        async with self.condition:
+            await self.condition.wait_for(lambda: self.available >= count)
+            self.available -= count
+
+        try:
+            yield
+
+        finally:
+            async with self.condition:
+                self.available += count
+                self.condition.notify_all()
+
+
+def check_stages(stages: list[Stage]):
+    names = {stage.name for stage in stages}
+
+    for stage in stages:
+        for dependency in stage.depends:
+            if dependency not in names:
+                raise ValueError(
+                    f"Stage {stage.name} depends on unknown {dependency}"
+                )
+
+    # Kahn's algorithm, whatever is left unsorted is part of a cycle
+    remaining = {stage.name: set(stage.depends) for stage in stages}
+
+    while ready := [name for name, deps in remaining.items() if not deps]:
+        for name in ready:
+            del remaining[name]
+
+        for deps in remaining.values():
+            deps.difference_update(ready)
+
+    if remaining:
+        raise ValueError(f"Stages have circular dependencies: {remaining}")
+
+
+async def run_stages(
+    stages: list[Stage],
+    budget: ConnectionBudget,
+    on_start: Callable[[Stage], Awaitable[None]],
+    on_complete: Callable[[Stage], Awaitable[None]],
+):
+    """Run every stage as soon as its dependencies are done"""
+
+    check_stages(stages)
+
+    done = {stage.name: asyncio.Event() for stage in stages}
+
+    async def run(stage: Stage):
+        for dependency in stage.depends:
+            await done[dependency].wait()
+
+        async with budget.reserve(stage.connections):
+            await on_start(stage)
+            await stage.run()
+            await on_complete(stage)
+
+        done[stage.name].set()
+
+    # If one stage fails the rest are cancelled, same as sequential run
+    # which would have stopped at failed stage
+    async with asyncio.TaskGroup() as group:
+        for stage in stages:
+            group.create_task(run(stage))
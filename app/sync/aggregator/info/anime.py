@@ -1,24 +1,24 @@
+from ..pipeline import process_concurrently
 from sqlalchemy.orm import selectinload
 from app.database import sessionmanager
 from sqlalchemy import select, desc
 from app.models import Anime
 from app import aggregator
 from .. import requests
-import asyncio
 
 
-async def update_anime_info(semaphore, content_id):
-    async with semaphore:
-        async with sessionmanager.session() as session:
-            anime = await session.scalar(
-                select(Anime)
-                .filter(Anime.content_id == content_id)
-                .options(selectinload(Anime.genres))
-            )
+async def update_anime_info(content_id):
+    # Don't hold database connection while waiting for aggregator
+    data = await requests.get_anime_info(content_id)
 
-            data = await requests.get_anime_info(anime.content_id)
+    async with sessionmanager.session() as session:
+        anime = await session.scalar(
+            select(Anime)
+            .filter(Anime.content_id == content_id)
+            .options(selectinload(Anime.genres))
+        )
 
-            await aggregator.update_anime_info(session, anime, data)
+        await aggregator.update_anime_info(session, anime, data)
 
 
 async def aggregator_anime_info():
@@ -34,10 +34,4 @@ async def aggregator_anime_info():
             .order_by(desc("score"), desc("scored_by"))
         )
 
-    semaphore = asyncio.Semaphore(5)
-
-    tasks = [
-        update_anime_info(semaphore, content_id) for content_id in anime_list
-    ]
-
-    await asyncio.gather(*tasks)
+    await process_concurrently(anime_list, update_anime_info)
@@ -1,25 +1,25 @@
+from ..pipeline import process_concurrently
 from app.database import sessionmanager
 from sqlalchemy.orm import joinedload
 from sqlalchemy import select, desc
 from app.models import Manga
 from app import aggregator
 from .. import requests
-import asyncio
 
 
-async def update_manga_info(semaphore, content_id):
-    async with semaphore:
-        async with sessionmanager.session() as session:
-            manga = await session.scalar(
-                select(Manga)
-                .filter(Manga.content_id == content_id)
-                .options(joinedload(Manga.magazines))
-                .options(joinedload(Manga.genres))
-            )
+async def update_manga_info(content_id):
+    # Don't hold database connection while waiting for aggregator
+    data = await requests.get_manga_info(content_id)
 
-            data = await requests.get_manga_info(manga.content_id)
+    async with sessionmanager.session() as session:
+        manga = await session.scalar(
+            select(Manga)
+            .filter(Manga.content_id == content_id)
+            .options(joinedload(Manga.magazines))
+            .options(joinedload(Manga.genres))
+        )
 
-            await aggregator.update_manga_info(session, manga, data)
+        await aggregator.update_manga_info(session, manga, data)
 
 
 async def aggregator_manga_info():
@@ -35,10 +35,4 @@ async def aggregator_manga_info():
             .order_by(desc("score"), desc("scored_by"))
         )
 
-    semaphore = asyncio.Semaphore(5)
-
-    tasks = [
-        update_manga_info(semaphore, content_id) for content_id in manga_list
-    ]
-
-    await asyncio.gather(*tasks)
+    await process_concurrently(manga_list, update_manga_info)
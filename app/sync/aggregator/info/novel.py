@@ -1,25 +1,25 @@
+from ..pipeline import process_concurrently
 from app.database import sessionmanager
 from sqlalchemy.orm import joinedload
 from sqlalchemy import select, desc
 from app.models import Novel
 from app import aggregator
 from .. import requests
-import asyncio
 
 
-async def update_novel_info(semaphore, content_id):
-    async with semaphore:
-        async with sessionmanager.session() as session:
-            novel = await session.scalar(
-                select(Novel)
-                .filter(Novel.content_id == content_id)
-                .options(joinedload(Novel.magazines))
-                .options(joinedload(Novel.genres))
-            )
+async def update_novel_info(content_id):
+    # Don't hold database connection while waiting for aggregator
+    data = await requests.get_novel_info(content_id)
 
-            data = await requests.get_novel_info(novel.content_id)
+    async with sessionmanager.session() as session:
+        novel = await session.scalar(
+            select(Novel)
+            .filter(Novel.content_id == content_id)
+            .options(joinedload(Novel.magazines))
+            .options(joinedload(Novel.genres))
+        )
 
-            await aggregator.update_novel_info(session, novel, data)
+        await aggregator.update_novel_info(session, novel, data)
 
 
 async def aggregator_novel_info():
@@ -35,10 +35,4 @@ async def aggregator_novel_info():
             .order_by(desc("score"), desc("scored_by"))
         )
 
-    semaphore = asyncio.Semaphore(5)
-
-    tasks = [
-        update_novel_info(semaphore, content_id) for content_id in novel_list
-    ]
-
-    await asyncio.gather(*tasks)
+    await process_concurrently(novel_list, update_novel_info)
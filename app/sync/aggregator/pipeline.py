@@ -0,0 +1,109 @@
+from collections.abc import Awaitable, Callable, Iterable
+from sqlalchemy.exc import IntegrityError
+from typing import Any
+import asyncio
+
+
+# How many fetched pages may wait for DB writers at once
+PIPELINE_QUEUE_PAGES = 10
+
+# Upper bound of concurrent requests to aggregator, actual concurrency
+# is adjusted by aggregator client depending on how well it keeps up
+PIPELINE_FETCHERS = 20
+
+# Concurrent DB writers
+PIPELINE_WRITERS = 2
+
+# Concurrent workers for per entry sync (fetch and save single entry)
+PIPELINE_WORKERS = 5
+
+
+async def ingest_pages(
+    get_page: Callable[[int], Awaitable[dict]],
+    save: Callable[[list], Awaitable[None]],
+    chunk_size: int,
+    fetchers: int = PIPELINE_FETCHERS,
+    writers: int = PIPELINE_WRITERS,
+    queue_pages: int = PIPELINE_QUEUE_PAGES,
+):
+    """Stream paginated aggregator listing into database
+
+    Fetchers put pages into bounded queue and writers drain it in
+    chunks, so only a few pages are kept in memory at a time while
+    network and database work overlap.
+    """
+
+    data = await get_page(1)
+    pages = iter(range(2, data["pagination"]["pages"] + 1))
+
+    queue = asyncio.Queue(maxsize=queue_pages)
+    await queue.put(data["list"])
+
+    # Listing may shift while we paginate through it, in which case
+    # same entry would show up on two pages and could end up in two
+    # concurrent chunks
+    seen = set()
+
+    async def fetcher():
+        # Shared iterator hands out every page exactly once
+        for page in pages:
+            data = await get_page(page)
+            await queue.put(data["list"])
+
+    async def save_chunk(chunk):
+        try:
+            await save(chunk)
+
+        # Concurrent writer could have inserted same related row
+        # (image for example), in which case chunk is retried and
+        # picks it up from database this time
+        except IntegrityError:
+            await save(chunk)
+
+    async def writer():
+        chunk = []
+
+        while (entries := await queue.get()) is not None:
+            for entry in entries:
+                if entry["content_id"] in seen:
+                    continue
+
+                seen.add(entry["content_id"])
+                chunk.append(entry)
+
+            while len(chunk) >= chunk_size:
+                await save_chunk(chunk[:chunk_size])
+                chunk = chunk[chunk_size:]
+
+        if chunk:
+            await save_chunk(chunk)
+
+    async with asyncio.TaskGroup() as group:
+        writer_tasks = [group.create_task(writer()) for _ in range(writers)]
+
+        async with asyncio.TaskGroup() as fetch_group:
+            for _ in range(fetchers):
+                fetch_group.create_task(fetcher())
+
+        # Let writers know there are no more pages coming
+        for _ in writer_tasks:
+            await queue.put(None)
+
+
+async def process_concurrently(
+    items: Iterable,
+    handle: Callable[[Any], Awaitable[None]],
+    workers: int = PIPELINE_WORKERS,
+):
+    """Run handle for every item with fixed number of workers"""
+
+    items = iter(items)
+
+    async def worker():
+        # Shared iterator hands out every item exactly once
+        for item in items:
+            await handle(item)
+
+    async with asyncio.TaskGroup() as group:
+        for _ in range(workers):
+            group.create_task(worker())
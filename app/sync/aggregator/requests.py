@@ -1,156 +1,199 @@
+from contextlib import asynccontextmanager
 from app.utils import get_settings
 import aiohttp
+import asyncio
+import json
+
+
+# Statuses which mean aggregator is struggling and request may be retried
+RETRY_STATUSES = {429, 500, 502, 503, 504}
 
 
-async def get_anime_genres():
-    settings = get_settings()
-
-    endpoint = f"{settings.backend.aggregator}/genres/anime"
+class AdaptiveLimiter:
+    """Concurrency limit which grows while requests succeed
+
+    Limit is increased by one after every limit successful requests
+    and halved on failure (additive increase, multiplicative decrease).
+    """
+
+    def __init__(self, initial: int = 5, minimum: int = 1, maximum: int = 20):
+        self.condition = asyncio.Condition()
+        self.minimum = minimum
+        self.maximum = maximum
+        self.limit = initial
+        self.successes = 0
+        self.active = 0
+
+    async def acquire(self):
+        async with self.condition:
+            await self.condition.wait_for(lambda: self.active < self.limit)
+            self.active += 1
+
+    async def release(self):
+        async with self.condition:
+            self.active -= 1
+            self.condition.notify_all()
+
+    def record_success(self):
+        self.successes += 1
+
+        if self.successes >= self.limit:
+            self.limit = min(self.maximum, self.limit + 1)
+            self.successes = 0
+
+    def record_failure(self):
+        self.limit = max(self.minimum, self.limit // 2)
+        self.successes = 0
+
+    @asynccontextmanager
+    async def slot(self):
+        await self.acquire()
 
-    async with aiohttp.ClientSession() as session:
-        async with session.get(endpoint) as r:
-            data = await r.json()
-            return data
+        try:
+            yield
 
+        finally:
+            await self.release()
 
-async def get_manga_genres():
-    settings = get_settings()
 
-    endpoint = f"{settings.backend.aggregator}/genres/manga"
+class AggregatorClient:
+    """Pooled HTTP client for aggregator
 
-    async with aiohttp.ClientSession() as session:
-        async with session.get(endpoint) as r:
-            data = await r.json()
-            return data
+    Connection pool is kept while at least one session() context is
+    open, so whole sync run reuses keep-alive connections. Requests made
+    outside of it open short lived pool for themselves.
+    """
 
+    def __init__(
+        self,
+        endpoint: str | None = None,
+        timeout: float = 30,
+        retries: int = 5,
+        backoff: float = 1,
+        limiter: AdaptiveLimiter | None = None,
+    ):
+        self.limiter = limiter or AdaptiveLimiter()
+        self.endpoint = endpoint
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
 
-async def get_roles(content_type):
-    settings = get_settings()
+        self._session: aiohttp.ClientSession | None = None
+        self._users = 0
 
-    endpoint = f"{settings.backend.aggregator}/roles/{content_type}"
+    @asynccontextmanager
+    async def session(self):
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.limiter.maximum,
+                    keepalive_timeout=60,
+                ),
+                headers={"Accept-Encoding": "gzip"},
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
 
-    async with aiohttp.ClientSession() as session:
-        async with session.get(endpoint) as r:
-            data = await r.json()
-            return data
+        self._users += 1
 
+        try:
+            yield self._session
 
-async def get_companies(page):
-    settings = get_settings()
+        finally:
+            self._users -= 1
 
-    endpoint = f"{settings.backend.aggregator}/companies?page={page}"
+            if self._users == 0:
+                await self._session.close()
+                self._session = None
 
-    async with aiohttp.ClientSession() as session:
-        async with session.get(endpoint) as r:
-            data = await r.json()
-            return data
+    async def get(self, path: str):
+        endpoint = self.endpoint or get_settings().backend.aggregator
 
+        async with self.session() as session:
+            for attempt in range(self.retries):
+                try:
+                    async with self.limiter.slot():
+                        async with session.get(endpoint + path) as r:
+                            if r.status not in RETRY_STATUSES:
+                                r.raise_for_status()
+
+                                # Parse raw body, skipping decoding it
+                                # into intermediate str first
+                                data = json.loads(await r.read())
+                                self.limiter.record_success()
+                                return data
 
-async def get_magazines(page):
-    settings = get_settings()
+                            error = aiohttp.ClientResponseError(
+                                r.request_info,
+                                r.history,
+                                status=r.status,
+                                message=r.reason or "",
+                            )
 
-    endpoint = f"{settings.backend.aggregator}/magazines?page={page}"
+                except (aiohttp.ClientConnectionError, TimeoutError) as e:
+                    error = e
 
-    async with aiohttp.ClientSession() as session:
-        async with session.get(endpoint) as r:
-            data = await r.json()
-            return data
+                self.limiter.record_failure()
 
+                if attempt < self.retries - 1:
+                    await asyncio.sleep(self.backoff * 2**attempt)
 
-async def get_characters(page):
-    settings = get_settings()
+            raise error
 
-    endpoint = f"{settings.backend.aggregator}/characters?page={page}"
 
-    async with aiohttp.ClientSession() as session:
-        async with session.get(endpoint) as r:
-            data = await r.json()
-            return data
+aggregator_client = AggregatorClient()
 
 
-async def get_people(page):
-    settings = get_settings()
+async def get_anime_genres():
+    return await aggregator_client.get("/genres/anime")
 
-    endpoint = f"{settings.backend.aggregator}/people?page={page}"
 
-    async with aiohttp.ClientSession() as session:
-        async with session.get(endpoint) as r:
-            data = await r.json()
-            return data
+async def get_manga_genres():
+    return await aggregator_client.get("/genres/manga")
 
 
-async def get_anime(page):
-    settings = get_settings()
+async def get_roles(content_type):
+    return await aggregator_client.get(f"/roles/{content_type}")
 
-    endpoint = f"{settings.backend.aggregator}/anime?page={page}"
 
-    async with aiohttp.ClientSession() as session:
-        async with session.get(endpoint) as r:
-            data = await r.json()
-            return data
+async def get_companies(page):
+    return await aggregator_client.get(f"/companies?page={page}")
 
 
-async def get_manga(page):
-    settings = get_settings()
+async def get_magazines(page):
+    return await aggregator_client.get(f"/magazines?page={page}")
 
-    endpoint = f"{settings.backend.aggregator}/manga?page={page}"
 
-    async with aiohttp.ClientSession() as session:
-        async with session.get(endpoint) as r:
-            data = await r.json()
-            return data
+async def get_characters(page):
+    return await aggregator_client.get(f"/characters?page={page}")
 
 
-async def get_novel(page):
-    settings = get_settings()
+async def get_people(page):
+    return await aggregator_client.get(f"/people?page={page}")
 
-    endpoint = f"{settings.backend.aggregator}/novel?page={page}"
 
-    async with aiohttp.ClientSession() as session:
-        async with session.get(endpoint) as r:
-            data = await r.json()
-            return data
+async def get_anime(page):
+    return await aggregator_client.get(f"/anime?page={page}")
 
 
-async def get_franchises(page):
-    settings = get_settings()
+async def get_manga(page):
+    return await aggregator_client.get(f"/manga?page={page}")
 
-    endpoint = f"{settings.backend.aggregator}/franchises?page={page}"
 
-    async with aiohttp.ClientSession() as session:
-        async with session.get(endpoint) as r:
-            data = await r.json()
-            return data
+async def get_novel(page):
+    return await aggregator_client.get(f"/novel?page={page}")
 
 
-async def get_anime_info(content_id):
-    settings = get_settings()
+async def get_franchises(page):
+    return await aggregator_client.get(f"/franchises?page={page}")
 
-    endpoint = f"{settings.backend.aggregator}/anime/{content_id}"
 
-    async with aiohttp.ClientSession() as session:
-        async with session.get(endpoint) as r:
-            data = await r.json()
-            return data
+async def get_anime_info(content_id):
+    return await aggregator_client.get(f"/anime/{content_id}")
 
 
 async def get_manga_info(content_id):
-    settings = get_settings()
-
-    endpoint = f"{settings.backend.aggregator}/manga/{content_id}"
-
-    async with aiohttp.ClientSession() as session:
-        async with session.get(endpoint) as r:
-            data = await r.json()
-            return data
+    return await aggregator_client.get(f"/manga/{content_id}")
 
 
 async def get_novel_info(content_id):
-    settings = get_settings()
-
-    endpoint = f"{settings.backend.aggregator}/novel/{content_id}"
-
-    async with aiohttp.ClientSession() as session:
-        async with session.get(endpoint) as r:
-            data = await r.json()
-            return data
+    return await aggregator_client.get(f"/novel/{content_id}")
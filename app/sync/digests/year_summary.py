@@ -2,6 +2,7 @@ from app.models.association import genres_anime_association_table
 from app.models.association import genres_manga_association_table
 from app.models.association import genres_novel_association_table
 from app.common.utils import utc_to_kyiv, kyiv_to_utc, get_month
+from app.history.service import history_query, history_entity
 from .utils import DateTimeEncoder, find_consecutive_days
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -9,7 +10,6 @@ from app.utils import round_datetime, utcnow
 from sqlalchemy import select, func, desc
 from datetime import datetime, timedelta
 from app.database import sessionmanager
-from sqlalchemy.orm import joinedload
 from app import constants
 import json
 import copy
@@ -262,12 +262,14 @@ class YearStatsGenerator:
             )
 
     async def _fetch_history(self):
+        # Content is loaded together with history, since it's needed
+        # for every record and relationship itself raises on access
         self.history = await self.session.scalars(
-            select(History)
+            history_query()
             .filter(
-                History.created >= self.start,
-                History.created < self.end,
-                History.history_type.in_(
+                history_entity.created >= self.start,
+                history_entity.created < self.end,
+                history_entity.history_type.in_(
                     [
                         constants.HISTORY_WATCH,
                         constants.HISTORY_READ_MANGA,
@@ -275,8 +277,7 @@ class YearStatsGenerator:
                     ]
                 ),
             )
-            .options(joinedload(History.user))
-            .order_by(History.created.asc())
+            .order_by(history_entity.created.asc())
         )
 
     async def _find_top_genres(self, user_ref):
@@ -0,0 +1,23 @@
+from .notifications import notifications_consumer
+from app.sync.logs import dispatch_logs
+from .activity import activity_consumer
+from app.database import sessionmanager
+from .ranking import ranking_consumer
+from .history import history_consumer
+from .score import scores_consumer
+
+
+async def update_logs():
+    """Run log driven sync jobs over single stream of new logs"""
+
+    async with sessionmanager.session() as session:
+        await dispatch_logs(
+            session,
+            [
+                notifications_consumer,
+                history_consumer,
+                activity_consumer,
+                ranking_consumer,
+                scores_consumer,
+            ],
+        )
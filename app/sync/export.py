@@ -1,14 +1,14 @@
+from app.sync.logs import LogConsumer, dispatch_logs
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.utils import to_timestamp, utcnow
 from sqlalchemy.orm import selectinload
 from app.database import sessionmanager
-from sqlalchemy import select, asc
+from sqlalchemy import select
 from datetime import datetime
 from app import constants
 from uuid import UUID
 
 from app.models import (
-    SystemTimestamp,
     UserExport,
     AnimeWatch,
     MangaRead,
@@ -97,52 +97,20 @@ async def get_export_data(session: AsyncSession, user_id: UUID):
     }
 
 
-async def generate_export(session: AsyncSession):
-    # Get system timestamp for latest export update
-    if not (
-        system_timestamp := await session.scalar(
-            select(SystemTimestamp).filter(SystemTimestamp.name == "export")
-        )
-    ):
-        system_timestamp = SystemTimestamp(
-            **{
-                "timestamp": datetime(2025, 2, 25),
-                "name": "export",
-            }
-        )
-
-    # Get new logs that were created since last update
-    logs = await session.scalars(
-        select(Log)
-        .filter(
-            Log.log_type.in_(
-                [
-                    constants.LOG_WATCH_CREATE,
-                    constants.LOG_WATCH_UPDATE,
-                    constants.LOG_WATCH_DELETE,
-                    constants.LOG_READ_CREATE,
-                    constants.LOG_READ_UPDATE,
-                    constants.LOG_READ_DELETE,
-                ]
-            )
-        )
-        .filter(Log.created > system_timestamp.timestamp)
-        .order_by(asc(Log.created))
-    )
+EXPORT_LOG_TYPES = [
+    constants.LOG_WATCH_CREATE,
+    constants.LOG_WATCH_UPDATE,
+    constants.LOG_WATCH_DELETE,
+    constants.LOG_READ_CREATE,
+    constants.LOG_READ_UPDATE,
+    constants.LOG_READ_DELETE,
+]
 
-    user_ids = []
-
-    for log in logs:
-        # We set timestamp here because after thay it won't be set due to continue
-        system_timestamp.timestamp = log.created
-
-        # Here we add user ids to list which will be porcessed further on
-        if log.user_id not in user_ids:
-            user_ids.append(log.user_id)
 
+async def process_export(session: AsyncSession, logs: list[Log]):
     # Getting users which interacted with their list
     users = await session.scalars(
-        select(User).filter(User.id.in_(list(set(user_ids))))
+        select(User).filter(User.id.in_(list({log.user_id for log in logs})))
     )
 
     now = utcnow()
@@ -173,8 +141,17 @@ async def generate_export(session: AsyncSession):
 
         print(f"Generated export for {user.username}")
 
-    session.add(system_timestamp)
-    await session.commit()
+
+export_consumer = LogConsumer(
+    name="export",
+    log_types=EXPORT_LOG_TYPES,
+    process=process_export,
+    start=datetime(2025, 2, 25),
+)
+
+
+async def generate_export(session: AsyncSession):
+    await dispatch_logs(session, [export_consumer])
 
 
 async def update_export():
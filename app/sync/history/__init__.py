@@ -1,9 +1,11 @@
+from app.sync.logs import LogConsumer, dispatch_logs, LOG_BATCH_SIZE
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.models import SystemTimestamp, Log
-from datetime import datetime, timedelta
 from app.database import sessionmanager
-from sqlalchemy import select, asc
+from datetime import timedelta
+from app.models import Log
+from .batch import HistoryBatch
 from app import constants
+from . import service
 
 from .generate import (
     generate_favourite_delete,
@@ -17,83 +19,84 @@ from .generate import (
 )
 
 
-async def generate_history(session: AsyncSession):
-    favourite_delta = timedelta(hours=6)
-    watch_delta = timedelta(hours=3)
-    read_delta = timedelta(hours=3)
-
-    # Get system timestamp for latest history update
-    if not (
-        system_timestamp := await session.scalar(
-            select(SystemTimestamp).filter(SystemTimestamp.name == "history")
-        )
-    ):
-        system_timestamp = SystemTimestamp(
-            **{
-                "timestamp": datetime(2024, 1, 13),
-                "name": "history",
-            }
+HISTORY_LOG_TYPES = [
+    constants.LOG_WATCH_CREATE,
+    constants.LOG_WATCH_UPDATE,
+    constants.LOG_WATCH_DELETE,
+    constants.LOG_READ_CREATE,
+    constants.LOG_READ_UPDATE,
+    constants.LOG_READ_DELETE,
+    constants.LOG_FAVOURITE,
+    constants.LOG_FAVOURITE_REMOVE,
+    constants.LOG_SETTINGS_IMPORT_WATCH,
+    constants.LOG_SETTINGS_IMPORT_READ,
+]
+
+HISTORY_DELTAS = {
+    "favourite": timedelta(hours=6),
+    "watch": timedelta(hours=3),
+    "read": timedelta(hours=3),
+}
+
+
+def process_log(batch: HistoryBatch, log: Log, deltas: dict[str, timedelta]):
+    if log.log_type in [
+        constants.LOG_WATCH_UPDATE,
+        constants.LOG_WATCH_CREATE,
+    ]:
+        generate_watch(batch, log, deltas["watch"])
+
+    if log.log_type in [
+        constants.LOG_READ_UPDATE,
+        constants.LOG_READ_CREATE,
+    ]:
+        generate_read(batch, log, deltas["read"])
+
+    if log.log_type == constants.LOG_WATCH_DELETE:
+        generate_watch_delete(batch, log, deltas["watch"])
+
+    if log.log_type == constants.LOG_READ_DELETE:
+        generate_read_delete(batch, log, deltas["read"])
+
+    if log.log_type == constants.LOG_FAVOURITE:
+        generate_favourite(batch, log, deltas["favourite"])
+
+    if log.log_type == constants.LOG_FAVOURITE_REMOVE:
+        generate_favourite_delete(batch, log, deltas["favourite"])
+
+    if log.log_type == constants.LOG_SETTINGS_IMPORT_WATCH:
+        generate_import_watch(batch, log)
+
+    if log.log_type == constants.LOG_SETTINGS_IMPORT_READ:
+        generate_import_read(batch, log)
+
+
+async def process_history(session: AsyncSession, logs: list[Log]):
+    # Load recent history of all users in batch with one query,
+    # anything older than biggest delta can't be merged with new logs
+    batch = HistoryBatch(
+        await service.get_recent_history(
+            session,
+            list({log.user_id for log in logs}),
+            logs[0].created - max(HISTORY_DELTAS.values()),
         )
-
-    # Get new logs that were created since last update
-    logs = await session.scalars(
-        select(Log)
-        .filter(
-            Log.log_type.in_(
-                [
-                    constants.LOG_WATCH_CREATE,
-                    constants.LOG_WATCH_UPDATE,
-                    constants.LOG_WATCH_DELETE,
-                    constants.LOG_READ_CREATE,
-                    constants.LOG_READ_UPDATE,
-                    constants.LOG_READ_DELETE,
-                    constants.LOG_FAVOURITE,
-                    constants.LOG_FAVOURITE_REMOVE,
-                    constants.LOG_SETTINGS_IMPORT_WATCH,
-                    constants.LOG_SETTINGS_IMPORT_READ,
-                ]
-            )
-        )
-        .filter(Log.created > system_timestamp.timestamp)
-        .order_by(asc(Log.created))
     )
 
     for log in logs:
-        # We set timestamp here because after thay it won't be set due to continue
-        system_timestamp.timestamp = log.created
-
-        if log.log_type in [
-            constants.LOG_WATCH_UPDATE,
-            constants.LOG_WATCH_CREATE,
-        ]:
-            await generate_watch(session, log, watch_delta)
+        process_log(batch, log, HISTORY_DELTAS)
 
-        if log.log_type in [
-            constants.LOG_READ_UPDATE,
-            constants.LOG_READ_CREATE,
-        ]:
-            await generate_read(session, log, read_delta)
+    await batch.save(session)
 
-        if log.log_type == constants.LOG_WATCH_DELETE:
-            await generate_watch_delete(session, log, watch_delta)
 
-        if log.log_type == constants.LOG_READ_DELETE:
-            await generate_read_delete(session, log, read_delta)
-
-        if log.log_type == constants.LOG_FAVOURITE:
-            await generate_favourite(session, log, favourite_delta)
-
-        if log.log_type == constants.LOG_FAVOURITE_REMOVE:
-            await generate_favourite_delete(session, log, favourite_delta)
-
-        if log.log_type == constants.LOG_SETTINGS_IMPORT_WATCH:
-            await generate_import_watch(session, log)
+history_consumer = LogConsumer(
+    name="history",
+    log_types=HISTORY_LOG_TYPES,
+    process=process_history,
+)
 
-        if log.log_type == constants.LOG_SETTINGS_IMPORT_READ:
-            await generate_import_read(session, log)
 
-    session.add(system_timestamp)
-    await session.commit()
+async def generate_history(session: AsyncSession, size: int = LOG_BATCH_SIZE):
+    await dispatch_logs(session, [history_consumer], size)
 
 
 async def update_history():
@@ -0,0 +1,71 @@
+from collections import defaultdict
+from datetime import datetime
+from app.models import History
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class HistoryBatch:
+    """In-memory view of recent users history for batch of logs
+
+    All lookups done by history generators are served from here, so batch
+    of logs needs one query to load history and one commit to save it.
+    """
+
+    def __init__(self, records: list[History]):
+        self.records: dict[UUID, list[History]] = defaultdict(list)
+        self.new: list[History] = []
+        self.deleted: list[History] = []
+
+        for history in records:
+            self.records[history.user_id].append(history)
+
+    def latest(self, user_id: UUID) -> History | None:
+        return max(
+            self.records[user_id],
+            key=lambda history: history.updated,
+            default=None,
+        )
+
+    def find(
+        self,
+        history_type: str,
+        target_id: UUID,
+        user_id: UUID,
+        threshold: datetime,
+    ) -> History | None:
+        return max(
+            [
+                history
+                for history in self.records[user_id]
+                if history.history_type == history_type
+                and history.target_id == target_id
+                and history.created > threshold
+            ],
+            key=lambda history: (history.updated, history.created),
+            default=None,
+        )
+
+    def add(self, history: History):
+        if any(history is record for record in self.records[history.user_id]):
+            return
+
+        self.records[history.user_id].append(history)
+        self.new.append(history)
+
+    def delete(self, history: History):
+        self.records[history.user_id].remove(history)
+
+        # Record created in this batch never reached database
+        if any(history is record for record in self.new):
+            self.new.remove(history)
+            return
+
+        self.deleted.append(history)
+
+    async def save(self, session: AsyncSession):
+        session.add_all(self.new)
+
+        for history in self.deleted:
+            await session.delete(history)
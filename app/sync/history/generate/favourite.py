@@ -1,12 +1,11 @@
-from sqlalchemy.ext.asyncio import AsyncSession
 from app.models import History, Log
+from ..batch import HistoryBatch
 from datetime import timedelta
 from app import constants
-from .. import service
 
 
-async def generate_favourite(
-    session: AsyncSession,
+def generate_favourite(
+    batch: HistoryBatch,
     log: Log,
     favourite_delta: timedelta,
 ):
@@ -21,8 +20,7 @@ async def generate_favourite(
     if not history_type:
         return
 
-    history = await service.get_history(
-        session,
+    history = batch.find(
         history_type,
         log.target_id,
         log.user_id,
@@ -41,5 +39,4 @@ async def generate_favourite(
             }
         )
 
-        session.add(history)
-        await session.commit()
+        batch.add(history)
@@ -1,12 +1,11 @@
-from sqlalchemy.ext.asyncio import AsyncSession
 from app.models import History, Log
+from ..batch import HistoryBatch
 from datetime import timedelta
 from app import constants
-from .. import service
 
 
-async def generate_favourite_delete(
-    session: AsyncSession,
+def generate_favourite_delete(
+    batch: HistoryBatch,
     log: Log,
     favourite_delta: timedelta,
 ):
@@ -27,8 +26,7 @@ async def generate_favourite_delete(
     if not history_type:
         return
 
-    history = await service.get_history(
-        session,
+    history = batch.find(
         history_type,
         log.target_id,
         log.user_id,
@@ -36,8 +34,7 @@ async def generate_favourite_delete(
     )
 
     if history:
-        await session.delete(history)
-        await session.commit()
+        batch.delete(history)
 
     else:
         # For sake of clean code
@@ -52,5 +49,4 @@ async def generate_favourite_delete(
             }
         )
 
-        session.add(history)
-        await session.commit()
+        batch.add(history)
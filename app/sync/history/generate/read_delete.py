@@ -1,12 +1,11 @@
-from sqlalchemy.ext.asyncio import AsyncSession
 from app.models import History, Log
+from ..batch import HistoryBatch
 from datetime import timedelta
 from app import constants
-from .. import service
 
 
-async def generate_read_delete(
-    session: AsyncSession,
+def generate_read_delete(
+    batch: HistoryBatch,
     log: Log,
     read_delta: timedelta,
 ):
@@ -24,8 +23,7 @@ async def generate_read_delete(
         else constants.HISTORY_READ_NOVEL_DELETE
     )
 
-    history = await service.get_history(
-        session,
+    history = batch.find(
         history_type,
         log.target_id,
         log.user_id,
@@ -33,8 +31,7 @@ async def generate_read_delete(
     )
 
     if history:
-        await session.delete(history)
-        await session.commit()
+        batch.delete(history)
 
     else:
         history = History(
@@ -48,5 +45,4 @@ async def generate_read_delete(
             }
         )
 
-        session.add(history)
-        await session.commit()
+        batch.add(history)
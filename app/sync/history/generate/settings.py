@@ -1,9 +1,9 @@
-from sqlalchemy.ext.asyncio import AsyncSession
 from app.models import History, Log
+from ..batch import HistoryBatch
 from app import constants
 
 
-async def generate_import_watch(session: AsyncSession, log: Log):
+def generate_import_watch(batch: HistoryBatch, log: Log):
     history = History(
         **{
             "history_type": constants.HISTORY_WATCH_IMPORT,
@@ -16,11 +16,10 @@ async def generate_import_watch(session: AsyncSession, log: Log):
         }
     )
 
-    session.add(history)
-    await session.commit()
+    batch.add(history)
 
 
-async def generate_import_read(session: AsyncSession, log: Log):
+def generate_import_read(batch: HistoryBatch, log: Log):
     history = History(
         **{
             "history_type": constants.HISTORY_READ_IMPORT,
@@ -33,5 +32,4 @@ async def generate_import_read(session: AsyncSession, log: Log):
         }
     )
 
-    session.add(history)
-    await session.commit()
+    batch.add(history)
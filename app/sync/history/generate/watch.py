@@ -1,17 +1,16 @@
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import flag_modified
 from app.models import History, Log
+from ..batch import HistoryBatch
 from datetime import timedelta
 from app import constants
-from .. import service
-import copy
 
 
-async def generate_watch(session: AsyncSession, log: Log, delta: timedelta):
+def generate_watch(batch: HistoryBatch, log: Log, delta: timedelta):
     threshold = log.created - delta
 
     history_type = constants.HISTORY_WATCH
 
-    latest_history = await service.get_latest_history(session, log.user_id)
+    latest_history = batch.latest(log.user_id)
 
     history = latest_history
     # If latest user history record not related to this content
@@ -44,10 +43,6 @@ async def generate_watch(session: AsyncSession, log: Log, delta: timedelta):
     if str(log.id) in history.used_logs:
         return
 
-    # Just leave it here, trust me (SQLAlchemy shenanigans)
-    history.data = copy.deepcopy(history.data)
-    history.used_logs = copy.deepcopy(history.used_logs)
-
     # Only record unknown keys to before
     for key in log.data["before"]:
         # Skip edited notes
@@ -68,9 +63,12 @@ async def generate_watch(session: AsyncSession, log: Log, delta: timedelta):
     history.used_logs.append(str(log.id))
     history.updated = log.created
 
+    # JSONB and ARRAY columns are changed in place
+    flag_modified(history, "data")
+    flag_modified(history, "used_logs")
+
     # Skip empty history edits
     if history.data["before"] == {} and history.data["after"] == {}:
         return
 
-    session.add(history)
-    await session.commit()
+    batch.add(history)
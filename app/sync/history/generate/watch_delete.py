@@ -1,19 +1,17 @@
-from sqlalchemy.ext.asyncio import AsyncSession
 from app.models import History, Log
+from ..batch import HistoryBatch
 from datetime import timedelta
 from app import constants
-from .. import service
 
 
-async def generate_watch_delete(
-    session: AsyncSession,
+def generate_watch_delete(
+    batch: HistoryBatch,
     log: Log,
     watch_delta: timedelta,
 ):
     threshold = log.created - watch_delta
 
-    history = await service.get_history(
-        session,
+    history = batch.find(
         constants.HISTORY_WATCH,
         log.target_id,
         log.user_id,
@@ -21,8 +19,7 @@ async def generate_watch_delete(
     )
 
     if history:
-        await session.delete(history)
-        await session.commit()
+        batch.delete(history)
 
     else:
         history = History(
@@ -36,5 +33,4 @@ async def generate_watch_delete(
             }
         )
 
-        session.add(history)
-        await session.commit()
+        batch.add(history)
@@ -0,0 +1,110 @@
+from app.database import sessionmanager
+from collections.abc import Awaitable
+from collections.abc import Callable
+from sqlalchemy import text
+from app import constants
+import asyncio
+
+
+# Burst of writes within this window wakes job only once
+SYNC_DEBOUNCE = 1
+
+# How often listening connection is checked to be alive
+LISTEN_HEALTHCHECK = 30
+
+# Delay before reconnecting after listening connection is lost
+LISTEN_RECONNECT = 5
+
+
+class SyncTrigger:
+    """Run sync jobs when Postgres notifies about new work
+
+    Jobs are keyed by notification payload and may also be run
+    by scheduler as fallback, in which case they share same lock
+    so one job never runs twice at the same time.
+    """
+
+    def __init__(
+        self,
+        jobs: dict[str, list[Callable[[], Awaitable[None]]]],
+        debounce: float = SYNC_DEBOUNCE,
+    ):
+        self.jobs = jobs
+        self.debounce = debounce
+        self.events = {name: asyncio.Event() for name in jobs}
+        self.locks = {
+            job: asyncio.Lock() for name in jobs for job in jobs[name]
+        }
+        self.pending = set()
+
+    def notify(self, name: str):
+        if name in self.events:
+            self.events[name].set()
+
+    def handle_notification(self, connection, pid, channel, payload):
+        self.notify(payload)
+
+    async def run(self, job: Callable[[], Awaitable[None]]):
+        lock = self.locks.setdefault(job, asyncio.Lock())
+
+        # Running job may have already read its cursor before new work
+        # arrived, so it is run once more as soon as it finishes
+        if lock.locked():
+            self.pending.add(job)
+            return
+
+        async with lock:
+            while True:
+                self.pending.discard(job)
+
+                try:
+                    await job()
+
+                except Exception as e:
+                    print(f"Sync job {job.__name__} failed: {e}")
+
+                if job not in self.pending:
+                    break
+
+    async def worker(self, name: str):
+        event = self.events[name]
+
+        while True:
+            await event.wait()
+
+            # Let burst of notifications settle before running jobs
+            await asyncio.sleep(self.debounce)
+            event.clear()
+
+            for job in self.jobs[name]:
+                await self.run(job)
+
+    async def listen(self):
+        while True:
+            try:
+                async with sessionmanager.listen(
+                    constants.SYNC_CHANNEL, self.handle_notification
+                ) as connection:
+                    # Catch up with whatever happened while not listening
+                    for name in self.events:
+                        self.notify(name)
+
+                    while True:
+                        await asyncio.sleep(LISTEN_HEALTHCHECK)
+                        await connection.execute(text("SELECT 1"))
+
+                        # Notifications are not delivered inside
+                        # of open transaction
+                        await connection.commit()
+
+            except asyncio.CancelledError:
+                raise
+
+            except Exception as e:
+                print(f"Sync listener disconnected: {e}")
+                await asyncio.sleep(LISTEN_RECONNECT)
+
+    async def start(self):
+        await asyncio.gather(
+            self.listen(), *[self.worker(name) for name in self.jobs]
+        )
@@ -0,0 +1,168 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, asc, tuple_
+from collections.abc import Awaitable
+from collections.abc import Callable
+from app.models import SystemTimestamp
+from dataclasses import dataclass
+from datetime import datetime
+from app.models import Log
+from app.utils import utcnow
+from uuid import UUID
+
+
+# Logs read from database per round trip
+LOG_BATCH_SIZE = 1000
+
+
+@dataclass
+class LogConsumer:
+    """Sync job which processes logs of given types
+
+    Consumer progress is stored as (created, id) cursor in
+    SystemTimestamp under consumer name and committed together
+    with results of processing, so every log is handled once.
+    """
+
+    name: str
+    # None means consumer wants logs of every type
+    log_types: list[str] | None
+    process: Callable[[AsyncSession, list[Log]], Awaitable[None]]
+    # None means consumer starts from the time of its first run
+    start: datetime | None = datetime(2024, 1, 13)
+
+    def wants(self, log: Log) -> bool:
+        return self.log_types is None or log.log_type in self.log_types
+
+
+def log_key(log: Log) -> tuple:
+    return (log.created, log.id)
+
+
+async def get_cursor(
+    session: AsyncSession, consumer: LogConsumer
+) -> SystemTimestamp:
+    if not (
+        cursor := await session.scalar(
+            select(SystemTimestamp).filter(
+                SystemTimestamp.name == consumer.name
+            )
+        )
+    ):
+        cursor = SystemTimestamp(
+            **{
+                "timestamp": consumer.start or utcnow(),
+                "name": consumer.name,
+                "log_id": None,
+            }
+        )
+
+        # Saved right away, so cursor doesn't move forward on every run
+        # while there are no new logs yet
+        session.add(cursor)
+
+    return cursor
+
+
+def after_cursor(timestamp: datetime, log_id):
+    # Cursors saved before log id was tracked only have timestamp
+    if log_id is None:
+        return Log.created > timestamp
+
+    return tuple_(Log.created, Log.id) > tuple_(timestamp, log_id)
+
+
+def is_after_cursor(log: Log, cursor: SystemTimestamp) -> bool:
+    if cursor.log_id is None:
+        return log.created > cursor.timestamp
+
+    return log_key(log) > (cursor.timestamp, cursor.log_id)
+
+
+async def dispatch_logs(
+    session: AsyncSession,
+    consumers: list[LogConsumer],
+    size: int = LOG_BATCH_SIZE,
+):
+    """Read new logs once and fan them out to consumers"""
+
+    cursors = {
+        consumer.name: await get_cursor(session, consumer)
+        for consumer in consumers
+    }
+
+    query = select(Log)
+
+    if all(consumer.log_types is not None for consumer in consumers):
+        query = query.filter(
+            Log.log_type.in_(
+                list(
+                    {
+                        log_type
+                        for consumer in consumers
+                        for log_type in consumer.log_types
+                    }
+                )
+            )
+        )
+
+    # Start from consumer which is behind everyone else
+    # (timestamp only cursor is past all logs created at that moment)
+    start = min(
+        cursors.values(),
+        key=lambda cursor: (
+            cursor.timestamp,
+            cursor.log_id is None,
+            cursor.log_id or UUID(int=0),
+        ),
+    )
+
+    timestamp, log_id = start.timestamp, start.log_id
+    active = list(consumers)
+
+    while len(active) > 0:
+        logs = await session.scalars(
+            query.filter(after_cursor(timestamp, log_id))
+            .order_by(asc(Log.created), asc(Log.id))
+            .limit(size)
+        )
+
+        logs = logs.all()
+
+        if len(logs) == 0:
+            break
+
+        for consumer in list(active):
+            cursor = cursors[consumer.name]
+
+            consumer_logs = [
+                log
+                for log in logs
+                if consumer.wants(log) and is_after_cursor(log, cursor)
+            ]
+
+            # Each consumer works in own savepoint, so failed consumer
+            # stays at its cursor and is retried on next run while
+            # others keep going
+            try:
+                async with session.begin_nested():
+                    if len(consumer_logs) > 0:
+                        await consumer.process(session, consumer_logs)
+
+                    # Cursor moves past whole batch even if consumer
+                    # had nothing to do, so it won't be scanned again
+                    if is_after_cursor(logs[-1], cursor):
+                        cursor.timestamp, cursor.log_id = log_key(logs[-1])
+                        session.add(cursor)
+
+            except Exception as e:
+                active.remove(consumer)
+                print(f"Log consumer {consumer.name} failed: {e}")
+
+        await session.commit()
+
+        timestamp, log_id = log_key(logs[-1])
+
+        if len(logs) < size:
+            break
+
+    await session.commit()
@@ -1,8 +1,7 @@
+from app.sync.logs import LogConsumer, dispatch_logs
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.models import SystemTimestamp, Log
 from app.database import sessionmanager
-from sqlalchemy import select, asc
-from datetime import datetime
+from app.models import Log
 from app import constants
 
 from .generate import (
@@ -19,47 +18,20 @@ from .generate import (
 )
 
 
-async def generate_notifications(session: AsyncSession):
-    # Get system timestamp for latest history update
-    if not (
-        system_timestamp := await session.scalar(
-            select(SystemTimestamp).filter(
-                SystemTimestamp.name == "notifications"
-            )
-        )
-    ):
-        system_timestamp = SystemTimestamp(
-            **{
-                "timestamp": datetime(2024, 1, 13),
-                "name": "notifications",
-            }
-        )
-
-    # Get new logs that were created since last update
-    logs = await session.scalars(
-        select(Log)
-        .filter(
-            Log.log_type.in_(
-                [
-                    constants.LOG_LOGIN_THIRDPARTY,
-                    constants.LOG_SCHEDULE_ANIME,
-                    constants.LOG_COMMENT_WRITE,
-                    constants.LOG_EDIT_UPDATE,
-                    constants.LOG_EDIT_ACCEPT,
-                    constants.LOG_EDIT_DENY,
-                    constants.LOG_VOTE_SET,
-                    constants.LOG_FOLLOW,
-                ]
-            )
-        )
-        .filter(Log.created > system_timestamp.timestamp)
-        .order_by(asc(Log.created))
-    )
+NOTIFICATIONS_LOG_TYPES = [
+    constants.LOG_LOGIN_THIRDPARTY,
+    constants.LOG_SCHEDULE_ANIME,
+    constants.LOG_COMMENT_WRITE,
+    constants.LOG_EDIT_UPDATE,
+    constants.LOG_EDIT_ACCEPT,
+    constants.LOG_EDIT_DENY,
+    constants.LOG_VOTE_SET,
+    constants.LOG_FOLLOW,
+]
 
-    for log in logs:
-        # We set timestamp here because after thay it won't be set due to continue
-        system_timestamp.timestamp = log.created
 
+async def process_notifications(session: AsyncSession, logs: list[Log]):
+    for log in logs:
         if log.log_type == constants.LOG_VOTE_SET:
             if log.data["content_type"] == constants.CONTENT_COMMENT:
                 await generate_comment_vote(session, log)
@@ -95,8 +67,16 @@ async def generate_notifications(session: AsyncSession):
         if log.log_type == constants.LOG_LOGIN_THIRDPARTY:
             await generate_thirdparty_login(session, log)
 
-    session.add(system_timestamp)
-    await session.commit()
+
+notifications_consumer = LogConsumer(
+    name="notifications",
+    log_types=NOTIFICATIONS_LOG_TYPES,
+    process=process_notifications,
+)
+
+
+async def generate_notifications(session: AsyncSession):
+    await dispatch_logs(session, [notifications_consumer])
 
 
 async def update_notifications():
@@ -1,5 +1,7 @@
+from sqlalchemy import select, literal, false, func, not_
+from sqlalchemy.dialects.postgresql import insert, JSONB
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.models import Notification, Log
+from app.models import Notification, AnimeWatch, User, Log
 from app import constants
 from .. import service
 
@@ -11,46 +13,68 @@ async def generate_anime_schedule(session: AsyncSession, log: Log):
     if not (anime := await service.get_anime(session, log.target_id)):
         return
 
-    anime_watch = await service.get_anime_watch(session, anime)
-
-    # TODO: batch check for existing notifications here
-
-    for watch in anime_watch:
-        # Do not create notification if we already did that
-        if await service.get_notification(
-            session, watch.user_id, log.id, notification_type
-        ):
-            continue
-
-        # Stop if user wishes to ignore this type of notifications
-        if notification_type in watch.user.ignored_notifications:
-            continue
-
-        # Special case for planned/on hold entries
-        # We only show notification if status of anime has changed
-        if watch.status in [constants.WATCH_PLANNED, constants.WATCH_ON_HOLD]:
-            if "status" not in log.data["after"]:
-                continue
-
-        notification = Notification(
-            **{
-                "notification_type": notification_type,
-                "user_id": watch.user_id,
-                "created": log.created,
-                "updated": log.created,
-                "log_id": log.id,
-                "seen": False,
-                "data": {
-                    "slug": anime.slug,
-                    "image": anime.image,
-                    "title_ja": anime.title_ja,
-                    "title_en": anime.title_en,
-                    "title_ua": anime.title_ua,
-                    "media_type": anime.media_type,
-                    "before": log.data["before"],
-                    "after": log.data["after"],
-                },
-            }
+    watch_statuses = [constants.WATCH_WATCHING]
+
+    # Special case for planned/on hold entries
+    # We only show notification if status of anime has changed
+    if "status" in log.data["after"]:
+        watch_statuses += [constants.WATCH_PLANNED, constants.WATCH_ON_HOLD]
+
+    data = {
+        "slug": anime.slug,
+        "image": anime.image,
+        "title_ja": anime.title_ja,
+        "title_en": anime.title_en,
+        "title_ua": anime.title_ua,
+        "media_type": anime.media_type,
+        "before": log.data["before"],
+        "after": log.data["after"],
+    }
+
+    # Notifications for all watchers are created by single statement,
+    # users who ignore this type of notifications are skipped in SQL
+    # and unique (user_id, log_id, notification_type) index
+    # protects us from creating the same notification twice
+    watchers = (
+        select(
+            func.gen_random_uuid(),
+            literal(notification_type),
+            AnimeWatch.user_id,
+            literal(log.created),
+            literal(log.created),
+            literal(log.id),
+            false(),
+            literal(data, JSONB),
         )
+        .join(User, User.id == AnimeWatch.user_id)
+        .filter(
+            # AnimeWatch.deleted == False,  # noqa: E712
+            AnimeWatch.anime_id == anime.id,
+            AnimeWatch.status.in_(watch_statuses),
+            not_(
+                func.coalesce(
+                    User.ignored_notifications, literal([], JSONB)
+                ).contains([notification_type])
+            ),
+        )
+    )
 
-        session.add(notification)
+    await session.execute(
+        insert(Notification)
+        .from_select(
+            [
+                "id",
+                "notification_type",
+                "user_id",
+                "created",
+                "updated",
+                "log_id",
+                "seen",
+                "data",
+            ],
+            watchers,
+        )
+        .on_conflict_do_nothing(
+            index_elements=["user_id", "log_id", "notification_type"]
+        )
+    )
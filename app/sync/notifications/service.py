@@ -3,13 +3,11 @@ from sqlalchemy import select, desc, func
 from sqlalchemy.orm import joinedload
 from datetime import timedelta
 from app.utils import utcnow
-from app import constants
 from uuid import UUID
 
 from app.models import (
     Notification,
     Collection,
-    AnimeWatch,
     Comment,
     Article,
     Anime,
@@ -121,21 +119,3 @@ async def get_anime(session, anime_id):
             Anime.deleted == False,  # noqa: E712
         )
     )
-
-
-async def get_anime_watch(session: AsyncSession, anime: Anime):
-    return await session.scalars(
-        select(AnimeWatch)
-        .filter(
-            # AnimeWatch.deleted == False,  # noqa: E712
-            AnimeWatch.anime == anime,
-            AnimeWatch.status.in_(
-                [
-                    constants.WATCH_PLANNED,
-                    constants.WATCH_WATCHING,
-                    constants.WATCH_ON_HOLD,
-                ]
-            ),
-        )
-        .options(joinedload(AnimeWatch.user))
-    )
@@ -1,4 +1,5 @@
 from .collections import update_ranking_all
+from .collections import ranking_consumer
 from .collections import update_ranking
 
 from .articles import update_article_stats
@@ -6,5 +7,6 @@ from .articles import update_article_stats
 __all__ = [
     "update_article_stats",
     "update_ranking_all",
+    "ranking_consumer",
     "update_ranking",
 ]
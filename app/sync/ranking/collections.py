@@ -1,138 +1,145 @@
-from app.utils import calculate_collection_ranking
+from sqlalchemy import select, update, func, cast, literal
+from app.sync.logs import LogConsumer, dispatch_logs
+from sqlalchemy import DateTime, Numeric, Float
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, asc, func
-from sqlalchemy.orm import selectinload
 from app.database import sessionmanager
 from datetime import datetime
+from app.utils import utcnow
 from app import constants
+import math
 
 from app.models import (
     CollectionFavourite,
     CollectionComment,
-    SystemTimestamp,
     Collection,
     Log,
 )
 
 
-async def collection_stats(session: AsyncSession, collection: Collection):
-    favourite = await session.scalar(
-        select(func.count(CollectionFavourite.id)).filter(
-            CollectionFavourite.content_id == collection.id,
-        )
-    )
+# Ranking weights
+RANKING_WEIGHT_SCORE = 1
+RANKING_WEIGHT_FAVOURITE = 2
+RANKING_WEIGHT_COMMENT = 0.1
 
-    comments = await session.scalar(
-        select(func.count(CollectionComment.id)).filter(
-            CollectionComment.content_id == collection.id,
-            CollectionComment.hidden == False,  # noqa: E712
-        )
-    )
+# New collections get boost which decays exponentially
+# from RANKING_BOOST to 1 over RANKING_BOOST_DAYS
+RANKING_BOOST = 30
+RANKING_BOOST_DAYS = 30
 
-    return favourite, comments, collection.vote_score
 
+def collection_ranking(now: datetime, favourite):
+    days = func.floor(
+        func.extract("epoch", literal(now, DateTime) - Collection.created)
+        / 86400
+    )
 
-async def recalculate_ranking_all(session: AsyncSession):
-    collections = await session.scalars(select(Collection))
+    decay_rate = math.log(RANKING_BOOST) / RANKING_BOOST_DAYS
 
-    for collection in collections:
-        favourite, comments, score = await collection_stats(session, collection)
+    boost = func.greatest(RANKING_BOOST * func.exp(-decay_rate * days), 1)
 
-        collection.system_ranking = calculate_collection_ranking(
-            score, favourite, comments, collection.created
-        )
+    ranking = (
+        RANKING_WEIGHT_SCORE * Collection.vote_score
+        + RANKING_WEIGHT_FAVOURITE * favourite
+        # Typed explicitly, otherwise fractional weight is bound as integer
+        + literal(RANKING_WEIGHT_COMMENT, Float) * Collection.comments_count
+    ) * boost
 
-        print(
-            f"Updated collection {collection.title} ranking to {collection.system_ranking}"
-        )
+    return cast(func.round(cast(ranking, Numeric), 8), Float)
 
-        session.add(collection)
 
-    await session.commit()
+async def recalculate_collections_ranking(
+    session: AsyncSession, collection_ids: list | None = None
+):
+    """Recalculate ranking of collections in one statement
 
+    Comments are counted by comments service as they are written, favourites
+    are counted here with single grouped aggregate for all collections.
+    """
 
-async def recalculate_ranking(session: AsyncSession):
-    # Get system timestamp for latest ranking update
-    if not (
-        system_timestamp := await session.scalar(
-            select(SystemTimestamp).filter(SystemTimestamp.name == "ranking")
+    favourites = (
+        select(
+            Collection.id.label("collection_id"),
+            func.count(CollectionFavourite.id).label("favourite"),
         )
-    ):
-        system_timestamp = SystemTimestamp(
-            **{
-                "timestamp": datetime(2024, 1, 13),
-                "name": "ranking",
-            }
+        .outerjoin(
+            CollectionFavourite, CollectionFavourite.content_id == Collection.id
         )
+        .group_by(Collection.id)
+    )
 
-    # Get new logs that were created since last update
-    logs = await session.scalars(
-        select(Log)
-        .filter(
-            Log.log_type.in_(
-                [
-                    constants.LOG_FAVOURITE,
-                    constants.LOG_FAVOURITE_REMOVE,
-                    constants.LOG_COMMENT_WRITE,
-                    constants.LOG_COMMENT_HIDE,
-                    constants.LOG_VOTE_SET,
-                ]
-            )
+    if collection_ids is not None:
+        favourites = favourites.filter(Collection.id.in_(collection_ids))
+
+    favourites = favourites.subquery()
+
+    await session.execute(
+        update(Collection)
+        .filter(Collection.id == favourites.c.collection_id)
+        .values(
+            system_ranking=collection_ranking(utcnow(), favourites.c.favourite)
         )
-        .filter(Log.created > system_timestamp.timestamp)
-        .order_by(asc(Log.created))
+        .execution_options(synchronize_session=False)
     )
 
-    for log in logs:
-        # We set timestamp here because after thay it won't be set due to continue
-        system_timestamp.timestamp = log.created
 
-        collection = None
+async def recalculate_ranking_all(session: AsyncSession):
+    await recalculate_collections_ranking(session)
+    await session.commit()
+
+
+RANKING_LOG_TYPES = [
+    constants.LOG_FAVOURITE,
+    constants.LOG_FAVOURITE_REMOVE,
+    constants.LOG_COMMENT_WRITE,
+    constants.LOG_COMMENT_HIDE,
+    constants.LOG_VOTE_SET,
+]
+
+
+async def process_ranking(session: AsyncSession, logs: list[Log]):
+    collection_ids = set()
+    comment_ids = []
+
+    for log in logs:
+        if log.data["content_type"] != constants.CONTENT_COLLECTION:
+            continue
 
         if log.log_type in [
             constants.LOG_FAVOURITE,
             constants.LOG_FAVOURITE_REMOVE,
             constants.LOG_VOTE_SET,
         ]:
-            if log.data["content_type"] != constants.CONTENT_COLLECTION:
-                continue
-
-            collection = await session.scalar(
-                select(Collection).filter(Collection.id == log.target_id)
-            )
+            collection_ids.add(log.target_id)
 
         if log.log_type in [
             constants.LOG_COMMENT_WRITE,
             constants.LOG_COMMENT_HIDE,
         ]:
-            if log.data["content_type"] != constants.CONTENT_COLLECTION:
-                continue
-
-            comment = await session.scalar(
-                select(CollectionComment)
-                .filter(CollectionComment.id == log.target_id)
-                .options(selectinload(CollectionComment.content))
+            comment_ids.append(log.target_id)
+
+    if comment_ids:
+        collection_ids.update(
+            await session.scalars(
+                select(CollectionComment.content_id).filter(
+                    CollectionComment.id.in_(comment_ids)
+                )
             )
+        )
 
-            collection = comment.content
-
-        if collection:
-            favourite, comments, score = await collection_stats(
-                session, collection
-            )
+    # Every collection touched by this batch is updated at once
+    if collection_ids:
+        await recalculate_collections_ranking(session, list(collection_ids))
 
-            collection.system_ranking = calculate_collection_ranking(
-                score, favourite, comments, collection.created
-            )
 
-            # print(
-            #     f"Updated collection {collection.title} ranking to {collection.system_ranking} ({log.log_type})"
-            # )
+ranking_consumer = LogConsumer(
+    name="ranking",
+    log_types=RANKING_LOG_TYPES,
+    process=process_ranking,
+)
 
-            session.add(collection)
 
-    session.add(system_timestamp)
-    await session.commit()
+async def recalculate_ranking(session: AsyncSession):
+    await dispatch_logs(session, [ranking_consumer])
 
 
 async def update_ranking():
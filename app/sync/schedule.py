@@ -1,5 +1,5 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete, asc
+from sqlalchemy import select, update, delete, asc
 from app.database import sessionmanager
 from datetime import datetime
 from app import constants
@@ -46,18 +46,24 @@ async def update_schedule_aired(session: AsyncSession):
         .order_by(asc(AnimeSchedule.airing_at))
     )
 
-    for schedule in aired:
-        system_timestamp.timestamp = schedule.airing_at
+    aired = aired.all()
 
-        anime = await session.scalar(
-            select(Anime).filter(
-                Anime.id == schedule.anime_id,
-                Anime.deleted == False,  # noqa: E712
-            )
+    anime_list = await session.scalars(
+        select(Anime).filter(
+            Anime.id.in_([schedule.anime_id for schedule in aired]),
+            Anime.deleted == False,  # noqa: E712
         )
+    )
+
+    anime_cache = {anime.id: anime for anime in anime_list}
+
+    records = []
+
+    for schedule in aired:
+        system_timestamp.timestamp = schedule.airing_at
 
         # Just in case
-        if not anime:
+        if not (anime := anime_cache.get(schedule.anime_id)):
             continue
 
         # Fix for SQLAlchemy shenanigans
@@ -112,6 +118,8 @@ async def update_schedule_aired(session: AsyncSession):
 
         # Only create new edit and log records when needed
         if before != {} and after != {}:
+            anime.updated = now
+
             edit = Edit(
                 **{
                     "content_type": constants.CONTENT_ANIME,
@@ -138,27 +146,26 @@ async def update_schedule_aired(session: AsyncSession):
                 }
             )
 
-            session.add_all([anime, edit, log])
-            await session.commit()
+            records.extend([anime, edit, log])
 
+    # Whole run is written at once together with new timestamp
+    session.add_all(records)
     session.add(system_timestamp)
     await session.commit()
 
     # Fix for unupdated ongoing status
     # TODO: figure out why this is happening
-    anime_list = await session.scalars(
-        select(Anime)
+    await session.execute(
+        update(Anime)
         .filter(
             Anime.episodes_total > 1,
             Anime.episodes_released == Anime.episodes_total,
             Anime.status == constants.RELEASE_STATUS_ONGOING,
         )
-        .order_by(Anime.id.desc())
+        .values(status=constants.RELEASE_STATUS_FINISHED, updated=utcnow())
+        .execution_options(synchronize_session=False)
     )
 
-    for anime in anime_list:
-        anime.status = constants.RELEASE_STATUS_FINISHED
-
     await session.commit()
 
 
@@ -185,6 +192,7 @@ async def rollback_episodes_released(
     before["episodes_released"] = anime.episodes_released
     anime.episodes_released = episode.episode - 1
     after["episodes_released"] = anime.episodes_released
+    anime.updated = now
 
     # Only create new edit and log records when needed
     if before != {} and after != {}:
@@ -221,23 +229,31 @@ async def rollback_episodes_released(
 async def build_schedule(session: AsyncSession):
     now = utcnow()
 
-    anime_list = await session.scalars(
-        select(Anime).filter(
-            Anime.status.in_(
-                [
-                    constants.RELEASE_STATUS_ANNOUNCED,
-                    constants.RELEASE_STATUS_ONGOING,
-                ]
-            )
-        )
+    candidates = Anime.status.in_(
+        [
+            constants.RELEASE_STATUS_ANNOUNCED,
+            constants.RELEASE_STATUS_ONGOING,
+        ]
     )
 
-    for anime in anime_list:
-        schedule = await session.scalars(
-            select(AnimeSchedule).filter(AnimeSchedule.anime == anime)
+    anime_list = await session.scalars(select(Anime).filter(candidates))
+
+    # Existing schedule of all candidates is loaded at once
+    schedule = await session.scalars(
+        select(AnimeSchedule).filter(
+            AnimeSchedule.anime_id.in_(select(Anime.id).filter(candidates))
         )
+    )
+
+    schedule_cache = {}
+
+    for entry in schedule:
+        schedule_cache.setdefault(entry.anime_id, {})[entry.episode] = entry
+
+    purge_ids = []
 
-        cache = {entry.episode: entry for entry in schedule}
+    for anime in anime_list:
+        cache = schedule_cache.get(anime.id, {})
 
         # One more awful hack to handle bad schedules from Anilist
         if anime.episodes_total is not None:
@@ -252,14 +268,7 @@ async def build_schedule(session: AsyncSession):
                     break
 
             if purge_after:
-                await session.execute(
-                    delete(AnimeSchedule).filter(
-                        AnimeSchedule.anime == anime,
-                        AnimeSchedule.episode > anime.episodes_total,
-                    )
-                )
-
-                await session.commit()
+                purge_ids.append(anime.id)
                 continue
 
         for episode_data in anime.schedule:
@@ -288,15 +297,11 @@ async def build_schedule(session: AsyncSession):
             if episode.airing_at != airing_at:
                 episode.airing_at = airing_at
                 episode.updated = now
-                session.add(episode)
 
                 # Sometimes our schedule may be not up to date and system can
                 # incorrectly set episodes_released for some entries
                 # In this case we should roll it back
-                if anime := await session.scalar(
-                    select(Anime).filter(Anime.id == episode.anime_id)
-                ):
-                    await rollback_episodes_released(session, episode, anime)
+                await rollback_episodes_released(session, episode, anime)
 
                 print(
                     f"Updated episode #{episode.episode} for {anime.title_ja}"
@@ -304,7 +309,19 @@ async def build_schedule(session: AsyncSession):
 
             session.add(episode)
 
-        await session.commit()
+    # Drop episodes past episodes_total for every affected anime at once
+    if purge_ids:
+        await session.execute(
+            delete(AnimeSchedule)
+            .filter(
+                AnimeSchedule.anime_id == Anime.id,
+                AnimeSchedule.anime_id.in_(purge_ids),
+                AnimeSchedule.episode > Anime.episodes_total,
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    await session.commit()
 
 
 async def update_schedule_build():
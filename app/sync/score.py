@@ -1,6 +1,9 @@
-from sqlalchemy import select, update, func
+from sqlalchemy import select, update, func, exists
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import sessionmanager
+from app.sync.logs import LogConsumer
 from app import constants
+from uuid import UUID
 
 from app.models import (
     AnimeWatch,
@@ -9,45 +12,200 @@ from app.models import (
     Anime,
     Manga,
     Novel,
+    Log,
 )
 
 
-async def update_scores():
-    async with sessionmanager.session() as session:
-        for entry in [
-            (constants.CONTENT_ANIME, Anime, AnimeWatch),
-            (constants.CONTENT_MANGA, Manga, MangaRead),
-            (constants.CONTENT_NOVEL, Novel, NovelRead),
+SCORE_MODELS = {
+    constants.CONTENT_ANIME: (Anime, AnimeWatch),
+    constants.CONTENT_MANGA: (Manga, MangaRead),
+    constants.CONTENT_NOVEL: (Novel, NovelRead),
+}
+
+SCORE_LOG_TYPES = [
+    constants.LOG_WATCH_CREATE,
+    constants.LOG_WATCH_UPDATE,
+    constants.LOG_WATCH_DELETE,
+    constants.LOG_READ_CREATE,
+    constants.LOG_READ_UPDATE,
+    constants.LOG_READ_DELETE,
+    constants.LOG_SETTINGS_IMPORT_WATCH,
+    constants.LOG_SETTINGS_IMPORT_READ,
+    constants.LOG_SETTINGS_WATCH_DELETE,
+    constants.LOG_SETTINGS_READ_DELETE,
+]
+
+
+def list_content_id(list_model):
+    if list_model is AnimeWatch:
+        return AnimeWatch.anime_id
+
+    return list_model.content_id
+
+
+async def recalculate_scores(
+    session: AsyncSession, content_type: str, content_ids: list
+):
+    """Recalculate native score of given titles only"""
+
+    content_model, list_model = SCORE_MODELS[content_type]
+    content_id = list_content_id(list_model)
+
+    # Outer join so titles which lost their last score are reset
+    scored = list_model.score > 0
+    subquery = (
+        select(
+            content_model.id.label("content_id"),
+            func.coalesce(
+                func.round(func.avg(list_model.score).filter(scored), 2), 0
+            ).label("score"),
+            func.count(list_model.id).filter(scored).label("scored_by"),
+        )
+        .outerjoin(list_model, content_id == content_model.id)
+        .filter(content_model.id.in_(content_ids))
+        .group_by(content_model.id)
+        .subquery()
+    )
+
+    await session.execute(
+        update(content_model)
+        .values(
+            native_score=subquery.c.score,
+            native_scored_by=subquery.c.scored_by,
+        )
+        .filter(content_model.id == subquery.c.content_id)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def reconcile_scores(session: AsyncSession, content_type: str):
+    """Recalculate native score of all titles"""
+
+    content_model, list_model = SCORE_MODELS[content_type]
+    content_id = list_content_id(list_model)
+
+    subquery = (
+        select(
+            content_id.label("content_id"),
+            func.round(func.avg(list_model.score), 2).label("score"),
+            func.count(list_model.id).label("scored_by"),
+        )
+        .filter(list_model.score > 0)
+        .group_by(content_id)
+        .subquery()
+    )
+
+    await session.execute(
+        update(content_model)
+        .values(
+            native_score=subquery.c.score,
+            native_scored_by=subquery.c.scored_by,
+        )
+        .filter(
+            content_model.id == subquery.c.content_id,
+            # Only write titles which score has actually changed
+            content_model.native_scored_by.is_distinct_from(
+                subquery.c.scored_by
+            )
+            | content_model.native_score.is_distinct_from(subquery.c.score),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+    # Titles which are not scored by anyone anymore
+    await session.execute(
+        update(content_model)
+        .values(native_score=0, native_scored_by=0)
+        .filter(
+            content_model.native_scored_by > 0,
+            ~exists().where(
+                content_id == content_model.id, list_model.score > 0
+            ),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def process_scores(session: AsyncSession, logs: list[Log]):
+    content_ids = {content_type: set() for content_type in SCORE_MODELS}
+
+    for log in logs:
+        if log.log_type in [
+            constants.LOG_WATCH_CREATE,
+            constants.LOG_WATCH_UPDATE,
+            constants.LOG_WATCH_DELETE,
         ]:
-            content_type, content_model, list_model = entry
-
-            if content_type == constants.CONTENT_ANIME:
-                content_id = list_model.anime_id.label("content_id")
-            else:
-                content_id = list_model.content_id.label("content_id")
-
-            subquery = (
-                select(
-                    content_id,
-                    func.round(func.avg(list_model.score), 2).label("score"),
-                    func.count(list_model.id).label("scored_by"),
+            content_ids[constants.CONTENT_ANIME].add(log.target_id)
+
+        if log.log_type in [
+            constants.LOG_READ_CREATE,
+            constants.LOG_READ_UPDATE,
+            constants.LOG_READ_DELETE,
+        ]:
+            content_ids[log.data["content_type"]].add(log.target_id)
+
+        # Imported titles are whatever is in user list now
+        if log.log_type == constants.LOG_SETTINGS_IMPORT_WATCH:
+            content_ids[constants.CONTENT_ANIME].update(
+                await session.scalars(
+                    select(AnimeWatch.anime_id).filter(
+                        AnimeWatch.user_id == log.user_id
+                    )
                 )
-                .filter(list_model.score > 0)
-                .group_by(content_id)
-                .subquery()
             )
 
-            await session.execute(
-                update(content_model)
-                .values(
-                    native_score=subquery.c.score,
-                    native_scored_by=subquery.c.scored_by,
+        if log.log_type == constants.LOG_SETTINGS_IMPORT_READ:
+            for content_type in [
+                constants.CONTENT_MANGA,
+                constants.CONTENT_NOVEL,
+            ]:
+                _, list_model = SCORE_MODELS[content_type]
+
+                content_ids[content_type].update(
+                    await session.scalars(
+                        select(list_model.content_id).filter(
+                            list_model.user_id == log.user_id
+                        )
+                    )
                 )
-                .filter(content_model.id == subquery.c.content_id)
+
+        # List is gone by now, so scored titles are taken from log
+        if log.log_type == constants.LOG_SETTINGS_WATCH_DELETE:
+            content_ids[constants.CONTENT_ANIME].update(
+                UUID(content_id) for content_id in log.data["scored_ids"]
             )
 
+        if log.log_type == constants.LOG_SETTINGS_READ_DELETE:
+            content_ids[log.data["content_type"]].update(
+                UUID(content_id) for content_id in log.data["scored_ids"]
+            )
+
+    for content_type in SCORE_MODELS:
+        if len(content_ids[content_type]) > 0:
+            await recalculate_scores(
+                session, content_type, list(content_ids[content_type])
+            )
+
+
+scores_consumer = LogConsumer(
+    name="scores",
+    log_types=SCORE_LOG_TYPES,
+    process=process_scores,
+    # Anything before first run is covered by nightly reconciliation
+    start=None,
+)
+
+
+async def update_scores():
+    """Reconcile native scores of all titles with user lists"""
+
+    async with sessionmanager.session() as session:
+        for content_type in SCORE_MODELS:
+            await reconcile_scores(session, content_type)
             await session.commit()
 
+            content_model, _ = SCORE_MODELS[content_type]
+
             scored_count = await session.scalar(
                 select(func.count(content_model.id)).filter(
                     content_model.native_scored_by > 0,
@@ -1,24 +1,49 @@
 from meilisearch_python_sdk.errors import MeilisearchCommunicationError
 from .characters import update_search_characters
 from .companies import update_search_companies
+from meilisearch_python_sdk import AsyncClient
 from .people import update_search_people
 from .anime import update_search_anime
 from .manga import update_search_manga
 from .novel import update_search_novel
 from .users import update_search_users
+from app.utils import get_settings
+import asyncio
+
+
+# Max number of indexes populated at the same time
+SEARCH_WORKERS = 3
+
+
+async def populate_worker(semaphore, client, populate):
+    async with semaphore:
+        try:
+            await populate(client)
+
+        except MeilisearchCommunicationError:
+            print("Meilisearch is down")
 
 
 async def update_search():
     """Update Meilisearch with new data"""
 
-    try:
-        await update_search_characters()
-        await update_search_companies()
-        await update_search_people()
-        await update_search_anime()
-        await update_search_manga()
-        await update_search_novel()
-        await update_search_users()
-
-    except MeilisearchCommunicationError:
-        print("Meilisearch is down")
+    settings = get_settings()
+    semaphore = asyncio.Semaphore(SEARCH_WORKERS)
+
+    # Slow index should not delay others, so each one is populated
+    # by separate worker with own session but shared client
+    async with AsyncClient(**settings.meilisearch) as client:
+        await asyncio.gather(
+            *[
+                populate_worker(semaphore, client, populate)
+                for populate in [
+                    update_search_characters,
+                    update_search_companies,
+                    update_search_people,
+                    update_search_anime,
+                    update_search_manga,
+                    update_search_novel,
+                    update_search_users,
+                ]
+            ]
+        )
@@ -1,18 +1,19 @@
 from meilisearch_python_sdk.models.settings import MeilisearchSettings
-from app.utils import get_settings, to_timestamp
+from .utils import populate_index, update_settings
+from app.utils import to_timestamp
 from sqlalchemy.ext.asyncio import AsyncSession
 from meilisearch_python_sdk import AsyncClient
-from app.utils import get_season, pagination
+from app.utils import get_season
 from app.models import Anime, CompanyAnime
 from sqlalchemy.orm import selectinload
 from app.database import sessionmanager
-from sqlalchemy import select, func
+from sqlalchemy import select
 from app import constants
-import math
 
 
 async def update_anime_settings(index):
-    await index.update_settings(
+    await update_settings(
+        index,
         MeilisearchSettings(
             filterable_attributes=[
                 "episodes_released",
@@ -78,7 +79,7 @@ async def update_anime_settings(index):
                 "sort",
                 "exactness",
             ],
-        )
+        ),
     )
 
 
@@ -124,8 +125,8 @@ def anime_to_document(anime: Anime):
     }
 
 
-async def anime_documents(session: AsyncSession, limit: int, offset: int):
-    anime_list = await session.scalars(
+def anime_documents_query():
+    return (
         select(Anime)
         .filter(Anime.deleted == False)  # noqa: E712
         .filter(Anime.needs_search_update == True)  # noqa: E712
@@ -133,83 +134,35 @@ async def anime_documents(session: AsyncSession, limit: int, offset: int):
             selectinload(Anime.companies).selectinload(CompanyAnime.company),
             selectinload(Anime.genres),
         )
-        .order_by("content_id")
-        .limit(limit)
-        .offset(offset)
     )
 
-    documents = []
-
-    for anime in anime_list:
-        documents.append(anime_to_document(anime))
-
-        # I'm not sure if this would behave correctly if Meilisearch is down
-        anime.needs_search_update = False
-        session.add(anime)
-
-    return documents
-
-
-async def anime_document_ids_delete(session: AsyncSession):
-    anime_list = await session.scalars(
-        select(Anime)
-        .filter(Anime.deleted == True)  # noqa: E712
-        .filter(Anime.needs_search_update == True)  # noqa: E712
-    )
-
-    delete_ids = []
-
-    for anime in anime_list:
-        delete_ids.append(anime.content_id)
-        anime.needs_search_update = False
-        session.add(anime)
 
-    return delete_ids
-
-
-async def anime_documents_total(session: AsyncSession):
-    return await session.scalar(
-        select(func.count(Anime.id)).filter(
-            Anime.needs_search_update == True  # noqa: E712
-        )
+def anime_document_ids_delete_query():
+    return select(Anime.id, Anime.content_id).filter(
+        Anime.deleted == True,  # noqa: E712
+        Anime.needs_search_update == True,  # noqa: E712
     )
 
 
-async def meilisearch_populate(session: AsyncSession):
+async def meilisearch_populate(session: AsyncSession, client: AsyncClient):
     # print("Meilisearch: Populating anime")
 
-    settings = get_settings()
-
-    async with AsyncClient(**settings.meilisearch) as client:
-        index = client.index(constants.SEARCH_INDEX_ANIME)
-
-        await update_anime_settings(index)
-
-        size = 1000
-        total = await anime_documents_total(session)
-        pages = math.ceil(total / size)
+    index = client.index(constants.SEARCH_INDEX_ANIME)
 
-        for page in range(1, pages + 1):
-            # print(f"Meilisearch: Processing anime page {page} of {pages}")
+    await update_anime_settings(index)
 
-            limit, offset = pagination(page, size)
-            documents = await anime_documents(session, limit, offset)
-
-            if len(documents) > 0:
-                await index.add_documents(documents)
-
-        delete_document_ids = await anime_document_ids_delete(session)
-
-        if len(delete_document_ids) > 0:
-            await index.delete_documents(delete_document_ids)
-            print(
-                f"Meilisearch: deleted {len(delete_document_ids)} animes from search"
-            )
-
-        # Let's just hope if Meilisearch is down this fails ;)
-        await session.commit()
+    await populate_index(
+        session,
+        client,
+        index,
+        Anime,
+        anime_documents_query(),
+        Anime.content_id,
+        anime_to_document,
+        delete_query=anime_document_ids_delete_query(),
+    )
 
 
-async def update_search_anime():
+async def update_search_anime(client: AsyncClient):
     async with sessionmanager.session() as session:
-        await meilisearch_populate(session)
+        await meilisearch_populate(session, client)
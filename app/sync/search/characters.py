@@ -1,17 +1,16 @@
 from meilisearch_python_sdk.models.settings import MeilisearchSettings
+from .utils import populate_index, update_settings
 from sqlalchemy.ext.asyncio import AsyncSession
 from meilisearch_python_sdk import AsyncClient
 from app.database import sessionmanager
-from app.utils import get_settings
-from sqlalchemy import select, func
+from sqlalchemy import select
 from app.models import Character
-from app.utils import pagination
 from app import constants
-import math
 
 
 async def update_characters_settings(index):
-    await index.update_settings(
+    await update_settings(
+        index,
         MeilisearchSettings(
             filterable_attributes=["favorites"],
             searchable_attributes=[
@@ -31,7 +30,7 @@ async def update_characters_settings(index):
             ],
             sortable_attributes=["favorites"],
             distinct_attribute="slug",
-        )
+        ),
     )
 
 
@@ -49,58 +48,30 @@ def character_to_document(character: Character):
     }
 
 
-async def characters_documents(session: AsyncSession, limit: int, offset: int):
-    characters_list = await session.scalars(
-        select(Character)
-        .filter(Character.needs_search_update == True)  # noqa: E712
-        .order_by("content_id")
-        .limit(limit)
-        .offset(offset)
+def characters_documents_query():
+    return (
+        select(Character).filter(Character.needs_search_update == True)  # noqa: E712
     )
 
-    documents = []
 
-    for character in characters_list:
-        documents.append(character_to_document(character))
-        character.needs_search_update = False
-        session.add(character)
-
-    return documents
-
-
-async def characters_documents_total(session: AsyncSession):
-    return await session.scalar(
-        select(func.count(Character.id)).filter(
-            Character.needs_search_update == True  # noqa: E712
-        )
-    )
-
-
-async def meilisearch_populate(session: AsyncSession):
+async def meilisearch_populate(session: AsyncSession, client: AsyncClient):
     # print("Meilisearch: Populating characters")
 
-    settings = get_settings()
+    index = client.index(constants.SEARCH_INDEX_CHARACTERS)
 
-    async with AsyncClient(**settings.meilisearch) as client:
-        index = client.index(constants.SEARCH_INDEX_CHARACTERS)
+    await update_characters_settings(index)
 
-        await update_characters_settings(index)
-
-        size = 1000
-        total = await characters_documents_total(session)
-        pages = math.ceil(total / size)
-
-        for page in range(1, pages + 1):
-            # print(f"Meilisearch: Processing characters page {page} of {pages}")
-
-            limit, offset = pagination(page, size)
-            documents = await characters_documents(session, limit, offset)
-
-            await index.add_documents(documents)
-
-            await session.commit()
+    await populate_index(
+        session,
+        client,
+        index,
+        Character,
+        characters_documents_query(),
+        Character.content_id,
+        character_to_document,
+    )
 
 
-async def update_search_characters():
+async def update_search_characters(client: AsyncClient):
     async with sessionmanager.session() as session:
-        await meilisearch_populate(session)
+        await meilisearch_populate(session, client)
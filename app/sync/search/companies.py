@@ -1,18 +1,17 @@
 from meilisearch_python_sdk.models.settings import MeilisearchSettings
+from .utils import populate_index, update_settings
 from sqlalchemy.ext.asyncio import AsyncSession
 from meilisearch_python_sdk import AsyncClient
 from sqlalchemy.orm import with_expression
-from sqlalchemy import select, case, func
+from sqlalchemy import select, case
 from app.database import sessionmanager
-from app.utils import get_settings
-from app.utils import pagination
 from app.models import Company
 from app import constants
-import math
 
 
 async def update_companies_settings(index):
-    await index.update_settings(
+    await update_settings(
+        index,
         MeilisearchSettings(
             filterable_attributes=["favorites", "is_studio", "is_producer"],
             searchable_attributes=["name"],
@@ -23,7 +22,7 @@ async def update_companies_settings(index):
             ],
             sortable_attributes=["favorites"],
             distinct_attribute="slug",
-        )
+        ),
     )
 
 
@@ -39,8 +38,8 @@ def company_to_document(company: Company):
     }
 
 
-async def companies_documents(session: AsyncSession, limit: int, offset: int):
-    companies_list = await session.scalars(
+def companies_documents_query():
+    return (
         select(Company)
         .filter(Company.needs_search_update == True)  # noqa: E712
         .options(
@@ -55,54 +54,27 @@ async def companies_documents(session: AsyncSession, limit: int, offset: int):
                 case((Company.produced_anime.any(), True), else_=False),
             )
         )
-        .order_by("content_id")
-        .limit(limit)
-        .offset(offset)
-    )
-
-    documents = []
-
-    for company in companies_list:
-        documents.append(company_to_document(company))
-        company.needs_search_update = False
-        session.add(company)
-
-    return documents
-
-
-async def companies_documents_total(session: AsyncSession):
-    return await session.scalar(
-        select(func.count(Company.id)).filter(
-            Company.needs_search_update == True  # noqa: E712
-        )
     )
 
 
-async def meilisearch_populate(session: AsyncSession):
+async def meilisearch_populate(session: AsyncSession, client: AsyncClient):
     # print("Meilisearch: Populating companies")
 
-    settings = get_settings()
-
-    async with AsyncClient(**settings.meilisearch) as client:
-        index = client.index(constants.SEARCH_INDEX_COMPANIES)
-
-        await update_companies_settings(index)
-
-        size = 1000
-        total = await companies_documents_total(session)
-        pages = math.ceil(total / size)
+    index = client.index(constants.SEARCH_INDEX_COMPANIES)
 
-        for page in range(1, pages + 1):
-            # print(f"Meilisearch: Processing companies page {page} of {pages}")
+    await update_companies_settings(index)
 
-            limit, offset = pagination(page, size)
-            documents = await companies_documents(session, limit, offset)
-
-            await index.add_documents(documents)
-
-            await session.commit()
+    await populate_index(
+        session,
+        client,
+        index,
+        Company,
+        companies_documents_query(),
+        Company.content_id,
+        company_to_document,
+    )
 
 
-async def update_search_companies():
+async def update_search_companies(client: AsyncClient):
     async with sessionmanager.session() as session:
-        await meilisearch_populate(session)
+        await meilisearch_populate(session, client)
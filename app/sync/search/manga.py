@@ -1,18 +1,18 @@
 from meilisearch_python_sdk.models.settings import MeilisearchSettings
-from app.utils import get_settings, to_timestamp
+from .utils import populate_index, update_settings
+from app.utils import to_timestamp
 from sqlalchemy.ext.asyncio import AsyncSession
 from meilisearch_python_sdk import AsyncClient
 from app.database import sessionmanager
 from sqlalchemy.orm import joinedload
-from sqlalchemy import select, func
-from app.utils import pagination
+from sqlalchemy import select
 from app.models import Manga
 from app import constants
-import math
 
 
 async def update_manga_settings(index):
-    await index.update_settings(
+    await update_settings(
+        index,
         MeilisearchSettings(
             filterable_attributes=[
                 "translated_ua",
@@ -55,7 +55,7 @@ async def update_manga_settings(index):
                 "sort",
                 "exactness",
             ],
-        )
+        ),
     )
 
 
@@ -89,8 +89,8 @@ def manga_to_document(manga: Manga):
     }
 
 
-async def manga_documents(session: AsyncSession, limit: int, offset: int):
-    manga_list = await session.scalars(
+def manga_documents_query():
+    return (
         select(Manga)
         .filter(Manga.media_type != None)  # noqa: E711
         .filter(Manga.deleted == False)  # noqa: E712
@@ -99,83 +99,35 @@ async def manga_documents(session: AsyncSession, limit: int, offset: int):
             joinedload(Manga.magazines),
             joinedload(Manga.genres),
         )
-        .order_by("content_id")
-        .limit(limit)
-        .offset(offset)
     )
 
-    documents = []
-
-    for manga in manga_list.unique().all():
-        documents.append(manga_to_document(manga))
-
-        # I'm not sure if this would behave correctly if Meilisearch is down
-        manga.needs_search_update = False
-        session.add(manga)
-
-    return documents
-
-
-async def manga_document_ids_delete(session: AsyncSession):
-    manga_list = await session.scalars(
-        select(Manga)
-        .filter(Manga.deleted == True)  # noqa: E712
-        .filter(Manga.needs_search_update == True)  # noqa: E712
-    )
-
-    delete_ids = []
-
-    for manga in manga_list.unique().all():
-        delete_ids.append(manga.content_id)
-        manga.needs_search_update = False
-        session.add(manga)
 
-    return delete_ids
-
-
-async def manga_documents_total(session: AsyncSession):
-    return await session.scalar(
-        select(func.count(Manga.id)).filter(
-            Manga.needs_search_update == True  # noqa: E712
-        )
+def manga_document_ids_delete_query():
+    return select(Manga.id, Manga.content_id).filter(
+        Manga.deleted == True,  # noqa: E712
+        Manga.needs_search_update == True,  # noqa: E712
     )
 
 
-async def meilisearch_populate(session: AsyncSession):
+async def meilisearch_populate(session: AsyncSession, client: AsyncClient):
     # print("Meilisearch: Populating manga")
 
-    settings = get_settings()
-
-    async with AsyncClient(**settings.meilisearch) as client:
-        index = client.index(constants.SEARCH_INDEX_MANGA)
-
-        await update_manga_settings(index)
-
-        size = 1000
-        total = await manga_documents_total(session)
-        pages = math.ceil(total / size)
+    index = client.index(constants.SEARCH_INDEX_MANGA)
 
-        for page in range(1, pages + 1):
-            # print(f"Meilisearch: Processing manga page {page} of {pages}")
+    await update_manga_settings(index)
 
-            limit, offset = pagination(page, size)
-            documents = await manga_documents(session, limit, offset)
-
-            if len(documents) > 0:
-                await index.add_documents(documents)
-
-        delete_document_ids = await manga_document_ids_delete(session)
-
-        if len(delete_document_ids) > 0:
-            await index.delete_documents(delete_document_ids)
-            # print(
-            #     f"Meilisearch: deleted {len(delete_document_ids)} manga from search"
-            # )
-
-        # Let's just hope if Meilisearch is down this fails ;)
-        await session.commit()
+    await populate_index(
+        session,
+        client,
+        index,
+        Manga,
+        manga_documents_query(),
+        Manga.content_id,
+        manga_to_document,
+        delete_query=manga_document_ids_delete_query(),
+    )
 
 
-async def update_search_manga():
+async def update_search_manga(client: AsyncClient):
     async with sessionmanager.session() as session:
-        await meilisearch_populate(session)
+        await meilisearch_populate(session, client)
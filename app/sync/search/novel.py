@@ -1,18 +1,18 @@
 from meilisearch_python_sdk.models.settings import MeilisearchSettings
-from app.utils import get_settings, to_timestamp
+from .utils import populate_index, update_settings
+from app.utils import to_timestamp
 from sqlalchemy.ext.asyncio import AsyncSession
 from meilisearch_python_sdk import AsyncClient
 from app.database import sessionmanager
 from sqlalchemy.orm import joinedload
-from sqlalchemy import select, func
-from app.utils import pagination
+from sqlalchemy import select
 from app.models import Novel
 from app import constants
-import math
 
 
 async def update_novel_settings(index):
-    await index.update_settings(
+    await update_settings(
+        index,
         MeilisearchSettings(
             filterable_attributes=[
                 "translated_ua",
@@ -55,7 +55,7 @@ async def update_novel_settings(index):
                 "sort",
                 "exactness",
             ],
-        )
+        ),
     )
 
 
@@ -89,8 +89,8 @@ def novel_to_document(novel: Novel):
     }
 
 
-async def novel_documents(session: AsyncSession, limit: int, offset: int):
-    novel_list = await session.scalars(
+def novel_documents_query():
+    return (
         select(Novel)
         .filter(Novel.media_type != None)  # noqa: E711
         .filter(Novel.deleted == False)  # noqa: E712
@@ -99,83 +99,35 @@ async def novel_documents(session: AsyncSession, limit: int, offset: int):
             joinedload(Novel.magazines),
             joinedload(Novel.genres),
         )
-        .order_by("content_id")
-        .limit(limit)
-        .offset(offset)
     )
 
-    documents = []
-
-    for novel in novel_list.unique().all():
-        documents.append(novel_to_document(novel))
-
-        # I'm not sure if this would behave correctly if Meilisearch is down
-        novel.needs_search_update = False
-        session.add(novel)
-
-    return documents
-
-
-async def novel_document_ids_delete(session: AsyncSession):
-    novel_list = await session.scalars(
-        select(Novel)
-        .filter(Novel.deleted == True)  # noqa: E712
-        .filter(Novel.needs_search_update == True)  # noqa: E712
-    )
-
-    delete_ids = []
-
-    for novel in novel_list.unique().all():
-        delete_ids.append(novel.content_id)
-        novel.needs_search_update = False
-        session.add(novel)
 
-    return delete_ids
-
-
-async def novel_documents_total(session: AsyncSession):
-    return await session.scalar(
-        select(func.count(Novel.id)).filter(
-            Novel.needs_search_update == True  # noqa: E712
-        )
+def novel_document_ids_delete_query():
+    return select(Novel.id, Novel.content_id).filter(
+        Novel.deleted == True,  # noqa: E712
+        Novel.needs_search_update == True,  # noqa: E712
     )
 
 
-async def meilisearch_populate(session: AsyncSession):
+async def meilisearch_populate(session: AsyncSession, client: AsyncClient):
     # print("Meilisearch: Populating novel")
 
-    settings = get_settings()
-
-    async with AsyncClient(**settings.meilisearch) as client:
-        index = client.index(constants.SEARCH_INDEX_NOVEL)
-
-        await update_novel_settings(index)
-
-        size = 1000
-        total = await novel_documents_total(session)
-        pages = math.ceil(total / size)
+    index = client.index(constants.SEARCH_INDEX_NOVEL)
 
-        for page in range(1, pages + 1):
-            # print(f"Meilisearch: Processing novel page {page} of {pages}")
+    await update_novel_settings(index)
 
-            limit, offset = pagination(page, size)
-            documents = await novel_documents(session, limit, offset)
-
-            if len(documents) > 0:
-                await index.add_documents(documents)
-
-        delete_document_ids = await novel_document_ids_delete(session)
-
-        if len(delete_document_ids) > 0:
-            await index.delete_documents(delete_document_ids)
-            # print(
-            #     f"Meilisearch: deleted {len(delete_document_ids)} novel from search"
-            # )
-
-        # Let's just hope if Meilisearch is down this fails ;)
-        await session.commit()
+    await populate_index(
+        session,
+        client,
+        index,
+        Novel,
+        novel_documents_query(),
+        Novel.content_id,
+        novel_to_document,
+        delete_query=novel_document_ids_delete_query(),
+    )
 
 
-async def update_search_novel():
+async def update_search_novel(client: AsyncClient):
     async with sessionmanager.session() as session:
-        await meilisearch_populate(session)
+        await meilisearch_populate(session, client)
@@ -1,17 +1,16 @@
 from meilisearch_python_sdk.models.settings import MeilisearchSettings
+from .utils import populate_index, update_settings
 from sqlalchemy.ext.asyncio import AsyncSession
 from meilisearch_python_sdk import AsyncClient
 from app.database import sessionmanager
-from app.utils import get_settings
-from sqlalchemy import select, func
-from app.utils import pagination
+from sqlalchemy import select
 from app.models import Person
 from app import constants
-import math
 
 
 async def update_people_settings(index):
-    await index.update_settings(
+    await update_settings(
+        index,
         MeilisearchSettings(
             filterable_attributes=["favorites"],
             searchable_attributes=[
@@ -32,7 +31,7 @@ async def update_people_settings(index):
             ],
             sortable_attributes=["favorites"],
             distinct_attribute="slug",
-        )
+        ),
     )
 
 
@@ -51,58 +50,30 @@ def person_to_document(person: Person):
     }
 
 
-async def people_documents(session: AsyncSession, limit: int, offset: int):
-    people_list = await session.scalars(
-        select(Person)
-        .filter(Person.needs_search_update == True)  # noqa: E712
-        .order_by("content_id")
-        .limit(limit)
-        .offset(offset)
+def people_documents_query():
+    return (
+        select(Person).filter(Person.needs_search_update == True)  # noqa: E712
     )
 
-    documents = []
 
-    for person in people_list:
-        documents.append(person_to_document(person))
-        person.needs_search_update = False
-        session.add(person)
-
-    return documents
-
-
-async def people_documents_total(session: AsyncSession):
-    return await session.scalar(
-        select(func.count(Person.id)).filter(
-            Person.needs_search_update == True  # noqa: E712
-        )
-    )
-
-
-async def meilisearch_populate(session: AsyncSession):
+async def meilisearch_populate(session: AsyncSession, client: AsyncClient):
     # print("Meilisearch: Populating people")
 
-    settings = get_settings()
+    index = client.index(constants.SEARCH_INDEX_PEOPLE)
 
-    async with AsyncClient(**settings.meilisearch) as client:
-        index = client.index(constants.SEARCH_INDEX_PEOPLE)
+    await update_people_settings(index)
 
-        await update_people_settings(index)
-
-        size = 1000
-        total = await people_documents_total(session)
-        pages = math.ceil(total / size)
-
-        for page in range(1, pages + 1):
-            # print(f"Meilisearch: Processing people page {page} of {pages}")
-
-            limit, offset = pagination(page, size)
-            documents = await people_documents(session, limit, offset)
-
-            await index.add_documents(documents)
-
-            await session.commit()
+    await populate_index(
+        session,
+        client,
+        index,
+        Person,
+        people_documents_query(),
+        Person.content_id,
+        person_to_document,
+    )
 
 
-async def update_search_people():
+async def update_search_people(client: AsyncClient):
     async with sessionmanager.session() as session:
-        await meilisearch_populate(session)
+        await meilisearch_populate(session, client)
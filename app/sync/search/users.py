@@ -1,24 +1,24 @@
 from meilisearch_python_sdk.models.settings import MeilisearchSettings
-from app.utils import get_settings, to_timestamp
+from .utils import populate_index, update_settings
+from app.utils import to_timestamp
 from sqlalchemy.ext.asyncio import AsyncSession
 from meilisearch_python_sdk import AsyncClient
-from sqlalchemy import select, asc, func
+from sqlalchemy import select
 from app.database import sessionmanager
-from app.utils import pagination
 from app.models import User
 from app import constants
-import math
 
 
 async def update_user_settings(index):
-    await index.update_settings(
+    await update_settings(
+        index,
         MeilisearchSettings(
             searchable_attributes=["username"],
             filterable_attributes=["created"],
             displayed_attributes=["username"],
             sortable_attributes=["created"],
             distinct_attribute="username",
-        )
+        ),
     )
 
 
@@ -30,61 +30,30 @@ def user_to_document(user: User):
     }
 
 
-async def user_documents(session: AsyncSession, limit: int, offset: int):
-    users_list = await session.scalars(
-        select(User)
-        .filter(User.needs_search_update == True)  # noqa: E712
-        .order_by(asc(User.created))
-        .limit(limit)
-        .offset(offset)
+def user_documents_query():
+    return (
+        select(User).filter(User.needs_search_update == True)  # noqa: E712
     )
 
-    documents = []
 
-    for user in users_list:
-        documents.append(user_to_document(user))
+async def meilisearch_populate(session: AsyncSession, client: AsyncClient):
+    # print("Meilisearch: Populating user")
 
-        # I'm not sure if this would behave correctly if Meilisearch is down
-        user.needs_search_update = False
-        session.add(user)
+    index = client.index(constants.SEARCH_INDEX_USERS)
 
-    return documents
+    await update_user_settings(index)
 
-
-async def user_documents_total(session: AsyncSession):
-    return await session.scalar(
-        select(func.count(User.id)).filter(
-            User.needs_search_update == True,  # noqa: E712
-        )
+    await populate_index(
+        session,
+        client,
+        index,
+        User,
+        user_documents_query(),
+        User.id,
+        user_to_document,
     )
 
 
-async def meilisearch_populate(session: AsyncSession):
-    # print("Meilisearch: Populating users")
-
-    settings = get_settings()
-
-    async with AsyncClient(**settings.meilisearch) as client:
-        index = client.index(constants.SEARCH_INDEX_USERS)
-
-        await update_user_settings(index)
-
-        size = 1000
-        total = await user_documents_total(session)
-        pages = math.ceil(total / size)
-
-        for page in range(1, pages + 1):
-            # print(f"Meilisearch: Processing users page {page} of {pages}")
-
-            limit, offset = pagination(page, size)
-            documents = await user_documents(session, limit, offset)
-
-            await index.add_documents(documents)
-
-            # Let's just hope if Meilisearch is down this fails ;)
-            await session.commit()
-
-
-async def update_search_users():
+async def update_search_users(client: AsyncClient):
     async with sessionmanager.session() as session:
-        await meilisearch_populate(session)
+        await meilisearch_populate(session, client)
@@ -0,0 +1,188 @@
+from meilisearch_python_sdk.models.settings import MeilisearchSettings
+from meilisearch_python_sdk.errors import MeilisearchApiError
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.selectable import Select
+from sqlalchemy import update, bindparam, any_
+from sqlalchemy.types import Uuid
+from uuid import UUID
+import hashlib
+import asyncio
+import json
+
+
+SEARCH_BATCH_SIZE = 1000
+
+# Meilisearch treats these as sets and reports them in its own order
+UNORDERED_SETTINGS = [
+    "filterable_attributes",
+    "displayed_attributes",
+    "sortable_attributes",
+]
+
+
+def settings_hash(settings: MeilisearchSettings, fields: set[str]) -> str:
+    data = settings.model_dump(include=fields)
+
+    for field in UNORDERED_SETTINGS:
+        if isinstance(data.get(field), list):
+            data[field] = sorted(data[field])
+
+    return hashlib.sha256(
+        json.dumps(data, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+async def update_settings(index, settings: MeilisearchSettings):
+    """Push index settings only if they differ from what index reports"""
+
+    fields = settings.model_fields_set
+
+    try:
+        current = await index.get_settings()
+
+        if settings_hash(current, fields) == settings_hash(settings, fields):
+            return
+
+    # Index does not exist yet
+    except MeilisearchApiError:
+        pass
+
+    await index.update_settings(settings)
+
+
+async def stream_documents(
+    session: AsyncSession,
+    query: Select,
+    key,
+    to_document,
+    size: int = SEARCH_BATCH_SIZE,
+):
+    """Yield (ids, documents) batches using keyset pagination over key"""
+
+    last_key = None
+
+    while True:
+        batch_query = query
+
+        # Keyset cursor instead of offset, so each batch starts where
+        # previous one has ended and does not rescan the table
+        if last_key is not None:
+            batch_query = batch_query.filter(key > last_key)
+
+        rows = await session.scalars(batch_query.order_by(key).limit(size))
+        rows = rows.unique().all()
+
+        if len(rows) == 0:
+            break
+
+        last_key = getattr(rows[-1], key.key)
+
+        yield [row.id for row in rows], [to_document(row) for row in rows]
+
+        if len(rows) < size:
+            break
+
+
+async def wait_for_task(client, task_info) -> bool:
+    """Wait for Meilisearch task and report whether it has succeeded"""
+
+    result = await client.wait_for_task(task_info.task_uid, timeout_in_ms=None)
+
+    if result.status != "succeeded":
+        print(
+            f"Meilisearch: task {result.uid} {result.status} ({result.error})"
+        )
+        return False
+
+    return True
+
+
+async def upload_documents(
+    client, index, ids: list[UUID], documents: list[dict]
+) -> list[UUID]:
+    """Upload documents and return ids of the ones indexed successfully"""
+
+    task_info = await index.add_documents(documents)
+    return ids if await wait_for_task(client, task_info) else []
+
+
+async def add_documents(client, index, documents_stream) -> list[UUID]:
+    """Upload document batches while next batch is being read"""
+
+    uploaded_ids = []
+    upload = None
+
+    async for ids, documents in documents_stream:
+        if upload is not None:
+            uploaded_ids.extend(await upload)
+
+        upload = asyncio.create_task(
+            upload_documents(client, index, ids, documents)
+        )
+
+    if upload is not None:
+        uploaded_ids.extend(await upload)
+
+    return uploaded_ids
+
+
+async def delete_documents(
+    session: AsyncSession, client, index, query: Select
+) -> list[UUID]:
+    """Remove documents selected by (id, content_id) query from index"""
+
+    rows = (await session.execute(query)).all()
+
+    if len(rows) == 0:
+        return []
+
+    task_info = await index.delete_documents(
+        [content_id for _, content_id in rows]
+    )
+
+    if not await wait_for_task(client, task_info):
+        return []
+
+    return [row_id for row_id, _ in rows]
+
+
+async def clear_search_update(session: AsyncSession, model, ids: list[UUID]):
+    """Reset needs_search_update for indexed rows in one statement"""
+
+    if len(ids) == 0:
+        return
+
+    # Single array parameter instead of IN list, since number of ids
+    # may easily exceed bind parameters limit after aggregator run
+    await session.execute(
+        update(model)
+        .filter(
+            model.id == any_(bindparam("search_ids", ids, type_=ARRAY(Uuid)))
+        )
+        .values(needs_search_update=False)
+        .execution_options(synchronize_session=False)
+    )
+
+    await session.commit()
+
+
+async def populate_index(
+    session: AsyncSession,
+    client,
+    index,
+    model,
+    query: Select,
+    key,
+    to_document,
+    delete_query: Select | None = None,
+):
+    """Sync rows that need search update with Meilisearch index"""
+
+    documents_stream = stream_documents(session, query, key, to_document)
+    ids = await add_documents(client, index, documents_stream)
+
+    if delete_query is not None:
+        ids += await delete_documents(session, client, index, delete_query)
+
+    await clear_search_update(session, model, ids)
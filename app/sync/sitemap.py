@@ -1,55 +1,208 @@
-from app.models import Anime, Manga, Novel
+from app.models import SystemTimestamp, Anime, Manga, Novel
+from sqlalchemy import select, desc, func, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from collections.abc import AsyncIterator
 from app.database import sessionmanager
 from app.utils import get_settings
 from app.utils import to_timestamp
-from sqlalchemy import desc, func
-from sqlalchemy import select
 from app import constants
+import gzip
 import json
-import math
+import os
 
 
-async def generate_sitemap(session, content_type):
-    model = {
-        constants.CONTENT_ANIME: Anime,
-        constants.CONTENT_MANGA: Manga,
-        constants.CONTENT_NOVEL: Novel,
-    }.get(content_type)
+SITEMAP_MODELS = {
+    constants.CONTENT_ANIME: Anime,
+    constants.CONTENT_MANGA: Manga,
+    constants.CONTENT_NOVEL: Novel,
+}
 
-    result = []
+# Rows read from database per round trip
+SITEMAP_BATCH_SIZE = 10000
 
-    limit = 10000
-    total = await session.scalar(
-        select(func.count(model.id)).filter(
-            model.deleted == False,  # noqa: E712
-        )
-    )
-    pages = math.ceil(total / limit) + 1
 
-    for page in range(1, pages):
-        offset = (limit * (page)) - limit
+class SitemapWriter:
+    """Stream JSON list into file and its gzipped sibling
+
+    Everything is written to temporary files first which then replace
+    old ones, so readers never see partially written sitemap.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.count = 0
+
+        self.file = open(f"{path}.tmp", "w")
+        self.gzip_file = gzip.open(f"{path}.gz.tmp", "wt")
+        self.write_raw("[")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.finish()
+
+        else:
+            self.abort()
+
+    def write_raw(self, text: str):
+        self.file.write(text)
+        self.gzip_file.write(text)
+
+    def write(self, entry: dict):
+        self.write_raw(("," if self.count > 0 else "") + json.dumps(entry))
+        self.count += 1
+
+    def finish(self):
+        self.write_raw("]")
+        self.file.close()
+        self.gzip_file.close()
+
+        os.replace(f"{self.path}.tmp", self.path)
+        os.replace(f"{self.path}.gz.tmp", f"{self.path}.gz")
+
+    def abort(self):
+        self.file.close()
+        self.gzip_file.close()
+
+        os.remove(f"{self.path}.tmp")
+        os.remove(f"{self.path}.gz.tmp")
 
-        data = await session.execute(
-            select(model.slug, model.updated)
+
+async def iterate_sitemap(
+    session: AsyncSession,
+    content_type: str,
+    size: int = SITEMAP_BATCH_SIZE,
+) -> AsyncIterator[dict]:
+    model = SITEMAP_MODELS[content_type]
+    order = (model.score, model.scored_by, model.id)
+    cursor = None
+
+    while True:
+        query = (
+            select(*order, model.slug, model.updated)
             .filter(model.deleted == False)  # noqa: E712
-            .order_by(
-                desc(model.score),
-                desc(model.scored_by),
-                desc(model.id),
-            )
-            .limit(limit)
-            .offset(offset)
+            .order_by(*[desc(column) for column in order])
+            .limit(size)
         )
 
-        for entry in data:
-            result.append(
-                {
-                    "updated_at": to_timestamp(entry[1]),
-                    "slug": entry[0],
-                }
-            )
+        # Keyset pagination, continue right after last row of previous page
+        if cursor is not None:
+            query = query.filter(tuple_(*order) < tuple_(*cursor))
+
+        rows = (await session.execute(query)).all()
+
+        for row in rows:
+            yield {
+                "updated_at": to_timestamp(row.updated),
+                "slug": row.slug,
+            }
+
+        if len(rows) < size:
+            break
+
+        cursor = (rows[-1].score, rows[-1].scored_by, rows[-1].id)
+
+
+async def generate_sitemap(session: AsyncSession, content_type: str):
+    return [entry async for entry in iterate_sitemap(session, content_type)]
+
+
+async def write_sitemap(
+    session: AsyncSession,
+    content_type: str,
+    directory: str,
+    shard_size: int | None = None,
+):
+    name = f"sitemap_{content_type}"
 
-    return result
+    if not shard_size:
+        with SitemapWriter(f"{directory}/{name}.json") as writer:
+            async for entry in iterate_sitemap(session, content_type):
+                writer.write(entry)
+
+        return
+
+    shards = []
+    writer = None
+
+    try:
+        async for entry in iterate_sitemap(session, content_type):
+            if writer is None or writer.count >= shard_size:
+                if writer is not None:
+                    writer.finish()
+
+                shard = f"{name}_{len(shards) + 1}.json"
+                writer = SitemapWriter(f"{directory}/{shard}")
+                shards.append(shard)
+
+            writer.write(entry)
+
+    except BaseException:
+        if writer is not None:
+            writer.abort()
+
+        raise
+
+    if writer is not None:
+        writer.finish()
+
+    # Index is replaced last, so it never points to missing shard
+    with SitemapWriter(f"{directory}/{name}_index.json") as index:
+        for shard in shards:
+            index.write({"file": shard})
+
+    # Remove leftover shards if sitemap got shorter
+    number = len(shards) + 1
+
+    while os.path.exists(path := f"{directory}/{name}_{number}.json"):
+        os.remove(path)
+
+        if os.path.exists(f"{path}.gz"):
+            os.remove(f"{path}.gz")
+
+        number += 1
+
+
+async def update_content_sitemap(
+    session: AsyncSession,
+    content_type: str,
+    directory: str,
+    shard_size: int | None = None,
+):
+    model = SITEMAP_MODELS[content_type]
+    name = f"sitemap_{content_type}"
+
+    if not (
+        system_timestamp := await session.scalar(
+            select(SystemTimestamp).filter(SystemTimestamp.name == name)
+        )
+    ):
+        system_timestamp = SystemTimestamp(name=name)
+
+    latest = await session.scalar(select(func.max(model.updated)))
+
+    output = f"{name}_index.json" if shard_size else f"{name}.json"
+
+    # Nothing has changed since sitemap was written last time
+    if (
+        system_timestamp.timestamp is not None
+        and latest is not None
+        and system_timestamp.timestamp >= latest
+        and os.path.exists(f"{directory}/{output}")
+    ):
+        return
+
+    await write_sitemap(session, content_type, directory, shard_size)
+
+    # Nothing to remember for empty table
+    if latest is None:
+        return
+
+    system_timestamp.timestamp = latest
+    session.add(system_timestamp)
+    await session.commit()
 
 
 async def update_sitemap():
@@ -57,21 +210,11 @@ async def update_sitemap():
 
     settings = get_settings()
 
+    directory = settings.backend.sitemap_path
+    shard_size = settings.backend.get("sitemap_shard_size")
+
     async with sessionmanager.session() as session:
-        with open(
-            f"{settings.backend.sitemap_path}/sitemap_anime.json", "w"
-        ) as file:
-            result = await generate_sitemap(session, constants.CONTENT_ANIME)
-            file.write(json.dumps(result))
-
-        with open(
-            f"{settings.backend.sitemap_path}/sitemap_manga.json", "w"
-        ) as file:
-            result = await generate_sitemap(session, constants.CONTENT_MANGA)
-            file.write(json.dumps(result))
-
-        with open(
-            f"{settings.backend.sitemap_path}/sitemap_novel.json", "w"
-        ) as file:
-            result = await generate_sitemap(session, constants.CONTENT_NOVEL)
-            file.write(json.dumps(result))
+        for content_type in SITEMAP_MODELS:
+            await update_content_sitemap(
+                session, content_type, directory, shard_size
+            )
@@ -0,0 +1,105 @@
+from app.read.service import read_stats_object, read_stats_field
+from app.watch.service import watch_stats_object
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, and_
+from app.database import sessionmanager
+from datetime import datetime, timedelta
+from app.utils import utcnow
+from app import constants
+
+from app.models import (
+    SystemTimestamp,
+    AnimeWatch,
+    User,
+    Read,
+)
+
+
+# Users updated shortly before previous run are checked again, since
+# their list may have been changed while previous run was in progress
+STATS_OVERLAP = timedelta(minutes=5)
+
+
+async def reconcile_watch_stats(session: AsyncSession, since: datetime):
+    stats = (
+        select(
+            User.id.label("user_id"),
+            watch_stats_object().label("stats"),
+        )
+        .outerjoin(AnimeWatch, AnimeWatch.user_id == User.id)
+        .filter(User.updated > since)
+        .group_by(User.id)
+        .subquery()
+    )
+
+    await session.execute(
+        update(User)
+        .filter(User.id == stats.c.user_id)
+        .values(anime_stats=stats.c.stats)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def reconcile_read_stats(
+    session: AsyncSession, since: datetime, content_type: str
+):
+    stats = (
+        select(
+            User.id.label("user_id"),
+            read_stats_object().label("stats"),
+        )
+        .outerjoin(
+            Read,
+            and_(
+                Read.user_id == User.id,
+                Read.content_type == content_type,
+                Read.deleted == False,  # noqa: E712
+            ),
+        )
+        .filter(User.updated > since)
+        .group_by(User.id)
+        .subquery()
+    )
+
+    await session.execute(
+        update(User)
+        .filter(User.id == stats.c.user_id)
+        .values({read_stats_field(content_type): stats.c.stats})
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def reconcile_list_stats(session: AsyncSession):
+    """Recalculate list stats of users which updated their lists"""
+
+    # Stats are maintained incrementally on every list update,
+    # here we make sure they haven't drifted from actual lists
+    if not (
+        system_timestamp := await session.scalar(
+            select(SystemTimestamp).filter(SystemTimestamp.name == "list_stats")
+        )
+    ):
+        system_timestamp = SystemTimestamp(
+            **{
+                "timestamp": datetime(2024, 1, 13),
+                "name": "list_stats",
+            }
+        )
+
+    now = utcnow()
+    since = system_timestamp.timestamp - STATS_OVERLAP
+
+    await reconcile_watch_stats(session, since)
+
+    for content_type in [constants.CONTENT_MANGA, constants.CONTENT_NOVEL]:
+        await reconcile_read_stats(session, since, content_type)
+
+    system_timestamp.timestamp = now
+    session.add(system_timestamp)
+
+    await session.commit()
+
+
+async def update_list_stats():
+    async with sessionmanager.session() as session:
+        await reconcile_list_stats(session)
@@ -1,7 +1,34 @@
 from app.database import sessionmanager
+from app.models import SystemTimestamp
+from datetime import datetime
+from sqlalchemy import select
+from app.utils import utcnow
 from app import aggregator
 
 
 async def update_weights():
     async with sessionmanager.session() as session:
-        await aggregator.update_anime_staff_weights(session)
+        if not (
+            system_timestamp := await session.scalar(
+                select(SystemTimestamp).filter(
+                    SystemTimestamp.name == "staff_weights"
+                )
+            )
+        ):
+            system_timestamp = SystemTimestamp(
+                **{
+                    "timestamp": datetime(2024, 1, 13),
+                    "name": "staff_weights",
+                }
+            )
+
+        # Taken before recalculation so nothing updated meanwhile is missed
+        now = utcnow()
+
+        await aggregator.update_anime_staff_weights(
+            session, system_timestamp.timestamp
+        )
+
+        system_timestamp.timestamp = now
+        session.add(system_timestamp)
+        await session.commit()
@@ -1,4 +1,9 @@
 from starlette.middleware.base import BaseHTTPMiddleware
+from sqlalchemy.sql.expression import Executable, ClauseElement
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.selectable import Select
+from sqlalchemy import select, func, desc, tuple_
 from dateutil.relativedelta import relativedelta
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import DeclarativeBase
@@ -14,11 +19,14 @@ from app.models import User
 from app import constants
 from uuid import UUID
 import unicodedata
+import binascii
 import aiohttp
 import asyncio
+import base64
 import secrets
 import bcrypt
 import typing
+import json
 import math
 import re
 
@@ -98,7 +106,7 @@ def check_token_scope(token: AuthToken, scope: list[str]) -> bool:
 
     scope = set(scope)
 
-    if not token.scope and not token.client:
+    if not token.scope and not token.client_id:
         return True
 
     return token_scope.issuperset(scope)
@@ -323,6 +331,192 @@ def paginated_response(
     }
 
 
+class Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, statement: Select):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def compile_explain(element, compiler, **kwargs):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(
+        element.statement, **kwargs
+    )
+
+
+async def estimate_total(session: AsyncSession, query: Select) -> int:
+    """Return planner estimate of rows returned by query"""
+
+    plan = await session.scalar(Explain(query.order_by(None)))
+
+    # Depending on driver plan may be returned as raw json string
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def paginated_items(
+    session: AsyncSession,
+    query: Select,
+    limit: int,
+    offset: int,
+    unique: bool = False,
+    estimate: bool = False,
+) -> tuple[int, list]:
+    """Fetch page items together with total in one round trip
+
+    In estimate mode total is taken from query planner instead of
+    counting all matching rows, which is much cheaper for huge lists.
+    """
+
+    if estimate:
+        result = await session.scalars(query.limit(limit).offset(offset))
+        items = result.unique().all() if unique else result.all()
+
+        # We know exact total on the last page
+        if len(items) < limit and (len(items) > 0 or offset == 0):
+            return offset + len(items), items
+
+        total = await estimate_total(session, query)
+
+        # Planner can't be trusted to count less than we have seen
+        return max(total, offset + len(items)), items
+
+    result = await session.execute(
+        query.add_columns(func.count().over().label("total"))
+        .limit(limit)
+        .offset(offset)
+    )
+
+    rows = result.unique().all() if unique else result.all()
+
+    # Page is past the end of the list so window had nothing to count
+    if len(rows) == 0:
+        if offset == 0:
+            return 0, []
+
+        total = await session.scalar(
+            select(func.count()).select_from(query.order_by(None).subquery())
+        )
+
+        return total, []
+
+    return rows[0].total, [row[0] for row in rows]
+
+
+def encode_cursor(values: list) -> str:
+    """Build opaque cursor from sort key values of the last item"""
+
+    return (
+        base64.urlsafe_b64encode(
+            json.dumps(
+                [
+                    value.isoformat() if isinstance(value, datetime) else value
+                    for value in values
+                ],
+                default=str,
+            ).encode()
+        )
+        .decode()
+        .rstrip("=")
+    )
+
+
+def decode_cursor(cursor: str) -> list | None:
+    """Return raw cursor values or None if cursor is malformed"""
+
+    try:
+        values = json.loads(
+            base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        )
+
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+
+    return values if isinstance(values, list) else None
+
+
+def cursor_values(columns: list, values: list) -> list | None:
+    """Convert raw cursor values to python types of given columns"""
+
+    if len(columns) != len(values):
+        return None
+
+    result = []
+
+    try:
+        for column, value in zip(columns, values):
+            python_type = column.type.python_type
+
+            if python_type is datetime:
+                value = datetime.fromisoformat(value)
+
+            elif python_type is UUID:
+                value = UUID(value)
+
+            elif not isinstance(value, python_type):
+                return None
+
+            result.append(value)
+
+    except (TypeError, ValueError):
+        return None
+
+    return result
+
+
+async def cursor_paginated_items(
+    session: AsyncSession,
+    query: Select,
+    columns: list,
+    cursor: list,
+    limit: int,
+    unique: bool = False,
+) -> tuple[str | None, list] | None:
+    """Fetch page items after cursor using keyset on descending columns
+
+    Last column must be unique (usually id) so items with the same sort
+    values are never skipped or repeated between pages.
+    Returns None if cursor does not match given columns.
+    """
+
+    if len(cursor) > 0:
+        if (values := cursor_values(columns, cursor)) is None:
+            return None
+
+        query = query.filter(tuple_(*columns) < tuple_(*values))
+
+    # One extra row tells us whether there is next page
+    result = await session.scalars(
+        query.order_by(*[desc(column) for column in columns]).limit(limit + 1)
+    )
+
+    items = result.unique().all() if unique else result.all()
+    next_cursor = None
+
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor(
+            [getattr(items[-1], column.key) for column in columns]
+        )
+
+    return next_cursor, items
+
+
+def cursor_response(
+    items: Sequence[
+        typing.Union[DeclarativeBase, "CustomModel", dict[str, typing.Any]]
+    ],
+    next_cursor: str | None,
+) -> dict[str, dict[str, str | None] | list]:
+    return {
+        "list": items,
+        "pagination": {"next": next_cursor},
+    }
+
+
 # Convert month to season str
 def get_season(date):
     # Anime seasons start from first month of the year
@@ -506,29 +700,6 @@ def path_to_uuid(obj_uuid):
 
 
 # Collection ranking algorithm
-def calculate_collection_ranking(score, favourite, comments, created):
-    def boost_factor(day, boost_factor=10.0, boost_duration_days=30):
-        decay_rate = -math.log(1 / boost_factor) / boost_duration_days
-        return max(boost_factor * math.exp(-decay_rate * day), 1)
-
-    boost_duration_days = 30
-    now = utcnow()
-
-    weight_score = 1
-    weight_favourite = 2
-    weight_comment = 0.1
-
-    ranking = 0
-    ranking += weight_score * score
-    ranking += weight_favourite * favourite
-    ranking += weight_comment * comments
-
-    days_since_creation = (now - created).days
-    ranking *= boost_factor(days_since_creation, boost_duration_days)
-
-    return round(ranking, 8)
-
-
 def check_sort(sort_list, valid_fields):
     valid_orders = ["asc", "desc"]
 
@@ -120,9 +120,8 @@ async def user_watch_list(
     size: int = Depends(get_size),
 ):
     limit, offset = pagination(page, size)
-    total = await service.get_user_watch_list_count(session, search, user)
-    anime = await service.get_user_watch_list(
+    total, anime = await service.get_user_watch_list(
         session, search, user, limit, offset
     )
 
-    return paginated_response(anime.all(), total, page, limit)
+    return paginated_response(anime, total, page, limit)
@@ -1,7 +1,9 @@
-from sqlalchemy import select, desc, func, ScalarResult
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import select, desc, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import contains_eager
 from sqlalchemy.orm import joinedload
+from app.utils import paginated_items
 from app.utils import utcnow
 from app import constants
 import random
@@ -22,8 +24,11 @@ from app.service import (
     calculate_watch_duration,
     build_anime_order_by,
     anime_search_filter,
+    apply_stats_delta,
     get_anime_watch,
     anime_loadonly,
+    status_counts,
+    status_delta,
     create_log,
 )
 
@@ -38,56 +43,20 @@ async def get_user_watch_stats(session: AsyncSession, user: User, status: str):
     )
 
 
-async def get_user_watch_duration(session: AsyncSession, user: User):
-    duration = await session.scalar(
-        select(func.sum(AnimeWatch.duration)).filter(AnimeWatch.user == user)
+def watch_stats_object():
+    return func.jsonb_build_object(
+        "duration",
+        func.coalesce(func.sum(AnimeWatch.duration), 0),
+        *status_counts(AnimeWatch, constants.WATCH),
+        type_=JSONB,
     )
 
-    return duration if duration else 0
-
 
 async def generate_watch_stats(session: AsyncSession, user: User) -> User:
-    completed = await get_user_watch_stats(
-        session,
-        user,
-        constants.WATCH_COMPLETED,
-    )
-
-    watching = await get_user_watch_stats(
-        session,
-        user,
-        constants.WATCH_WATCHING,
-    )
-
-    planned = await get_user_watch_stats(
-        session,
-        user,
-        constants.WATCH_PLANNED,
+    user.anime_stats = await session.scalar(
+        select(watch_stats_object()).filter(AnimeWatch.user_id == user.id)
     )
 
-    on_hold = await get_user_watch_stats(
-        session,
-        user,
-        constants.WATCH_ON_HOLD,
-    )
-
-    dropped = await get_user_watch_stats(
-        session,
-        user,
-        constants.WATCH_DROPPED,
-    )
-
-    duration = await get_user_watch_duration(session, user)
-
-    user.anime_stats = {
-        "duration": duration,
-        "completed": completed,
-        "watching": watching,
-        "planned": planned,
-        "on_hold": on_hold,
-        "dropped": dropped,
-    }
-
     session.add(user)
     await session.commit()
 
@@ -101,7 +70,11 @@ async def save_watch(
     log_type = constants.LOG_WATCH_UPDATE
 
     # Create watch record if missing
-    if not (watch := await get_anime_watch(session, anime, user)):
+    if watch := await get_anime_watch(session, anime, user, lock=True):
+        old_status, old_duration = watch.status, watch.duration
+
+    else:
+        old_status, old_duration = None, 0
         log_type = constants.LOG_WATCH_CREATE
 
         watch = AnimeWatch()
@@ -140,9 +113,21 @@ async def save_watch(
     # Update user last list update
     user.updated = now
 
+    changed = log_before != {} and log_after != {} and log_before != log_after
+
+    # Applied before commit while watch row is still locked
+    if changed:
+        await apply_stats_delta(
+            session,
+            user,
+            "anime_stats",
+            status_delta(old_status, watch.status)
+            | {"duration": watch.duration - old_duration},
+        )
+
     await session.commit()
 
-    if log_before != {} and log_after != {} and log_before != log_after:
+    if changed:
         await create_log(
             session,
             log_type,
@@ -154,12 +139,12 @@ async def save_watch(
             },
         )
 
-        await generate_watch_stats(session, user)
-
     return watch
 
 
 async def delete_watch(session: AsyncSession, watch: AnimeWatch, user: User):
+    # Status may have been changed since watch was loaded
+    await session.refresh(watch, ["status", "duration"], with_for_update=True)
     await session.delete(watch)
 
     # Update user last list update
@@ -173,7 +158,12 @@ async def delete_watch(session: AsyncSession, watch: AnimeWatch, user: User):
         watch.anime.id,
     )
 
-    await generate_watch_stats(session, user)
+    await apply_stats_delta(
+        session,
+        user,
+        "anime_stats",
+        status_delta(watch.status, None) | {"duration": -watch.duration},
+    )
 
     await session.commit()
 
@@ -198,7 +188,7 @@ async def get_user_watch_list(
     user: User,
     limit: int,
     offset: int,
-) -> ScalarResult[AnimeWatch]:
+) -> tuple[int, list[AnimeWatch]]:
     query = select(AnimeWatch).filter(
         # AnimeWatch.deleted == False,  # noqa: E712
         AnimeWatch.user == user,
@@ -207,30 +197,15 @@ async def get_user_watch_list(
     if search.watch_status:
         query = query.filter(AnimeWatch.status == search.watch_status)
 
-    return await session.scalars(
+    return await paginated_items(
+        session,
         anime_search_filter(search, query.join(Anime), False)
         .order_by(*build_anime_order_by(search.sort))
-        .options(anime_loadonly(joinedload(AnimeWatch.anime)))
-        .limit(limit)
-        .offset(offset)
-    )
-
-
-async def get_user_watch_list_count(
-    session: AsyncSession, search: AnimeWatchSearchArgs, user: User
-) -> int:
-    query = select(func.count(AnimeWatch.id)).filter(
-        # AnimeWatch.deleted == False,  # noqa: E712
-        AnimeWatch.user == user,
+        .options(anime_loadonly(joinedload(AnimeWatch.anime))),
+        limit,
+        offset,
     )
 
-    if search.watch_status:
-        query = query.filter(AnimeWatch.status == search.watch_status)
-
-    query = anime_search_filter(search, query.join(Anime), False)
-
-    return await session.scalar(query)
-
 
 async def get_anime_watch_following_total(
     session: AsyncSession, user: User, anime: Anime
@@ -3,44 +3,58 @@ from apscheduler.triggers.cron import CronTrigger
 from app.database import sessionmanager
 from app.utils import get_settings
 from zoneinfo import ZoneInfo
+from app import constants
 import asyncio
 
 from app.sync import (
     # digest_year_summary,
     delete_expired_token_requests,
     update_article_views,
-    update_notifications,
+    update_list_stats,
     update_article_stats,
     update_ranking_all,
     update_aggregator,
-    update_activity,
     update_schedule,
-    update_ranking,
-    update_history,
     update_sitemap,
     update_search,
     update_scores,
     update_export,
+    update_logs,
+    SyncTrigger,
     send_emails,
 )
 
 
-def init_scheduler():
+def init_trigger():
+    return SyncTrigger(
+        {
+            constants.SYNC_LOGS: [update_logs],
+            constants.SYNC_SEARCH: [update_search],
+        }
+    )
+
+
+def init_scheduler(trigger: SyncTrigger, listen: bool = False):
     scheduler = AsyncIOScheduler()
 
+    # With LISTEN/NOTIFY jobs are woken up on writes and interval
+    # polling only catches up on missed notifications
+    fallback = 6 if listen else 1
+
     scheduler.add_job(delete_expired_token_requests, "interval", seconds=30)
-    scheduler.add_job(update_notifications, "interval", seconds=10)
     scheduler.add_job(update_article_views, "interval", minutes=10)
     scheduler.add_job(update_article_stats, "interval", minutes=1)
     scheduler.add_job(update_ranking_all, "interval", hours=1)
-    scheduler.add_job(update_activity, "interval", seconds=10)
     scheduler.add_job(update_schedule, "interval", minutes=5)
-    scheduler.add_job(update_ranking, "interval", seconds=10)
-    scheduler.add_job(update_history, "interval", seconds=10)
-    scheduler.add_job(update_scores, "interval", minutes=10)
+    scheduler.add_job(update_list_stats, "interval", hours=1)
     scheduler.add_job(update_export, "interval", minutes=1)
-    scheduler.add_job(update_search, "interval", minutes=1)
+    scheduler.add_job(
+        trigger.run, "interval", args=[update_search], minutes=fallback
+    )
     scheduler.add_job(send_emails, "interval", seconds=10)
+    scheduler.add_job(
+        trigger.run, "interval", args=[update_logs], seconds=10 * fallback
+    )
     scheduler.add_job(update_sitemap, "interval", days=1)
 
     scheduler.add_job(
@@ -51,6 +65,15 @@ def init_scheduler():
         ),
     )
 
+    # Scores are updated from logs, this only fixes possible drift
+    scheduler.add_job(
+        update_scores,
+        trigger=CronTrigger(
+            timezone=ZoneInfo("Europe/Kyiv"),
+            hour=5,
+        ),
+    )
+
     # NOTE: Reenable next year (maybe)
     # scheduler.add_job(
     #     digest_year_summary,
@@ -67,11 +90,16 @@ async def main():
     settings = get_settings()
     sessionmanager.init(settings.database.endpoint)
 
-    scheduler = init_scheduler()
+    listen = settings.get("sync", {}).get("listen", False)
+    trigger = init_trigger()
+    scheduler = init_scheduler(trigger, listen)
 
     try:
         scheduler.start()
 
+        if listen:
+            await trigger.start()
+
         while True:
             await asyncio.sleep(1000)
 
@@ -0,0 +1,77 @@
+from app.sync.aggregator.requests import AggregatorClient, AdaptiveLimiter
+from aiohttp.test_utils import TestServer
+from aiohttp import web
+import aiohttp
+import pytest
+
+
+@pytest.fixture
+async def aggregator_server():
+    hits = {"flaky": 0, "missing": 0}
+
+    # Fails twice before finally responding
+    async def flaky(request):
+        hits["flaky"] += 1
+
+        if hits["flaky"] <= 2:
+            return web.Response(status=503)
+
+        response = web.json_response({"page": int(request.query["page"])})
+        response.enable_compression()
+        return response
+
+    async def missing(request):
+        hits["missing"] += 1
+        return web.Response(status=404)
+
+    app = web.Application()
+    app.router.add_get("/anime", flaky)
+    app.router.add_get("/missing", missing)
+
+    async with TestServer(app) as server:
+        yield server, hits
+
+
+async def test_aggregator_client_retry(aggregator_server):
+    server, hits = aggregator_server
+
+    limiter = AdaptiveLimiter(initial=8)
+    client = AggregatorClient(
+        str(server.make_url("")).rstrip("/"), backoff=0, limiter=limiter
+    )
+
+    async with client.session():
+        data = await client.get("/anime?page=3")
+
+    assert data == {"page": 3}
+    assert hits["flaky"] == 3
+
+    # Limit is halved on every failed attempt
+    assert limiter.limit == 2
+
+
+async def test_aggregator_client_no_retry(aggregator_server):
+    server, hits = aggregator_server
+
+    client = AggregatorClient(str(server.make_url("")).rstrip("/"), backoff=0)
+
+    # Client errors are not retried
+    with pytest.raises(aiohttp.ClientResponseError):
+        await client.get("/missing")
+
+    assert hits["missing"] == 1
+
+
+async def test_adaptive_limiter():
+    limiter = AdaptiveLimiter(initial=2, maximum=3)
+
+    for _ in range(10):
+        limiter.record_success()
+
+    assert limiter.limit == 3
+
+    limiter.record_failure()
+    limiter.record_failure()
+    limiter.record_failure()
+
+    assert limiter.limit == 1
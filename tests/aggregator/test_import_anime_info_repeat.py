@@ -0,0 +1,47 @@
+from sqlalchemy.orm import selectinload
+from sqlalchemy import select, func
+from app import aggregator
+import helpers
+
+from app.models import (
+    AnimeCharacter,
+    CompanyAnime,
+    AnimeVoice,
+    AnimeStaff,
+    Anime,
+)
+
+
+async def count_relations(test_session, anime):
+    return [
+        await test_session.scalar(
+            select(func.count(model.id)).filter(model.anime == anime)
+        )
+        for model in [AnimeCharacter, CompanyAnime, AnimeVoice, AnimeStaff]
+    ]
+
+
+async def test_import_anime_info_repeat(
+    test_session,
+    aggregator_genres,
+    aggregator_companies,
+    aggregator_anime,
+    aggregator_people,
+    aggregator_characters,
+    aggregator_anime_roles,
+    aggregator_anime_info,
+):
+    anime = await test_session.scalar(
+        select(Anime)
+        .filter(Anime.slug == "fullmetal-alchemist-brotherhood-fc524a")
+        .options(selectinload(Anime.genres))
+    )
+
+    before = await count_relations(test_session, anime)
+
+    # Importing same info again should not duplicate any relations
+    data = await helpers.load_json("tests/data/anime_info/fma.json")
+    await aggregator.update_anime_info(test_session, anime, data)
+
+    assert await count_relations(test_session, anime) == before
+    assert before[0] > 0
@@ -0,0 +1,159 @@
+from app.sync.aggregator.pipeline import ingest_pages
+from sqlalchemy.exc import IntegrityError
+import asyncio
+import pytest
+
+
+def build_pages(total_pages: int, per_page: int, duplicates: bool = False):
+    pages = {}
+
+    for page in range(1, total_pages + 1):
+        ids = list(range((page - 1) * per_page, page * per_page))
+
+        # Listing shifted and last entry of previous page showed up again
+        if duplicates and page > 1:
+            ids[0] = ids[0] - 1
+
+        pages[page] = {
+            "pagination": {"pages": total_pages},
+            "list": [{"content_id": str(content_id)} for content_id in ids],
+        }
+
+    return pages
+
+
+class FakeListing:
+    def __init__(self, pages: dict):
+        self.pages = pages
+        self.fetched = []
+        self.chunks = []
+
+    async def get_page(self, page: int):
+        self.fetched.append(page)
+        await asyncio.sleep(0)
+        return self.pages[page]
+
+    async def save(self, chunk: list):
+        await asyncio.sleep(0)
+        self.chunks.append(chunk)
+
+    @property
+    def saved(self):
+        return [entry["content_id"] for chunk in self.chunks for entry in chunk]
+
+
+async def test_ingest_pages():
+    listing = FakeListing(build_pages(10, 7))
+
+    await ingest_pages(listing.get_page, listing.save, 5, fetchers=3, writers=2)
+
+    # Every page is fetched and every entry is saved exactly once
+    assert sorted(listing.fetched) == list(range(1, 11))
+    assert sorted(listing.saved, key=int) == [str(i) for i in range(70)]
+
+    # Only last chunk of each writer may be smaller than chunk size
+    assert all(len(chunk) <= 5 for chunk in listing.chunks)
+    assert len([chunk for chunk in listing.chunks if len(chunk) < 5]) <= 2
+
+
+async def test_ingest_pages_duplicates():
+    listing = FakeListing(build_pages(5, 10, duplicates=True))
+
+    await ingest_pages(listing.get_page, listing.save, 10, writers=3)
+
+    # Entries repeated on neighbour pages are saved only once
+    assert len(listing.saved) == len(set(listing.saved))
+    assert len(listing.saved) == 46
+
+
+async def test_ingest_pages_queue_bound():
+    listing = FakeListing(build_pages(50, 10))
+    release = asyncio.Event()
+
+    async def save(chunk):
+        await release.wait()
+        await listing.save(chunk)
+
+    task = asyncio.create_task(
+        ingest_pages(
+            listing.get_page,
+            save,
+            10,
+            fetchers=2,
+            writers=1,
+            queue_pages=3,
+        )
+    )
+
+    await asyncio.sleep(0.1)
+
+    # Blocked writer holds one page, queue holds three more and each
+    # fetcher is waiting to put its page into the queue
+    assert len(listing.fetched) == 1 + 3 + 2
+
+    release.set()
+    await task
+
+    assert len(listing.fetched) == 50
+    assert len(listing.saved) == 500
+
+
+async def test_ingest_pages_fetcher_failure():
+    listing = FakeListing(build_pages(20, 5))
+
+    async def get_page(page):
+        if page == 7:
+            raise ValueError("Aggregator is down")
+
+        return await listing.get_page(page)
+
+    with pytest.raises(ExceptionGroup) as error:
+        await asyncio.wait_for(
+            ingest_pages(get_page, listing.save, 5, queue_pages=1), 5
+        )
+
+    assert error.value.subgroup(ValueError) is not None
+
+
+async def test_ingest_pages_writer_failure():
+    listing = FakeListing(build_pages(20, 5))
+
+    async def save(chunk):
+        raise ValueError("Database is down")
+
+    # Fetchers waiting on full queue must not hang
+    with pytest.raises(ExceptionGroup) as error:
+        await asyncio.wait_for(
+            ingest_pages(listing.get_page, save, 5, queue_pages=1), 5
+        )
+
+    assert error.value.subgroup(ValueError) is not None
+
+
+async def test_ingest_pages_integrity_retry():
+    listing = FakeListing(build_pages(4, 5))
+    attempts = {}
+
+    async def save(chunk):
+        key = chunk[0]["content_id"]
+        attempts[key] = attempts.get(key, 0) + 1
+
+        # First attempt of every chunk collides with concurrent writer
+        if attempts[key] == 1:
+            raise IntegrityError("INSERT", {}, Exception("duplicate"))
+
+        await listing.save(chunk)
+
+    await ingest_pages(listing.get_page, save, 5)
+
+    assert len(listing.saved) == 20
+    assert all(count == 2 for count in attempts.values())
+
+    # Second failure is not retried anymore
+    async def save_always_failing(chunk):
+        raise IntegrityError("INSERT", {}, Exception("duplicate"))
+
+    with pytest.raises(ExceptionGroup) as error:
+        await ingest_pages(listing.get_page, save_always_failing, 5)
+
+    assert error.value.subgroup(IntegrityError) is not None
@@ -0,0 +1,147 @@
+from app.sync.aggregator import AGGREGATOR_STAGES
+import asyncio
+import pytest
+
+from app.sync.aggregator.graph import (
+    ConnectionBudget,
+    check_stages,
+    run_stages,
+    Stage,
+)
+
+
+class Recorder:
+    def __init__(self):
+        self.started = []
+        self.completed = []
+        self.running = 0
+        self.max_running = 0
+
+    def stage(self, name, depends=[], connections=1, fail=False, delay=0.01):
+        async def run():
+            self.running += connections
+            self.max_running = max(self.max_running, self.running)
+
+            try:
+                await asyncio.sleep(delay)
+
+                if fail:
+                    raise ValueError(f"Stage {name} failed")
+
+            finally:
+                self.running -= connections
+
+        return Stage(name, [name, name], run, depends, connections)
+
+    async def on_start(self, stage):
+        self.started.append(stage.name)
+
+    async def on_complete(self, stage):
+        self.completed.append(stage.name)
+
+
+def test_check_stages():
+    recorder = Recorder()
+
+    with pytest.raises(ValueError, match="unknown"):
+        check_stages([recorder.stage("a", depends=["missing"])])
+
+    with pytest.raises(ValueError, match="circular"):
+        check_stages(
+            [
+                recorder.stage("a", depends=["c"]),
+                recorder.stage("b", depends=["a"]),
+                recorder.stage("c", depends=["b"]),
+                recorder.stage("d"),
+            ]
+        )
+
+    # Actual sync graph must always be valid
+    check_stages(AGGREGATOR_STAGES)
+
+
+async def test_run_stages_order():
+    recorder = Recorder()
+
+    stages = [
+        recorder.stage("info", depends=["anime", "genres"]),
+        recorder.stage("search", depends=["info"]),
+        recorder.stage("anime", delay=0.05),
+        recorder.stage("genres"),
+    ]
+
+    await run_stages(
+        stages, ConnectionBudget(10), recorder.on_start, recorder.on_complete
+    )
+
+    assert sorted(recorder.completed) == ["anime", "genres", "info", "search"]
+
+    # Stage starts only after all of its dependencies are completed
+    for stage in stages:
+        for dependency in stage.depends:
+            assert recorder.completed.index(
+                dependency
+            ) < recorder.started.index(stage.name)
+
+    # Independent stages run at the same time
+    assert recorder.started[:2] == ["anime", "genres"]
+
+
+async def test_run_stages_failure():
+    recorder = Recorder()
+
+    stages = [
+        recorder.stage("anime", fail=True),
+        recorder.stage("info", depends=["anime"]),
+        recorder.stage("people", delay=10),
+    ]
+
+    with pytest.raises(ExceptionGroup) as error:
+        await asyncio.wait_for(
+            run_stages(
+                stages,
+                ConnectionBudget(10),
+                recorder.on_start,
+                recorder.on_complete,
+            ),
+            5,
+        )
+
+    assert error.value.subgroup(ValueError) is not None
+
+    # Dependent stage never starts and running one is cancelled
+    assert "info" not in recorder.started
+    assert recorder.completed == []
+    assert recorder.running == 0
+
+
+async def test_connection_budget():
+    recorder = Recorder()
+
+    stages = [
+        recorder.stage(name, connections=2)
+        for name in ["a", "b", "c", "d", "e"]
+    ]
+
+    await run_stages(
+        stages, ConnectionBudget(5), recorder.on_start, recorder.on_complete
+    )
+
+    # Only two stages fit into budget at the same time
+    assert len(recorder.completed) == 5
+    assert recorder.max_running == 4
+
+    recorder = Recorder()
+
+    # Stage which needs more than whole budget still runs, but alone
+    stages = [
+        recorder.stage("small", connections=2),
+        recorder.stage("huge", connections=10),
+    ]
+
+    await run_stages(
+        stages, ConnectionBudget(5), recorder.on_start, recorder.on_complete
+    )
+
+    assert len(recorder.completed) == 2
+    assert recorder.max_running == 10
@@ -1,4 +1,12 @@
+from app.service import catalog_versions, catalog_cache
+from app.sync.search.utils import clear_search_update
 from client_requests import request_anime_search
+from client_requests import request_accept_edit
+from client_requests import request_create_edit
+from app.meilisearch import searchmanager
+from sqlalchemy import select, update
+from app.models import Anime
+from app.utils import utcnow
 from fastapi import status
 
 
@@ -34,6 +42,21 @@ async def test_anime_no_meilisearch(client):
     assert response.status_code == status.HTTP_400_BAD_REQUEST
 
 
+async def test_anime_search_circuit_breaker(client):
+    # After several failed requests circuit breaker should open
+    for _ in range(searchmanager.failures_threshold):
+        response = await request_anime_search(client, {"query": "test"})
+        assert response.json()["code"] == "search:query_down"
+
+    assert searchmanager.is_open is True
+
+    # While it is open search fails fast with same error
+    response = await request_anime_search(client, {"query": "test"})
+
+    assert response.json()["code"] == "search:query_down"
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
 async def test_anime_pagination(
     client, aggregator_anime, aggregator_anime_info
 ):
@@ -63,3 +86,119 @@ async def test_anime_pagination_size(
     assert response.json()["pagination"]["total"] == 16
     assert response.json()["pagination"]["pages"] == 8
     assert response.json()["pagination"]["page"] == 1
+
+
+async def test_anime_catalog_cache(
+    client, test_session, aggregator_anime, aggregator_anime_info
+):
+    # Same filters in different order should share cache entry
+    response = await request_anime_search(
+        client, {"media_type": ["tv", "movie"]}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(catalog_cache) == 1
+
+    cached_response = await request_anime_search(
+        client, {"media_type": ["movie", "tv"]}
+    )
+
+    assert cached_response.json() == response.json()
+    assert len(catalog_cache) == 1
+
+    # Changes to content should invalidate cached results
+    await test_session.execute(
+        update(Anime)
+        .filter(Anime.slug == "fullmetal-alchemist-brotherhood-fc524a")
+        .values(deleted=True, updated=utcnow())
+    )
+
+    await test_session.commit()
+
+    # Skip content version cache instead of waiting for it to expire
+    catalog_versions.clear()
+
+    response = await request_anime_search(client)
+
+    assert response.json()["pagination"]["total"] == 15
+    assert (
+        response.json()["list"][0]["slug"]
+        != "fullmetal-alchemist-brotherhood-fc524a"
+    )
+
+
+async def test_anime_catalog_native_score(
+    client, test_session, aggregator_anime, aggregator_anime_info
+):
+    # Native score changes don't bump catalog version, so such
+    # searches should always hit database instead of cache
+    filters = {"sort": ["native_score:desc"]}
+
+    response = await request_anime_search(client, filters)
+    assert response.status_code == status.HTTP_200_OK
+    assert len(catalog_cache) == 0
+
+    await test_session.execute(
+        update(Anime)
+        .filter(Anime.slug == "fullmetal-alchemist-brotherhood-fc524a")
+        .values(native_score=10, native_scored_by=1)
+    )
+
+    await test_session.commit()
+
+    response = await request_anime_search(client, filters)
+    assert (
+        response.json()["list"][0]["slug"]
+        == "fullmetal-alchemist-brotherhood-fc524a"
+    )
+
+    response = await request_anime_search(client, {"native_score": [9, 10]})
+    assert response.json()["pagination"]["total"] == 1
+    assert len(catalog_cache) == 0
+
+
+async def test_anime_catalog_edit(
+    client,
+    test_session,
+    aggregator_anime,
+    aggregator_anime_info,
+    create_test_user_moderator,
+    get_test_token,
+):
+    response = await request_anime_search(client, size=20)
+    assert response.status_code == status.HTTP_200_OK
+    assert len(catalog_cache) == 1
+
+    response = await request_create_edit(
+        client,
+        get_test_token,
+        "anime",
+        "bocchi-the-rock-9e172d",
+        {
+            "description": "Brief description",
+            "after": {"title_en": "Bocchi The Rock!"},
+        },
+    )
+
+    response = await request_accept_edit(
+        client, get_test_token, response.json()["edit_id"]
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+
+    # Search sync resets flag set by edit, but catalog version
+    # must not go back to the value cached page was built with
+    anime = await test_session.scalar(
+        select(Anime).filter(Anime.slug == "bocchi-the-rock-9e172d")
+    )
+
+    await clear_search_update(test_session, Anime, [anime.id])
+
+    catalog_versions.clear()
+
+    response = await request_anime_search(client, size=20)
+    assert response.status_code == status.HTTP_200_OK
+    assert len(catalog_cache) == 2
+
+    titles = [entry["title_en"] for entry in response.json()["list"]]
+    assert "Bocchi The Rock!" in titles
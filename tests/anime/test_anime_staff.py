@@ -1,4 +1,8 @@
 from client_requests import request_anime_staff
+from app.aggregator import update_anime_staff_weights
+from app.models import AnimeStaffRole
+from sqlalchemy import select
+from app.utils import utcnow
 from fastapi import status
 
 
@@ -27,3 +31,37 @@ async def test_anime_staff(
     assert (
         response.json()["list"][11]["person"]["slug"] == "tomoki-kikuya-e4348e"
     )
+
+
+async def test_anime_staff_role_weights(
+    client,
+    test_session,
+    aggregator_anime_roles: None,
+    aggregator_people: None,
+    aggregator_anime: None,
+    aggregator_anime_info: None,
+):
+    since = utcnow()
+
+    response = await request_anime_staff(client, "bocchi-the-rock-9e172d")
+    staff = response.json()["list"][0]
+
+    assert staff["weight"] == 1080
+
+    role = await test_session.scalar(
+        select(AnimeStaffRole).filter(
+            AnimeStaffRole.slug == staff["roles"][0]["slug"]
+        )
+    )
+
+    role.weight += 100
+    role.updated = utcnow()
+    test_session.add(role)
+    await test_session.commit()
+
+    # Anime itself hasn't changed, but staff with changed role
+    # must still be picked up by incremental recalculation
+    await update_anime_staff_weights(test_session, since)
+
+    response = await request_anime_staff(client, "bocchi-the-rock-9e172d")
+    assert response.json()["list"][0]["weight"] == 1180
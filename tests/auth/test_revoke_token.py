@@ -1,8 +1,12 @@
+from app.service import auth_activity, CachedAuthToken
+from app.utils import utcnow
 from starlette import status
+from uuid import uuid4
 
 from tests.client_requests import (
     request_auth_token_info,
     request_revoke_token,
+    request_me,
 )
 
 
@@ -45,3 +49,53 @@ async def test_revoke_thirdparty_token(
     assert response.status_code == status.HTTP_400_BAD_REQUEST
 
     assert response.json()["code"] == "auth:invalid_token"
+
+
+async def test_revoke_token_cached(client, test_token):
+    # First request puts token into auth cache
+    response = await request_me(client, test_token)
+    assert response.status_code == status.HTTP_200_OK
+
+    response = await request_auth_token_info(client, test_token)
+    token_reference = response.json()["reference"]
+
+    response = await request_revoke_token(client, test_token, token_reference)
+    assert response.status_code == status.HTTP_200_OK
+
+    # Revoked token must not be served from cache
+    response = await request_me(client, test_token)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json()["code"] == "auth:invalid_token"
+
+
+async def test_revoke_token_activity(client, test_session, test_token):
+    # Token usage bump is buffered until background flush
+    response = await request_me(client, test_token)
+    assert response.status_code == status.HTTP_200_OK
+    assert len(auth_activity.tokens) == 1
+
+    response = await request_auth_token_info(client, test_token)
+    token_reference = response.json()["reference"]
+
+    response = await request_revoke_token(client, test_token, token_reference)
+    assert response.status_code == status.HTTP_200_OK
+
+    # Revoked token should not be written back
+    assert len(auth_activity.tokens) == 0
+
+    # Bump for token which is already gone is skipped without error
+    now = utcnow()
+    auth_activity.touch_token(
+        CachedAuthToken(
+            id=uuid4(),
+            secret="MISSING_TOKEN",
+            user_id=uuid4(),
+            client_id=None,
+            scope=[],
+            expiration=now,
+            used=now,
+        )
+    )
+
+    await auth_activity.flush(test_session)
+    assert len(auth_activity.tokens) == 0
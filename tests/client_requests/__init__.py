@@ -89,12 +89,14 @@ from .edit import request_deny_edit
 from .edit import request_edit_list
 from .edit import request_edit
 
+from .comments import request_comments_list_cursor
 from .comments import request_comments_latest
 from .comments import request_comments_write
 from .comments import request_comments_list
 from .comments import request_comments_edit
 from .comments import request_comments_hide
 
+from .settings import request_settings_import_status
 from .settings import request_settings_customization
 from .settings import request_settings_delete_watch
 from .settings import request_settings_delete_image
@@ -125,6 +127,9 @@ from .notifications import request_notifications_count
 from .notifications import request_notification_seen
 from .notifications import request_notifications
 
+from .history import request_following_history
+from .history import request_user_history
+
 from .vote import request_vote_status
 from .vote import request_vote
 
@@ -228,12 +233,14 @@ __all__ = [
     "request_edit_list",
     "request_edit",
     # =========== comments ===========
+    "request_comments_list_cursor",
     "request_comments_latest",
     "request_comments_write",
     "request_comments_list",
     "request_comments_edit",
     "request_comments_hide",
     # =========== settings ===========
+    "request_settings_import_status",
     "request_settings_customization",
     "request_settings_delete_watch",
     "request_settings_delete_image",
@@ -263,6 +270,9 @@ __all__ = [
     "request_notifications_count",
     "request_notification_seen",
     "request_notifications",
+    # =========== history ===========
+    "request_following_history",
+    "request_user_history",
     # =========== vote ===========
     "request_vote_status",
     "request_vote",
@@ -34,5 +34,16 @@ def request_comments_list(client, content_type, slug, token=None, page=1):
     )
 
 
+def request_comments_list_cursor(
+    client, content_type, slug, cursor="", size=15, token=None
+):
+    headers = {"Auth": token} if token else {}
+    return client.get(
+        f"/comments/{content_type}/{slug}/list",
+        params={"cursor": cursor, "size": size},
+        headers=headers,
+    )
+
+
 def request_comments_latest(client):
     return client.get("/comments/latest")
@@ -0,0 +1,9 @@
+def request_user_history(client, username, page=1, size=15):
+    return client.get(f"/history/user/{username}?page={page}&size={size}")
+
+
+def request_following_history(client, token, page=1, size=15):
+    return client.get(
+        f"/history/following?page={page}&size={size}",
+        headers={"Auth": token},
+    )
@@ -54,6 +54,13 @@ def request_settings_import_read(client, token, data):
     )
 
 
+def request_settings_import_status(client, token):
+    return client.get(
+        "/settings/import/status",
+        headers={"Auth": token},
+    )
+
+
 def request_settings_delete_image(client, token, image_type):
     return client.delete(
         f"/settings/image/{image_type}", headers={"Auth": token}
@@ -1,3 +1,4 @@
+from client_requests import request_comments_list_cursor
 from client_requests import request_comments_write
 from client_requests import request_comments_list
 from client_requests import request_vote
@@ -102,3 +103,88 @@ async def test_comments_list_authorized(
         ]
         == "4"
     )
+
+
+async def test_comments_list_multiple_threads(
+    client,
+    aggregator_anime,
+    aggregator_anime_info,
+    create_test_user,
+    get_test_token,
+):
+    for thread in ["1", "2", "3"]:
+        response = await request_comments_write(
+            client, get_test_token, "edit", "17", thread
+        )
+
+        parent_comment = response.json()["reference"]
+
+        response = await request_comments_write(
+            client,
+            get_test_token,
+            "edit",
+            "17",
+            f"{thread}.1",
+            parent_comment,
+        )
+
+        await request_vote(
+            client,
+            get_test_token,
+            constants.CONTENT_COMMENT,
+            response.json()["reference"],
+            1 if thread == "2" else -1,
+        )
+
+    response = await request_comments_list(client, "edit", "17", get_test_token)
+
+    # Check status
+    assert response.status_code == status.HTTP_200_OK
+
+    # Newest threads go first and each gets only own replies
+    for comment, thread in zip(response.json()["list"], ["3", "2", "1"]):
+        assert comment["text"] == thread
+        assert comment["total_replies"] == 1
+        assert len(comment["replies"]) == 1
+        assert comment["replies"][0]["text"] == f"{thread}.1"
+        assert comment["replies"][0]["my_score"] == (1 if thread == "2" else -1)
+
+
+async def test_comments_list_cursor(
+    client,
+    aggregator_anime,
+    aggregator_anime_info,
+    create_test_user,
+    get_test_token,
+):
+    for text in ["1", "2", "3"]:
+        await request_comments_write(client, get_test_token, "edit", "17", text)
+
+    # Empty cursor opts in to cursor mode and returns first page
+    response = await request_comments_list_cursor(client, "edit", "17", size=2)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [comment["text"] for comment in response.json()["list"]] == [
+        "3",
+        "2",
+    ]
+
+    next_cursor = response.json()["pagination"]["next"]
+    assert next_cursor is not None
+
+    # Next page continues right after last comment
+    response = await request_comments_list_cursor(
+        client, "edit", "17", next_cursor, size=2
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [comment["text"] for comment in response.json()["list"]] == ["1"]
+    assert response.json()["pagination"]["next"] is None
+
+    # Malformed cursor
+    response = await request_comments_list_cursor(
+        client, "edit", "17", "bad-cursor"
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json()["code"] == "system:bad_cursor"
@@ -3,6 +3,9 @@
 
 from pytest_postgresql.janitor import DatabaseJanitor
 from app.database import sessionmanager, get_session
+from app.service import catalog_versions, catalog_cache
+from app.service import auth_token_cache, auth_activity
+from app.settings.service import import_jobs
 from app.models import Anime, Manga, Novel, Base
 from async_asgi_testclient import TestClient
 from pytest_postgresql import factories
@@ -87,6 +90,16 @@ async def create_tables(connection_test):
         )
 
 
+@pytest.fixture(scope="function", autouse=True)
+def clear_catalog_cache():
+    # Tables are truncated between tests so cached ids must go too
+    catalog_versions.clear()
+    catalog_cache.clear()
+    auth_token_cache.clear()
+    auth_activity.clear()
+    import_jobs.clear()
+
+
 @pytest.fixture(scope="function", autouse=True)
 async def session_override(app, connection_test):
     async def get_session_override():
@@ -0,0 +1,35 @@
+from app.sync.digests.year_summary import YearStatsGenerator
+from app.sync.history import generate_history
+from client_requests import request_watch_add
+from app.utils import utcnow
+from datetime import timedelta
+
+
+async def test_year_summary(
+    client,
+    create_test_user,
+    aggregator_anime,
+    aggregator_anime_info,
+    get_test_token,
+    test_session,
+):
+    await request_watch_add(
+        client,
+        "bocchi-the-rock-9e172d",
+        get_test_token,
+        {"status": "completed", "episodes": 12, "score": 9},
+    )
+
+    await generate_history(test_session)
+
+    now = utcnow()
+
+    # History content must be loaded along with records
+    generator = YearStatsGenerator(
+        test_session, now - timedelta(days=1), now + timedelta(days=1)
+    )
+
+    stats = await generator.calculate()
+    user_stats = stats[str(create_test_user.id)]
+
+    assert user_stats["records_total"] == 1
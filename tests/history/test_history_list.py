@@ -0,0 +1,95 @@
+from client_requests import request_following_history
+from client_requests import request_favourite_add
+from client_requests import request_user_history
+from client_requests import request_watch_add
+from app.sync.history import generate_history
+from app.utils import estimate_total
+from sqlalchemy import select
+from app.models import History
+from fastapi import status
+from app import constants
+
+
+async def test_history_list(
+    client,
+    create_test_user,
+    aggregator_anime,
+    aggregator_anime_info,
+    get_test_token,
+    test_session,
+):
+    await request_watch_add(
+        client,
+        "bocchi-the-rock-9e172d",
+        get_test_token,
+        {"status": "watching", "episodes": 1},
+    )
+
+    await request_favourite_add(
+        client, "anime", "bocchi-the-rock-9e172d", get_test_token
+    )
+
+    await generate_history(test_session)
+
+    # Content of every history type is loaded along with the list
+    for response in [
+        await request_user_history(client, "testuser"),
+        await request_following_history(client, get_test_token),
+    ]:
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["pagination"]["total"] == 2
+
+        history_types = {
+            entry["history_type"]: entry for entry in response.json()["list"]
+        }
+
+        for history_type in [
+            constants.HISTORY_FAVOURITE_ANIME,
+            constants.HISTORY_WATCH,
+        ]:
+            assert (
+                history_types[history_type]["content"]["slug"]
+                == "bocchi-the-rock-9e172d"
+            )
+
+
+async def test_history_following_estimate(
+    client,
+    create_test_user,
+    aggregator_anime,
+    aggregator_anime_info,
+    get_test_token,
+    test_session,
+):
+    await request_watch_add(
+        client,
+        "bocchi-the-rock-9e172d",
+        get_test_token,
+        {"status": "watching", "episodes": 1},
+    )
+
+    await request_favourite_add(
+        client, "anime", "bocchi-the-rock-9e172d", get_test_token
+    )
+
+    await generate_history(test_session)
+
+    assert await estimate_total(test_session, select(History)) >= 0
+
+    # Full pages get planner estimate, which is never less than
+    # number of entries already seen
+    for page in [1, 2]:
+        response = await request_following_history(
+            client, get_test_token, page=page, size=1
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()["list"]) == 1
+        assert response.json()["pagination"]["total"] >= page
+
+    # While total on the last page is exact
+    response = await request_following_history(
+        client, get_test_token, page=1, size=3
+    )
+
+    assert response.json()["pagination"]["total"] == 2
@@ -1,6 +1,8 @@
+from client_requests import request_settings_import_status
 from client_requests import request_settings_import_watch
 from app.models import AnimeWatch, User, Anime, Log
 from client_requests import request_watch_add
+from app.settings.service import start_import
 from sqlalchemy import select, desc, func
 from fastapi import status
 from app import constants
@@ -98,3 +100,33 @@ async def test_settings_import_watch(
     assert log.user == create_test_user
     assert log.data["imported"] == 1
     assert log.data["overwrite"] is False
+
+    # Import progress is kept after import has finished
+    response = await request_settings_import_status(client, get_test_token)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["list_type"] == "watch"
+    assert response.json()["finished"] is True
+    assert response.json()["processed"] == 3
+    assert response.json()["imported"] == 1
+    assert response.json()["total"] == 3
+
+
+async def test_settings_import_watch_running(
+    client, create_test_user, get_test_token
+):
+    # Pretend another import has just been started
+    assert start_import(create_test_user, "watch", 10) is not None
+    assert start_import(create_test_user, "read", 10) is None
+
+    response = await request_settings_import_watch(
+        client, get_test_token, {"overwrite": False, "anime": []}
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json()["code"] == "settings:import_running"
+
+    # Import in progress should not be replaced
+    response = await request_settings_import_status(client, get_test_token)
+    assert response.json()["list_type"] == "watch"
+    assert response.json()["finished"] is False
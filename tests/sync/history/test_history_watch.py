@@ -1,14 +1,18 @@
 from typing import Iterator
 
 from app.sync.history import generate_history
+from app.sync.logs import LOG_BATCH_SIZE
 from sqlalchemy import select, desc, func
 from app.models import Log, History
 from datetime import datetime
 from app import constants
 from uuid import uuid4
+import pytest
 
 
-async def test_history_watch(test_session, create_test_user):
+# Small batch size makes sure records are merged across batches too
+@pytest.mark.parametrize("batch_size", [LOG_BATCH_SIZE, 2])
+async def test_history_watch(test_session, create_test_user, batch_size):
     user_id = create_test_user.id
     fake_anime_id = uuid4()
 
@@ -106,7 +110,7 @@ async def test_history_watch(test_session, create_test_user):
     assert logs_count == len(test_logs)
 
     # Generate history
-    await generate_history(test_session)
+    await generate_history(test_session, batch_size)
 
     # Count history
     history_count = await test_session.scalar(select(func.count(History.id)))
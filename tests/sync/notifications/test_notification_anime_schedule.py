@@ -0,0 +1,94 @@
+from app.sync.notifications import generate_notifications
+from client_requests import request_watch_add
+from app.models import Notification, Anime
+from sqlalchemy import select, func
+from app.service import create_log
+from app import constants
+
+
+async def test_notification_anime_schedule(
+    client,
+    aggregator_anime,
+    create_dummy_user,
+    create_test_user,
+    get_dummy_token,
+    get_test_token,
+    test_session,
+):
+    await request_watch_add(
+        client,
+        "bocchi-the-rock-9e172d",
+        get_test_token,
+        {"status": "watching", "episodes": 1},
+    )
+
+    await request_watch_add(
+        client,
+        "bocchi-the-rock-9e172d",
+        get_dummy_token,
+        {"status": "planned"},
+    )
+
+    anime = await test_session.scalar(
+        select(Anime).filter(Anime.slug == "bocchi-the-rock-9e172d")
+    )
+
+    # New episode has aired
+    await create_log(
+        test_session,
+        constants.LOG_SCHEDULE_ANIME,
+        None,
+        anime.id,
+        {
+            "before": {"episodes_released": 1},
+            "after": {"episodes_released": 2},
+        },
+    )
+
+    await generate_notifications(test_session)
+
+    # Planned entries only get notified about status change
+    notifications = await test_session.scalars(
+        select(Notification).filter(
+            Notification.notification_type
+            == constants.NOTIFICATION_SCHEDULE_ANIME
+        )
+    )
+
+    notifications = notifications.all()
+
+    assert len(notifications) == 1
+    assert notifications[0].user_id == create_test_user.id
+    assert notifications[0].data["slug"] == "bocchi-the-rock-9e172d"
+    assert notifications[0].data["after"] == {"episodes_released": 2}
+
+    # Dummy user does not want to see these notifications
+    create_dummy_user.ignored_notifications = [
+        constants.NOTIFICATION_SCHEDULE_ANIME
+    ]
+
+    test_session.add(create_dummy_user)
+    await test_session.commit()
+
+    await create_log(
+        test_session,
+        constants.LOG_SCHEDULE_ANIME,
+        None,
+        anime.id,
+        {
+            "before": {"status": "ongoing"},
+            "after": {"status": "finished"},
+        },
+    )
+
+    await generate_notifications(test_session)
+
+    notifications_count = await test_session.scalar(
+        select(func.count(Notification.id)).filter(
+            Notification.notification_type
+            == constants.NOTIFICATION_SCHEDULE_ANIME,
+            Notification.user_id == create_dummy_user.id,
+        )
+    )
+
+    assert notifications_count == 0
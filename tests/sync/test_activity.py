@@ -153,3 +153,48 @@ async def test_activity(test_session, create_test_user, create_dummy_user):
 
     assert activity_dummy[3].timestamp == datetime(2024, 2, 2)
     assert activity_dummy[3].actions == 1
+
+
+async def test_activity_incremental(test_session, create_test_user):
+    user_id = create_test_user.id
+
+    test_session.add_all(
+        [
+            Log(
+                created=datetime(2024, 2, 1, hour, 0, 0),
+                log_type=constants.LOG_LOGIN,
+                user_id=user_id,
+                data={},
+            )
+            for hour in [1, 2]
+        ]
+    )
+    await test_session.commit()
+
+    await generate_activity(test_session)
+
+    # Later logs for the same day are added to existing record
+    test_session.add(
+        Log(
+            created=datetime(2024, 2, 1, 5, 0, 0),
+            log_type=constants.LOG_LOGIN,
+            user_id=user_id,
+            data={},
+        )
+    )
+    await test_session.commit()
+
+    await generate_activity(test_session)
+
+    # Nothing new here, so counters must stay the same
+    await generate_activity(test_session)
+
+    activity = await test_session.scalars(
+        select(Activity).filter(Activity.user == create_test_user)
+    )
+
+    activity = activity.all()
+
+    assert len(activity) == 1
+    assert activity[0].timestamp == datetime(2024, 2, 1)
+    assert activity[0].actions == 3
@@ -0,0 +1,73 @@
+from app.sync.stats import reconcile_list_stats
+from client_requests import request_watch_add
+from sqlalchemy import update
+from app.models import User
+
+
+async def test_list_stats_status_change(
+    client,
+    create_test_user,
+    aggregator_anime,
+    aggregator_anime_info,
+    get_test_token,
+    test_session,
+):
+    await request_watch_add(
+        client,
+        "bocchi-the-rock-9e172d",
+        get_test_token,
+        {"status": "watching", "episodes": 10},
+    )
+
+    await test_session.refresh(create_test_user)
+    assert create_test_user.anime_stats["watching"] == 1
+    assert create_test_user.anime_stats["duration"] == 230
+
+    # Changing status moves entry from one counter to another
+    await request_watch_add(
+        client,
+        "bocchi-the-rock-9e172d",
+        get_test_token,
+        {"status": "completed", "episodes": 12},
+    )
+
+    await test_session.refresh(create_test_user)
+    assert create_test_user.anime_stats["watching"] == 0
+    assert create_test_user.anime_stats["completed"] == 1
+    assert create_test_user.anime_stats["duration"] == 276
+
+
+async def test_reconcile_list_stats(
+    client,
+    create_test_user,
+    aggregator_anime,
+    aggregator_anime_info,
+    get_test_token,
+    test_session,
+):
+    for slug, status in [
+        ("bocchi-the-rock-9e172d", "watching"),
+        ("fullmetal-alchemist-brotherhood-fc524a", "planned"),
+    ]:
+        await request_watch_add(
+            client, slug, get_test_token, {"status": status}
+        )
+
+    await test_session.refresh(create_test_user)
+    expected = create_test_user.anime_stats
+
+    # Pretend incremental updates have drifted from actual list
+    await test_session.execute(
+        update(User)
+        .filter(User.id == create_test_user.id)
+        .values(anime_stats={"watching": 10, "duration": 1})
+    )
+
+    await test_session.commit()
+
+    await reconcile_list_stats(test_session)
+
+    await test_session.refresh(create_test_user)
+    assert create_test_user.anime_stats == expected
+    assert create_test_user.anime_stats["watching"] == 1
+    assert create_test_user.anime_stats["planned"] == 1
@@ -0,0 +1,92 @@
+from app.sync import SyncTrigger
+import asyncio
+
+
+class Job:
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.started = asyncio.Event()
+        self.running = 0
+        self.overlap = False
+        self.calls = 0
+
+        # Jobs are not blocked unless test asks for it
+        self.release.set()
+
+    async def __call__(self):
+        self.calls += 1
+        self.running += 1
+        self.overlap = self.overlap or self.running > 1
+        self.started.set()
+
+        await self.release.wait()
+
+        self.running -= 1
+
+    @property
+    def __name__(self):
+        return "job"
+
+
+async def test_trigger_debounce():
+    job = Job()
+    trigger = SyncTrigger({"logs": [job]}, debounce=0.05)
+    worker = asyncio.create_task(trigger.worker("logs"))
+
+    # Burst of notifications results in single run
+    for _ in range(5):
+        trigger.notify("logs")
+
+    await asyncio.sleep(0.2)
+    assert job.calls == 1
+
+    # Unknown payloads are ignored
+    trigger.notify("unknown")
+
+    await asyncio.sleep(0.2)
+    assert job.calls == 1
+
+    worker.cancel()
+
+
+async def test_trigger_shared_lock():
+    job = Job()
+    job.release.clear()
+
+    trigger = SyncTrigger({"logs": [job]}, debounce=0)
+
+    # Fallback tick from scheduler holds the lock
+    fallback = asyncio.create_task(trigger.run(job))
+    await job.started.wait()
+
+    # Wakeup while job is running must not start it second time
+    await trigger.run(job)
+    assert job.calls == 1
+
+    job.release.set()
+    await fallback
+
+    assert job.overlap is False
+
+
+async def test_trigger_rerun():
+    job = Job()
+    job.release.clear()
+
+    trigger = SyncTrigger({"logs": [job]}, debounce=0)
+    first = asyncio.create_task(trigger.run(job))
+    await job.started.wait()
+
+    # Several wakeups during run are folded into single rerun
+    await trigger.run(job)
+    await trigger.run(job)
+
+    job.release.set()
+    await first
+
+    assert job.calls == 2
+    assert job.overlap is False
+
+    # Without new work job is run only once
+    await trigger.run(job)
+    assert job.calls == 3
@@ -0,0 +1,91 @@
+from app.sync.logs import LogConsumer, dispatch_logs
+from app.models import SystemTimestamp, Log
+from datetime import datetime, timedelta
+from app.utils import utcnow
+from sqlalchemy import select
+
+
+class Recorder:
+    def __init__(self, name, fail=False):
+        self.received = []
+        self.fail = fail
+
+        self.consumer = LogConsumer(name, ["test_log"], self.process)
+
+    async def process(self, session, logs):
+        if self.fail:
+            # Anything written by failed consumer must be rolled back
+            session.add(SystemTimestamp(name="broken", timestamp=utcnow()))
+            await session.flush()
+
+            raise ValueError("Consumer is broken")
+
+        self.received.extend(log.id for log in logs)
+
+
+async def create_logs(test_session, created_list):
+    logs = [
+        Log(log_type="test_log", created=created, data={})
+        for created in created_list
+    ]
+
+    # Logs of other types are never passed to consumers
+    test_session.add(Log(log_type="other_log", created=utcnow(), data={}))
+    test_session.add_all(logs)
+    await test_session.commit()
+
+    return logs
+
+
+async def get_cursor(test_session, name):
+    return await test_session.scalar(
+        select(SystemTimestamp)
+        .filter(SystemTimestamp.name == name)
+        .execution_options(populate_existing=True)
+    )
+
+
+async def test_dispatch_logs(test_session):
+    now = utcnow()
+
+    # Several logs share created value across batch boundaries
+    logs = await create_logs(
+        test_session, [now] * 5 + [now + timedelta(seconds=1)] * 2
+    )
+
+    first = Recorder("test_first")
+    second = Recorder("test_second")
+    broken = Recorder("test_broken", fail=True)
+
+    await dispatch_logs(
+        test_session,
+        [first.consumer, broken.consumer, second.consumer],
+        size=2,
+    )
+
+    # Every log is delivered exactly once
+    expected = sorted(log.id for log in logs)
+
+    for recorder in [first, second]:
+        assert sorted(recorder.received) == expected
+
+        cursor = await get_cursor(test_session, recorder.consumer.name)
+        last = max(logs, key=lambda log: (log.created, log.id))
+
+        assert (cursor.timestamp, cursor.log_id) == (last.created, last.id)
+
+    # Failed consumer stays at its cursor and its writes are gone
+    cursor = await get_cursor(test_session, "test_broken")
+
+    assert broken.received == []
+    assert (cursor.timestamp, cursor.log_id) == (datetime(2024, 1, 13), None)
+    assert await get_cursor(test_session, "broken") is None
+
+    # Next run only picks up new logs
+    new_logs = await create_logs(test_session, [now + timedelta(seconds=2)])
+
+    await dispatch_logs(test_session, [first.consumer], size=2)
+
+    assert sorted(first.received) == sorted(
+        expected + [log.id for log in new_logs]
+    )
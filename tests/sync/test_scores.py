@@ -0,0 +1,194 @@
+from client_requests import request_settings_delete_watch
+from client_requests import request_settings_import_watch
+from app.sync.score import process_scores, scores_consumer
+from app.models import Anime, Manga, Novel, Log
+from client_requests import request_watch_add
+from client_requests import request_read_add
+from app.sync.logs import dispatch_logs
+from sqlalchemy import select, asc
+
+
+async def process_logs(test_session):
+    # Recalculation is idempotent, so all logs can be processed again
+    logs = await test_session.scalars(select(Log).order_by(asc(Log.created)))
+    await process_scores(test_session, logs.all())
+    await test_session.commit()
+
+
+async def get_score(test_session, model, filter):
+    content = await test_session.scalar(
+        select(model).filter(filter).execution_options(populate_existing=True)
+    )
+
+    return content.native_score, content.native_scored_by
+
+
+async def test_scores_reset(
+    client,
+    create_test_user,
+    aggregator_anime,
+    aggregator_anime_info,
+    get_test_token,
+    test_session,
+):
+    bocchi = Anime.slug == "bocchi-the-rock-9e172d"
+
+    await request_watch_add(
+        client,
+        "bocchi-the-rock-9e172d",
+        get_test_token,
+        {"status": "watching", "score": 8},
+    )
+
+    await process_logs(test_session)
+    assert await get_score(test_session, Anime, bocchi) == (8, 1)
+
+    # Title is reset once its only score is removed
+    await request_watch_add(
+        client,
+        "bocchi-the-rock-9e172d",
+        get_test_token,
+        {"status": "watching", "score": 0},
+    )
+
+    await process_logs(test_session)
+    assert await get_score(test_session, Anime, bocchi) == (0, 0)
+
+    # Same goes for deleting whole list
+    await request_watch_add(
+        client,
+        "bocchi-the-rock-9e172d",
+        get_test_token,
+        {"status": "watching", "score": 6},
+    )
+
+    await process_logs(test_session)
+    assert await get_score(test_session, Anime, bocchi) == (6, 1)
+
+    await request_settings_delete_watch(client, get_test_token)
+
+    log = await test_session.scalar(
+        select(Log).order_by(Log.created.desc()).limit(1)
+    )
+
+    assert len(log.data["scored_ids"]) == 1
+
+    await process_logs(test_session)
+    assert await get_score(test_session, Anime, bocchi) == (0, 0)
+
+
+async def test_scores_read_content_type(
+    client,
+    create_test_user,
+    aggregator_manga,
+    aggregator_manga_info,
+    aggregator_novel,
+    aggregator_novel_info,
+    get_test_token,
+    test_session,
+):
+    await request_read_add(
+        client,
+        "manga",
+        "berserk-fb9fbd",
+        get_test_token,
+        {"status": "reading", "score": 7},
+    )
+
+    await request_read_add(
+        client,
+        "novel",
+        "kono-subarashii-sekai-ni-shukufuku-wo-cc5525",
+        get_test_token,
+        {"status": "completed", "score": 9},
+    )
+
+    await process_logs(test_session)
+
+    # Read logs are routed to model of their content type
+    berserk = await get_score(
+        test_session, Manga, Manga.slug == "berserk-fb9fbd"
+    )
+
+    konosuba = await get_score(
+        test_session,
+        Novel,
+        Novel.slug == "kono-subarashii-sekai-ni-shukufuku-wo-cc5525",
+    )
+
+    assert berserk == (7, 1)
+    assert konosuba == (9, 1)
+
+
+async def test_scores_import(
+    client,
+    create_test_user,
+    aggregator_anime,
+    aggregator_anime_info,
+    get_test_token,
+    test_session,
+):
+    await request_settings_import_watch(
+        client,
+        get_test_token,
+        {
+            "overwrite": False,
+            "anime": [
+                {
+                    "my_status": "Watching",
+                    "series_animedb_id": 47917,
+                    "my_watched_episodes": 9,
+                    "my_comments": {},
+                    "my_score": 10,
+                },
+                {
+                    "my_status": "Completed",
+                    "series_animedb_id": 16498,
+                    "my_watched_episodes": 25,
+                    "my_comments": {},
+                    "my_score": 7,
+                },
+            ],
+        },
+    )
+
+    # Single import log expands into every title from user list
+    await process_logs(test_session)
+
+    bocchi = await get_score(test_session, Anime, Anime.mal_id == 47917)
+    aot = await get_score(test_session, Anime, Anime.mal_id == 16498)
+
+    assert bocchi == (10, 1)
+    assert aot == (7, 1)
+
+
+async def test_scores_consumer_start(
+    client,
+    create_test_user,
+    aggregator_anime,
+    aggregator_anime_info,
+    get_test_token,
+    test_session,
+):
+    bocchi = Anime.slug == "bocchi-the-rock-9e172d"
+
+    await request_watch_add(
+        client,
+        "bocchi-the-rock-9e172d",
+        get_test_token,
+        {"status": "watching", "score": 8},
+    )
+
+    # Logs before first run are left to nightly reconciliation
+    await dispatch_logs(test_session, [scores_consumer])
+    assert await get_score(test_session, Anime, bocchi) == (0, 0)
+
+    await request_watch_add(
+        client,
+        "bocchi-the-rock-9e172d",
+        get_test_token,
+        {"status": "watching", "score": 5},
+    )
+
+    await dispatch_logs(test_session, [scores_consumer])
+    assert await get_score(test_session, Anime, bocchi) == (5, 1)
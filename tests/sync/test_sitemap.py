@@ -1,5 +1,10 @@
+from app.sync.sitemap import update_content_sitemap
 from app.sync.sitemap import generate_sitemap
+from app.sync.sitemap import iterate_sitemap
 from app import constants
+import gzip
+import json
+import os
 
 
 async def test_sitemap(test_session, aggregator_anime):
@@ -11,3 +16,41 @@ async def test_sitemap(test_session, aggregator_anime):
         result[16]["slug"]
         == "pia-carrot-e-youkoso-sayaka-no-koi-monogatari-227414"
     )
+
+
+async def test_sitemap_keyset(test_session, aggregator_anime):
+    result = await generate_sitemap(test_session, constants.CONTENT_ANIME)
+
+    # Small pages should give exactly same result as one big page
+    paged = [
+        entry
+        async for entry in iterate_sitemap(
+            test_session, constants.CONTENT_ANIME, size=5
+        )
+    ]
+
+    assert paged == result
+
+
+async def test_sitemap_write(test_session, aggregator_anime, tmp_path):
+    await update_content_sitemap(
+        test_session, constants.CONTENT_ANIME, str(tmp_path), shard_size=10
+    )
+
+    index = json.loads((tmp_path / "sitemap_anime_index.json").read_text())
+    assert index == [
+        {"file": "sitemap_anime_1.json"},
+        {"file": "sitemap_anime_2.json"},
+    ]
+
+    with gzip.open(tmp_path / "sitemap_anime_2.json.gz", "rt") as file:
+        assert len(json.load(file)) == 7
+
+    # Nothing has changed, so sitemap is not written again
+    modified = os.path.getmtime(tmp_path / "sitemap_anime_index.json")
+
+    await update_content_sitemap(
+        test_session, constants.CONTENT_ANIME, str(tmp_path), shard_size=10
+    )
+
+    assert os.path.getmtime(tmp_path / "sitemap_anime_index.json") == modified
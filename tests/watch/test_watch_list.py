@@ -221,3 +221,37 @@ async def test_watch_list_order(
     assert (
         response.json()["list"][2]["anime"]["slug"] == "bocchi-the-rock-9e172d"
     )
+
+
+async def test_watch_list_pagination(
+    client,
+    create_test_user,
+    aggregator_anime,
+    get_test_token,
+):
+    for slug in [
+        "bocchi-the-rock-9e172d",
+        "oshi-no-ko-421060",
+        "kimi-no-na-wa-945779",
+    ]:
+        await request_watch_add(
+            client,
+            slug,
+            get_test_token,
+            {"status": "planned", "episodes": 0, "score": 0},
+        )
+
+    # Total is counted together with page items
+    response = await request_watch_list(client, "testuser", page=2, size=2)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["pagination"]["total"] == 3
+    assert response.json()["pagination"]["pages"] == 2
+    assert len(response.json()["list"]) == 1
+
+    # Page past the end should still report correct total
+    response = await request_watch_list(client, "testuser", page=5, size=2)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["pagination"]["total"] == 3
+    assert len(response.json()["list"]) == 0